@@ -1,13 +1,27 @@
 # app/api/v1/routers/analysis.py
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+import json
+import time
 
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import (
+    DRAFT_DEBOUNCE_SECONDS,
+    DRAFT_MAX_DELAY_SECONDS,
+    DRAFT_IDLE_TIMEOUT_SECONDS,
+    DRAFT_MAX_SESSIONS,
+    DRAFT_MAX_CHARS,
+)
+from app.db.session import get_db, SessionLocal
 from app.models.transcripts import Transcript
-from app.services.language_analysis import LanguageAnalysisService
-from app.services.speaking_analysis import SpeakingAnalysisService
-from app.core.security import get_current_user
+from app.services.analysis_pipeline import available_fields, parse_fields
+from app.services.analysis_store import get_analysis, get_analysis_fields
+from app.utils.text_utils import sentence_cache
+from app.services.draft_analysis import DraftSessionRegistry
+from app.core.security import get_current_user, get_user_from_token
 from app.models.user import User
 
 router = APIRouter(
@@ -15,6 +29,11 @@ router = APIRouter(
     tags=["analysis"],
 )
 
+draft_sessions = DraftSessionRegistry(
+    max_sessions=DRAFT_MAX_SESSIONS,
+    idle_timeout=DRAFT_IDLE_TIMEOUT_SECONDS,
+)
+
 
 # ------------------------------------------------
 # Helper: fetch transcript + ownership check
@@ -39,21 +58,37 @@ def get_user_transcript(
     return transcript
 
 
+def get_requested_fields(fields: str | None) -> list | None:
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ------------------------------------------------
+# Selectable analysis fields (with relative cost)
+# ------------------------------------------------
+@router.get("/fields")
+def list_analysis_fields():
+    return available_fields()
+
+
 # ------------------------------------------------
 # Language analysis (text only)
 # ------------------------------------------------
 @router.get("/language/{transcript_id}")
 def language_analysis(
     transcript_id: int,
+    fields: str | None = Query(None, description="Comma-separated fields, e.g. word_count,readability"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    requested = get_requested_fields(fields)
     transcript = get_user_transcript(transcript_id, db, current_user)
 
-    service = LanguageAnalysisService(transcript.text)
     return {
         "transcript_id": transcript.id,
-        "language_analysis": service.analyze(),
+        "language_analysis": get_analysis_fields(db, transcript, "language", requested),
     }
 
 
@@ -74,14 +109,9 @@ def speaking_analysis(
             detail="No audio available for this transcript",
         )
 
-    service = SpeakingAnalysisService(
-        transcript.text,
-        transcript.audio_path,
-    )
-
     return {
         "transcript_id": transcript.id,
-        "speaking_analysis": service.analyze(),
+        "speaking_analysis": get_analysis(db, transcript, "speaking"),
     }
 
 
@@ -91,22 +121,103 @@ def speaking_analysis(
 @router.get("/full/{transcript_id}")
 def full_analysis(
     transcript_id: int,
+    fields: str | None = Query(None, description="Comma-separated language fields"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    requested = get_requested_fields(fields)
     transcript = get_user_transcript(transcript_id, db, current_user)
 
     results = {
         "transcript_id": transcript.id,
-        "language": LanguageAnalysisService(
-            transcript.text
-        ).analyze(),
+        "language": get_analysis_fields(db, transcript, "language", requested),
     }
 
     if transcript.audio_path:
-        results["speaking"] = SpeakingAnalysisService(
-            transcript.text,
-            transcript.audio_path,
-        ).analyze()
+        results["speaking"] = get_analysis(db, transcript, "speaking")
 
     return results
+
+
+# ------------------------------------------------
+# LanguageTool sentence cache stats
+# ------------------------------------------------
+@router.get("/cache/stats")
+def language_cache_stats(
+    current_user: User = Depends(get_current_user),
+):
+    return sentence_cache.stats()
+
+
+# ------------------------------------------------
+# Live draft analysis (WebSocket)
+# ------------------------------------------------
+@router.websocket("/draft")
+async def draft_analysis(websocket: WebSocket, token: str = Query(...)):
+    """
+    Client sends {"text": "<full draft>"} on every edit.
+    Edits are debounced; after a quiet period (or at most
+    DRAFT_MAX_DELAY_SECONDS of continuous typing) only the changed
+    sentences are re-checked and updated metrics are pushed back.
+    A frame that is not a JSON object, or an update that fails, gets
+    {"event": "error"} back; the session stays open.
+    """
+    db = SessionLocal()
+    try:
+        user = get_user_from_token(token, db)
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+    finally:
+        db.close()
+
+    session = draft_sessions.open(user.id, DRAFT_MAX_CHARS)
+    if session is None:
+        await websocket.close(code=1013, reason="Too many live sessions")
+        return
+
+    await websocket.accept()
+    pending = None
+    pending_since = 0.0
+
+    try:
+        while draft_sessions.is_open(session):
+            if pending is None:
+                timeout = DRAFT_IDLE_TIMEOUT_SECONDS
+            else:
+                waited = time.monotonic() - pending_since
+                timeout = max(0.0, min(DRAFT_DEBOUNCE_SECONDS, DRAFT_MAX_DELAY_SECONDS - waited))
+
+            try:
+                frame = await asyncio.wait_for(websocket.receive(), timeout)
+            except asyncio.TimeoutError:
+                if pending is None:
+                    await websocket.close(code=1000, reason="Idle timeout")
+                    break
+                try:
+                    result = await run_in_threadpool(session.update, pending)
+                except Exception as e:
+                    # Keep the session: the next edit is checked again
+                    print(f"❌ Draft analysis failed: {e}")
+                    result = {"event": "error", "detail": "Could not analyze the draft"}
+                pending = None
+                await websocket.send_json(result)
+                continue
+            if frame["type"] == "websocket.disconnect":
+                break
+
+            try:
+                message = json.loads(frame.get("text") or "")
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                await websocket.send_json({"event": "error", "detail": 'Expected a JSON object like {"text": "..."}'})
+                continue
+
+            if pending is None:
+                pending_since = time.monotonic()
+            pending = str(message.get("text", ""))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        draft_sessions.close(session)
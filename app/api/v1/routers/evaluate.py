@@ -1,21 +1,39 @@
 # app/api/v1/routers/evaluate.py
 
-from fastapi import (APIRouter,Depends,HTTPException,UploadFile,File,Form,)
+from fastapi import (APIRouter,BackgroundTasks,Depends,HTTPException,UploadFile,File,Form,Header,Query,WebSocket,WebSocketDisconnect,)
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import json
 import os
-import shutil
-import uuid
 
-from app.db.session import get_db
+from app.core.config import LIVE_IDLE_TIMEOUT_SECONDS
+from app.core.security import get_user_from_token
+from app.db.session import get_db, SessionLocal
 from app.schemas.evaluate import EvaluateRequest
 from app.schemas.score import ScoreResponse, EvaluationType
 from app.services.prompt_engine import get_prompt
 from app.utils.age import get_age_category
 from app.utils.proficiency import get_proficiency_level
-from app.services.speech_to_text import SpeechToTextService
+from app.services.decode_profiles import resolve_profile
+from app.services.model_manager import model_manager
+from app.services.audio_store import audio_store
+from app.services.speech_to_text import get_speech_service
+from app.utils.speech_signals import merge_signals
+from app.utils.upload import save_upload, UploadRejected
+from app.services.transcription_jobs import transcription_queue, QueueFullError
+from app.services.live_speaking import LiveSpeakingSession, live_sessions
+from app.services.idempotency import (
+    idempotency_store, request_fingerprint, IdempotencyConflict, IdempotencyInProgress,
+)
+from app.services.analysis_pipeline import parse_fields
+from app.services.analysis_store import get_analysis_fields, materialize_analyses
 from app.services.basic_analysis import BasicAnalysisService
 from app.services.scoring import ScoringService
 
+from app.models.audio_blob import AudioBlob
 from app.models.transcripts import Transcript
 from app.models.attempt import Attempt
 from app.models.score import Score
@@ -25,12 +43,45 @@ router = APIRouter(
     tags=["evaluation"],
 )
 
-speech_service = SpeechToTextService()
-
 UPLOAD_DIR = "uploads/audio"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
+async def run_idempotent(db: Session, scope: str, key: str | None, fingerprint: str, handler) -> JSONResponse:
+    """
+    Run `handler` once per Idempotency-Key. A retry waits for the first
+    request with its key and gets the stored response back; failed
+    requests release the key so a retry runs them again. The handler and
+    the store's database calls run on the threadpool; only waiting for
+    another request's response happens on the event loop.
+    """
+    if not key:
+        return await run_in_threadpool(handler)
+
+    try:
+        stored = await idempotency_store.begin(db, scope, key, fingerprint)
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IdempotencyInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if stored:
+        return JSONResponse(
+            status_code=stored.status_code,
+            content=stored.content,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    try:
+        response = await run_in_threadpool(handler)
+    except BaseException:
+        await run_in_threadpool(idempotency_store.abandon, db, scope, key)
+        raise
+    await run_in_threadpool(
+        idempotency_store.complete, db, scope, key, response.status_code, json.loads(response.body)
+    )
+    return response
+
+
 # ------------------------------------------------
 # 1. Get prompt
 # ------------------------------------------------
@@ -67,10 +118,14 @@ def get_evaluation_prompt(
 # ------------------------------------------------
 @router.post("/submit")
 async def submit_response(
+    background_tasks: BackgroundTasks,
     user_id: int = Form(...),
     prompt_id: int = Form(...),
     text_response: str | None = Form(None),
     audio_file: UploadFile | None = File(None),
+    stt_tier: str | None = Form(None),
+    stt_profile: str | None = Form(None),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db),
 ):
     if audio_file and text_response:
@@ -85,49 +140,365 @@ async def submit_response(
             detail="Text or audio is required",
         )
 
-    response_text = ""
-    input_mode = "text"
-    audio_path = None
+    try:
+        stt_tier = model_manager.resolve_tier(stt_tier)
+        stt_profile = resolve_profile(stt_profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    if text_response:
+    upload = None
+    if audio_file:
+        try:
+            upload = await save_upload(audio_file, UPLOAD_DIR)
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        print(f"📥 Upload {upload.size} bytes at {upload.bytes_per_second / 1e6:.1f} MB/s, loop blocked {upload.loop_blocked_seconds * 1000:.1f} ms")
+
+    def submit_audio() -> JSONResponse:
+        blob = audio_store.add(db, upload)
+
+        # Same bytes transcribed before with the same settings: no Whisper run
+        cached = audio_store.cached_transcript(blob, stt_tier, stt_profile)
+        if cached:
+            transcript = Transcript(
+                user_id=user_id,
+                prompt_id=prompt_id,
+                text=cached["text"],
+                input_mode="speech",
+                audio_path=blob.path,
+                speech_signals=cached["signals"],
+            )
+            try:
+                db.add(transcript)
+                db.commit()
+                db.refresh(transcript)
+            except Exception:
+                db.rollback()
+                raise
+            background_tasks.add_task(materialize_analyses, transcript.id)
+            return JSONResponse(content={
+                "transcript_id": transcript.id,
+                "text": transcript.text,
+                "deduplicated": True,
+                "upload": upload.stats(),
+            })
+
+        # The same user retrying a submission that is still being transcribed: join its job
+        active = transcription_queue.find_active(db, user_id, prompt_id, blob.sha256, stt_tier, stt_profile)
+        if active:
+            audio_store.release(db, blob.sha256)
+            return JSONResponse(
+                status_code=202,
+                content={"job_id": active.id, "status": active.status, "deduplicated": True, "upload": upload.stats()},
+            )
+
+        # Transcription runs on the worker pool; poll /jobs/{job_id} for the result
+        try:
+            job = transcription_queue.submit(
+                db, user_id, prompt_id, blob.path, stt_tier, stt_profile, audio_sha256=blob.sha256
+            )
+        except QueueFullError as e:
+            audio_store.release(db, blob.sha256)
+            raise HTTPException(status_code=503, detail=str(e))
+
+        return JSONResponse(
+            status_code=202,
+            content={"job_id": job.id, "status": job.status, "upload": upload.stats()},
+        )
+
+    def submit_text() -> JSONResponse:
         response_text = text_response.strip()
 
-    if audio_file:
-        input_mode = "speech"
-        filename = f"{uuid.uuid4()}_{audio_file.filename}"
-        audio_path = os.path.join(UPLOAD_DIR, filename)
+        transcript = Transcript(
+            user_id=user_id,
+            prompt_id=prompt_id,
+            text=response_text,
+            input_mode="text",
+            audio_path=None,
+        )
 
-        with open(audio_path, "wb") as buffer:
-            shutil.copyfileobj(audio_file.file, buffer)
+        try:
+            db.add(transcript)
+            db.commit()
+            db.refresh(transcript)
+        except Exception:
+            db.rollback()
+            raise
 
-        response_text = speech_service.transcribe(audio_path)
+        # Analyses only depend on the stored text/audio: compute them once, now
+        background_tasks.add_task(materialize_analyses, transcript.id)
 
-        if not response_text:
-            raise HTTPException(
-                status_code=400,
-                detail="Could not transcribe audio",
-            )
+        return JSONResponse(content={
+            "transcript_id": transcript.id,
+            "text": response_text,
+        })
 
-    transcript = Transcript(
+    fingerprint = request_fingerprint(
         user_id=user_id,
         prompt_id=prompt_id,
-        text=response_text,
-        input_mode=input_mode,
-        audio_path=audio_path,
+        text_response=text_response,
+        audio_sha256=upload.sha256 if upload else None,
+        stt_tier=stt_tier,
+        stt_profile=stt_profile,
     )
+    try:
+        return await run_idempotent(
+            db, "submit", idempotency_key, fingerprint, submit_audio if upload else submit_text
+        )
+    finally:
+        # The staged upload is still here if the request was replayed or rejected
+        if upload and os.path.exists(upload.path):
+            os.remove(upload.path)
+
 
+@router.post("/submit/stream")
+async def submit_response_stream(
+    user_id: int = Form(...),
+    prompt_id: int = Form(...),
+    audio_file: UploadFile = File(...),
+    stt_tier: str | None = Form(None),
+    stt_profile: str | None = Form(None),
+):
+    """
+    Transcribe a long recording segment by segment, streaming NDJSON:
+    an {"event": "upload", ...} line with upload stats, then
+    one {"event": "segment", ...} line per segment as it is transcribed,
+    then {"event": "done", "transcript_id", "text"} (or "error").
+    """
     try:
-        db.add(transcript)
-        db.commit()
-        db.refresh(transcript)
-    except Exception:
-        db.rollback()
-        raise
+        stt_tier = model_manager.resolve_tier(stt_tier)
+        stt_profile = resolve_profile(stt_profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return {
-        "transcript_id": transcript.id,
-        "text": response_text,
+    try:
+        upload = await save_upload(audio_file, UPLOAD_DIR)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    def store_upload():
+        db = SessionLocal()
+        try:
+            blob = audio_store.add(db, upload)
+            return blob.sha256, blob.path, audio_store.cached_transcript(blob, stt_tier, stt_profile)
+        finally:
+            db.close()
+
+    # Hashing, moving the file into the store and the database writes block
+    sha256, audio_path, cached = await run_in_threadpool(store_upload)
+
+    saved = {}
+
+    def save_transcript(text: str, signals: dict | None, remember: bool):
+        db = SessionLocal()
+        try:
+            transcript = Transcript(
+                user_id=user_id,
+                prompt_id=prompt_id,
+                text=text,
+                input_mode="speech",
+                audio_path=audio_path,
+                speech_signals=signals,
+            )
+            db.add(transcript)
+            if remember:
+                blob = db.get(AudioBlob, sha256)
+                audio_store.remember_transcript(blob, text, signals, stt_tier, stt_profile)
+            db.commit()
+            saved["transcript_id"] = transcript.id
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def events():
+        texts = []
+        signals = []
+        yield json.dumps({"event": "upload", **upload.stats()}) + "\n"
+        if cached:
+            save_transcript(cached["text"], cached["signals"], remember=False)
+            yield json.dumps({"event": "done", "transcript_id": saved["transcript_id"], "text": cached["text"], "deduplicated": True}) + "\n"
+            return
+        failed = False
+        try:
+            for segment in get_speech_service().transcribe_stream(audio_path, tier=stt_tier, profile=stt_profile):
+                signals.append(segment.pop("signals"))
+                if segment["text"]:
+                    texts.append(segment["text"])
+                yield json.dumps({"event": "segment", **segment}) + "\n"
+        except Exception as e:
+            failed = True
+            print(f"Error during streaming transcription: {e}")
+
+        # A transcript that stopped partway is not saved as if it were complete
+        response_text = " ".join(texts)
+        if failed or not response_text:
+            release_db = SessionLocal()
+            try:
+                audio_store.release(release_db, sha256)
+            finally:
+                release_db.close()
+            yield json.dumps({"event": "error", "detail": "Could not transcribe audio"}) + "\n"
+            return
+
+        save_transcript(response_text, merge_signals(signals), remember=True)
+
+        yield json.dumps({"event": "done", "transcript_id": saved["transcript_id"], "text": response_text}) + "\n"
+
+    def after_stream():
+        if "transcript_id" in saved:
+            materialize_analyses(saved["transcript_id"])
+
+    return StreamingResponse(
+        events(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(after_stream),
+    )
+
+
+@router.websocket("/live")
+async def live_speaking_session(
+    websocket: WebSocket,
+    token: str = Query(...),
+    prompt_id: int = Query(...),
+    stt_tier: str | None = Query(None),
+    stt_profile: str | None = Query(None),
+):
+    """
+    Speak an answer live. The client streams binary frames of 16 kHz
+    mono PCM16 (little-endian) while the user talks and gets
+    {"event": "partial", "committed", "tentative", "metrics", ...} back
+    as the answer is transcribed. On {"event": "stop"} (or disconnect)
+    the rest is transcribed, the transcript is saved and
+    {"event": "done", "transcript_id", "text", "metrics"} is sent.
+    """
+    db = SessionLocal()
+    try:
+        user = get_user_from_token(token, db)
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+    finally:
+        db.close()
+
+    try:
+        stt_tier = model_manager.resolve_tier(stt_tier)
+        stt_profile = resolve_profile(stt_profile)
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+
+    session = live_sessions.open(user.id, prompt_id, tier=stt_tier, profile=stt_profile)
+    if session is None:
+        await websocket.close(code=1013, reason="Too many live sessions")
+        return
+
+    await websocket.accept()
+    connected = True
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(websocket.receive(), LIVE_IDLE_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                break
+            if message["type"] == "websocket.disconnect":
+                connected = False
+                break
+
+            if message.get("bytes"):
+                more = session.feed(message["bytes"])
+                if session.step_due() or not more:
+                    try:
+                        update = await run_in_threadpool(session.step)
+                    except Exception as e:
+                        print(f"❌ Live transcription pass failed: {e}")
+                        continue
+                    await websocket.send_json({"event": "partial", **update})
+                if not more:
+                    break  # answer reached LIVE_MAX_SECONDS
+            elif message.get("text"):
+                try:
+                    control = json.loads(message["text"])
+                except ValueError:
+                    control = None
+                if not isinstance(control, dict):
+                    # Ignore malformed control frames rather than lose the recording
+                    print(f"⚠️ Live session {session.session_id}: ignoring invalid control frame")
+                    continue
+                if control.get("event") == "stop":
+                    break
+    except WebSocketDisconnect:
+        connected = False
+    finally:
+        live_sessions.close(session)
+
+    transcript, result = await run_in_threadpool(finish_live_session, session)
+    print(f"🎙️ Live session {session.session_id}: {session.duration:.1f}s, {session.stats()}")
+    if connected:
+        if transcript is None:
+            await websocket.send_json({"event": "error", "detail": "No speech detected"})
+        else:
+            await websocket.send_json({
+                "event": "done",
+                "transcript_id": transcript.id,
+                "text": transcript.text,
+                "metrics": result["metrics"],
+                "stats": session.stats(),
+            })
+        await websocket.close(code=1000)
+
+    # The client has its result; store the full analyses now
+    if transcript is not None:
+        await run_in_threadpool(materialize_analyses, transcript.id, session.audio_buffer(transcript.audio_path))
+
+
+def finish_live_session(session: LiveSpeakingSession):
+    """Last pass and save; returns (transcript or None, final update)."""
+    try:
+        result = session.finish()
+    except Exception as e:
+        print(f"❌ Final live transcription pass failed: {e}")
+        result = session.update()
+    db = SessionLocal()
+    try:
+        return session.save(db), result
+    finally:
+        db.close()
+
+
+# ------------------------------------------------
+# 2b. Transcription jobs
+# ------------------------------------------------
+@router.get("/jobs/stats")
+def transcription_job_stats():
+    """Queue depth, wait time and run time of the transcription pool."""
+    stats = transcription_queue.stats()
+    stats["idempotency"] = idempotency_store.stats()
+    return stats
+
+
+@router.get("/jobs/{job_id}")
+async def get_transcription_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for the job to finish"),
+    db: Session = Depends(get_db),
+):
+    job = await transcription_queue.wait(db, job_id, wait)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    result = {
+        "job_id": job.id,
+        "status": job.status,
+        "transcript_id": job.transcript_id,
+        "error": job.error,
     }
+    if job.transcript_id:
+        transcript = db.query(Transcript).filter(Transcript.id == job.transcript_id).first()
+        result["text"] = transcript.text if transcript else None
+    return result
 
 
 # ------------------------------------------------
@@ -136,8 +507,15 @@ async def submit_response(
 @router.get("/analysis/{transcript_id}")
 def analyze_transcript(
     transcript_id: int,
+    fields: str | None = Query(None, description="Comma-separated fields, e.g. word_count,sentence_count"),
     db: Session = Depends(get_db),
 ):
+    # Basic counts only: always in the stored result and never run LanguageTool
+    try:
+        requested = parse_fields(fields, allowed=BasicAnalysisService.FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     transcript = (
         db.query(Transcript)
         .filter(Transcript.id == transcript_id)
@@ -147,7 +525,7 @@ def analyze_transcript(
     if not transcript:
         raise HTTPException(status_code=404, detail="Transcript not found")
 
-    analysis = BasicAnalysisService.analyze(transcript.text)
+    analysis = get_analysis_fields(db, transcript, "basic", requested)
 
     return {
         "transcript_id": transcript.id,
@@ -159,48 +537,70 @@ def analyze_transcript(
 # 4. Final scoring
 # ------------------------------------------------
 @router.post("/score", response_model=ScoreResponse)
-def evaluate_attempt(
+async def evaluate_attempt(
     attempt_id: int,
     evaluation_type: EvaluationType,
     analysis_data: dict,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db),
 ):
-    attempt = (
-        db.query(Attempt)
-        .filter(Attempt.id == attempt_id)
-        .first()
-    )
+    def score_attempt() -> JSONResponse:
+        attempt = (
+            db.query(Attempt)
+            .filter(Attempt.id == attempt_id)
+            .first()
+        )
 
-    if not attempt:
-        raise HTTPException(status_code=404, detail="Attempt not found")
+        if not attempt:
+            raise HTTPException(status_code=404, detail="Attempt not found")
+
+        if evaluation_type == EvaluationType.speaking:
+            score_data = ScoringService.calculate_speaking_score(analysis_data)
+        else:
+            score_data = ScoringService.calculate_writing_score(analysis_data)
+
+        score = Score(
+            attempt_id=attempt.id,
+            evaluation_type=evaluation_type.value,
+            grammar=score_data["grammar"],
+            coherence=score_data["coherence"],
+            fluency=score_data.get("fluency"),
+            pronunciation=score_data.get("pronunciation"),
+            vocabulary=score_data.get("vocabulary"),
+            task_relevance=score_data.get("task_relevance"),
+            overall=score_data["overall"],
+        )
 
-    if evaluation_type == EvaluationType.speaking:
-        score_data = ScoringService.calculate_speaking_score(analysis_data)
-    else:
-        score_data = ScoringService.calculate_writing_score(analysis_data)
+        try:
+            db.add(score)
+            db.commit()
+            db.refresh(score)
+        except Exception:
+            db.rollback()
+            raise
+
+        response = ScoreResponse(
+            attempt_id=attempt.id,
+            evaluation_type=evaluation_type,
+            score=score_data,
+        )
+        return JSONResponse(content=response.model_dump(mode="json"))
 
-    score = Score(
-        attempt_id=attempt.id,
+    fingerprint = request_fingerprint(
+        attempt_id=attempt_id,
         evaluation_type=evaluation_type.value,
-        grammar=score_data["grammar"],
-        coherence=score_data["coherence"],
-        fluency=score_data.get("fluency"),
-        pronunciation=score_data.get("pronunciation"),
-        vocabulary=score_data.get("vocabulary"),
-        task_relevance=score_data.get("task_relevance"),
-        overall=score_data["overall"],
+        analysis_data=analysis_data,
     )
+    return await run_idempotent(db, "score", idempotency_key, fingerprint, score_attempt)
 
-    try:
-        db.add(score)
-        db.commit()
-        db.refresh(score)
-    except Exception:
-        db.rollback()
-        raise
 
-    return ScoreResponse(
-        attempt_id=attempt.id,
-        evaluation_type=evaluation_type,
-        score=score_data,
-    )
+# ------------------------------------------------
+# 5. Speech-to-text model instrumentation
+# ------------------------------------------------
+@router.get("/stt/models")
+def stt_model_stats():
+    """Loaded Whisper tiers with load time and memory use."""
+    stats = model_manager.stats()
+    batcher = get_speech_service().batcher
+    stats["batching"] = batcher.stats() if batcher else None
+    return stats
@@ -1,5 +1,120 @@
+import os
 from datetime import timedelta
 
 SECRET_KEY = "CHANGE_THIS_TO_RANDOM_STRING"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+
+# Sentence-level LanguageTool cache (0 disables it)
+LANGUAGE_CACHE_SIZE = int(os.getenv("LANGUAGE_CACHE_SIZE", "5000"))
+
+# LanguageTool server pool (see app/scripts/run_languagetool_pool.py).
+# When LANGUAGETOOL_SERVERS is empty each worker starts its own local JVM.
+LANGUAGETOOL_SERVERS = [u.strip() for u in os.getenv("LANGUAGETOOL_SERVERS", "").split(",") if u.strip()]
+LANGUAGETOOL_POOL_SIZE = int(os.getenv("LANGUAGETOOL_POOL_SIZE", "2"))
+LANGUAGETOOL_POOL_BASE_PORT = int(os.getenv("LANGUAGETOOL_POOL_BASE_PORT", "8081"))
+LANGUAGETOOL_JAVA_HEAP = os.getenv("LANGUAGETOOL_JAVA_HEAP", "512m")
+LANGUAGETOOL_JAR_DIR = os.getenv("LANGUAGETOOL_JAR_DIR")
+
+# Load LanguageTool and Whisper during startup instead of on the first request
+WARMUP_MODELS = os.getenv("WARMUP_MODELS", "false").lower() in ("1", "true", "yes")
+
+# Live draft analysis over WebSocket
+DRAFT_DEBOUNCE_SECONDS = float(os.getenv("DRAFT_DEBOUNCE_SECONDS", "0.5"))
+DRAFT_MAX_DELAY_SECONDS = float(os.getenv("DRAFT_MAX_DELAY_SECONDS", "2.0"))
+DRAFT_IDLE_TIMEOUT_SECONDS = float(os.getenv("DRAFT_IDLE_TIMEOUT_SECONDS", "300"))
+DRAFT_MAX_SESSIONS = int(os.getenv("DRAFT_MAX_SESSIONS", "200"))
+DRAFT_MAX_CHARS = int(os.getenv("DRAFT_MAX_CHARS", "20000"))
+
+# Local spelling engine (see app/scripts/build_spelling_index.py).
+# "auto" uses the index when the file exists, "languagetool" always uses LanguageTool.
+SPELLING_ENGINE = os.getenv("SPELLING_ENGINE", "auto")
+SPELLING_INDEX_PATH = os.getenv("SPELLING_INDEX_PATH", "data/spelling_en.idx")
+
+# Distinct words whose syllable counts are kept in memory
+SYLLABLE_CACHE_SIZE = int(os.getenv("SYLLABLE_CACHE_SIZE", "50000"))
+
+# Whisper model tiers. Preloaded tiers are loaded when app.main is imported
+# (before fork with e.g. gunicorn --preload) and are never unloaded.
+WHISPER_TIERS = ("tiny", "base", "small")
+WHISPER_DEFAULT_TIER = os.getenv("WHISPER_DEFAULT_TIER", "base")
+WHISPER_IDLE_TTL_SECONDS = float(os.getenv("WHISPER_IDLE_TTL_SECONDS", "600"))
+WHISPER_PRELOAD_TIERS = [t.strip() for t in os.getenv("WHISPER_PRELOAD_TIERS", "").split(",") if t.strip()]
+
+# Background transcription queue
+STT_WORKERS = int(os.getenv("STT_WORKERS", "2"))
+STT_MAX_PENDING_JOBS = int(os.getenv("STT_MAX_PENDING_JOBS", "100"))
+# A job "running" for longer than this is assumed to belong to a dead
+# worker and is re-queued by recover() at startup
+STT_JOB_STALE_SECONDS = float(os.getenv("STT_JOB_STALE_SECONDS", "1800"))
+
+# Dynamic batching of short clips (<= 30s) into one Whisper decode.
+# A batch is sent when it has WHISPER_BATCH_SIZE clips or its first clip
+# has waited WHISPER_BATCH_WAIT_MS. Set STT_WORKERS >= the batch size so
+# enough jobs run concurrently to fill it.
+WHISPER_BATCHING = os.getenv("WHISPER_BATCHING", "false").lower() in ("1", "true", "yes")
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))
+WHISPER_BATCH_WAIT_MS = float(os.getenv("WHISPER_BATCH_WAIT_MS", "50"))
+
+# Streaming transcription: ffmpeg read size and energy-VAD segmentation
+STREAM_WINDOW_SECONDS = float(os.getenv("STREAM_WINDOW_SECONDS", "10"))
+STREAM_VAD_THRESHOLD_DB = float(os.getenv("STREAM_VAD_THRESHOLD_DB", "-40"))
+STREAM_MIN_SILENCE_MS = float(os.getenv("STREAM_MIN_SILENCE_MS", "300"))
+STREAM_MIN_SEGMENT_SECONDS = float(os.getenv("STREAM_MIN_SEGMENT_SECONDS", "5"))
+STREAM_MAX_SEGMENT_SECONDS = float(os.getenv("STREAM_MAX_SEGMENT_SECONDS", "30"))
+
+# Keep each upload's 16 kHz decode next to it (<file>.16k.npy) for later readers
+AUDIO_DECODE_CACHE = os.getenv("AUDIO_DECODE_CACHE", "true").lower() in ("1", "true", "yes")
+
+# Pause detection: silences shorter than PAUSE_MIN_SECONDS are ordinary
+# gaps between words; count_pauses reports those above PAUSE_LONG_SECONDS
+PAUSE_MIN_SECONDS = float(os.getenv("PAUSE_MIN_SECONDS", "0.25"))
+PAUSE_LONG_SECONDS = float(os.getenv("PAUSE_LONG_SECONDS", "1.0"))
+
+# Whisper decode profile used when a request does not pick one
+# ("fast" or "accurate", see app/services/decode_profiles.py)
+WHISPER_DECODE_PROFILE = os.getenv("WHISPER_DECODE_PROFILE", "accurate")
+
+# Upload ingest: audio is stored as 16 kHz mono FLAC with edge silence
+# trimmed (keeping some padding) and at most AUDIO_MAX_SECONDS long
+AUDIO_MAX_SECONDS = float(os.getenv("AUDIO_MAX_SECONDS", "600"))
+AUDIO_TRIM_PADDING_SECONDS = float(os.getenv("AUDIO_TRIM_PADDING_SECONDS", "0.25"))
+AUDIO_KEEP_ORIGINAL = os.getenv("AUDIO_KEEP_ORIGINAL", "false").lower() in ("1", "true", "yes")
+
+# Dynamic int8 quantization of Whisper's linear layers (CPU). Quantized
+# models are cached under WHISPER_MODEL_CACHE_DIR so later starts skip it.
+WHISPER_QUANTIZE = os.getenv("WHISPER_QUANTIZE", "false").lower() in ("1", "true", "yes")
+WHISPER_MODEL_CACHE_DIR = os.getenv("WHISPER_MODEL_CACHE_DIR", "data/whisper")
+
+# Audio uploads are streamed to disk in chunks and refused above this size
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+
+# Content-addressed audio store (<dir>/<sha[:2]>/<sha[2:4]>/<sha>.<ext>).
+# Blobs nobody references are deleted by app/scripts/gc_audio_blobs.py
+# once they have been unused for AUDIO_BLOB_GC_GRACE_SECONDS.
+AUDIO_STORE_DIR = os.getenv("AUDIO_STORE_DIR", "uploads/blobs")
+AUDIO_BLOB_GC_GRACE_SECONDS = float(os.getenv("AUDIO_BLOB_GC_GRACE_SECONDS", "86400"))
+
+# Idempotency-Key support for POST /evaluate/submit and /evaluate/score.
+# Stored responses are replayed for IDEMPOTENCY_TTL_SECONDS; a retry that
+# arrives while the first request is still running waits up to
+# IDEMPOTENCY_WAIT_SECONDS for it. A key held longer than
+# IDEMPOTENCY_LOCK_SECONDS is treated as abandoned (crashed worker).
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "30"))
+IDEMPOTENCY_LOCK_SECONDS = float(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "300"))
+
+# Live speaking sessions over WebSocket: 16 kHz mono PCM16 in, partial
+# transcripts and live metrics out. The uncommitted tail is re-transcribed
+# every LIVE_STEP_SECONDS of new audio and committed once it reaches
+# LIVE_WINDOW_SECONDS (or ends in a long pause).
+LIVE_WINDOW_SECONDS = float(os.getenv("LIVE_WINDOW_SECONDS", "15"))
+LIVE_STEP_SECONDS = float(os.getenv("LIVE_STEP_SECONDS", "2"))
+LIVE_IDLE_TIMEOUT_SECONDS = float(os.getenv("LIVE_IDLE_TIMEOUT_SECONDS", "30"))
+LIVE_MAX_SESSIONS = int(os.getenv("LIVE_MAX_SESSIONS", "20"))
+LIVE_MAX_SECONDS = float(os.getenv("LIVE_MAX_SECONDS", str(AUDIO_MAX_SECONDS)))
+
+# Optional JSON file of {category: [phrases]} for the filler/hedge/discourse
+# matcher; see load_phrase_lists in app/utils/phrase_matcher.py
+PHRASE_LISTS_PATH = os.getenv("PHRASE_LISTS_PATH")
@@ -0,0 +1,29 @@
+# app/core/startup.py
+import time
+from contextlib import contextmanager
+
+
+class StartupReport:
+    """Collects how long each import / model load took during startup."""
+
+    def __init__(self):
+        self.timings = []
+
+    @contextmanager
+    def measure(self, label: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((label, time.perf_counter() - start))
+
+    def as_dict(self) -> dict:
+        return {label: round(seconds, 3) for label, seconds in self.timings}
+
+    def print(self):
+        print("⏱️ Startup report:")
+        for label, seconds in self.timings:
+            print(f"   {seconds:8.3f}s  {label}")
+
+
+startup_report = StartupReport()
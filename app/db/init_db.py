@@ -1,4 +1,6 @@
 # app/db/init_db.py
+from sqlalchemy import inspect, text
+
 from app.db.session import engine
 from app.db.base import Base
 
@@ -8,12 +10,52 @@ from app.models.prompt import Prompt
 from app.models.transcripts import Transcript
 from app.models.attempt import Attempt
 from app.models.score import Score
+from app.models.analysis_result import AnalysisResult
+from app.models.transcription_job import TranscriptionJob
+from app.models.audio_blob import AudioBlob
+from app.models.idempotency_record import IdempotencyRecord
+
+def add_missing_columns(bind=engine) -> list:
+    """
+    create_all only creates missing tables, it never alters existing ones.
+    Add the nullable columns (and their indexes) that models gained after
+    their table was created. Safe to run on every startup.
+    Returns:
+        list: "table.column" for each column added
+    """
+    inspector = inspect(bind)
+    added = []
+    with bind.begin() as conn:
+        preparer = conn.dialect.identifier_preparer
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            new = [c for c in table.columns if c.name not in existing]
+            for column in new:
+                if not column.nullable:
+                    print(f"⚠️ {table.name}.{column.name} is NOT NULL and missing; add it by hand")
+                    continue
+                conn.execute(text(
+                    f"ALTER TABLE {preparer.format_table(table)} "
+                    f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=conn.dialect)}"
+                ))
+                added.append(f"{table.name}.{column.name}")
+            for index in table.indexes:
+                if any(c in new for c in index.columns):
+                    index.create(conn, checkfirst=True)
+    for name in added:
+        print(f"✅ Added column {name}")
+    return added
+
 
 def init_db():
     """
-    Creates all tables in the database.
+    Creates all tables in the database, and adds columns that
+    existing tables are missing.
     """
     Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
     print("✅ All tables created successfully!")
 
 if __name__ == "__main__":
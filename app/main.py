@@ -3,11 +3,38 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+from starlette.concurrency import run_in_threadpool
 
-from app.db.base import Base
-from app.db.session import engine
+from app.core.config import WARMUP_MODELS, WHISPER_PRELOAD_TIERS
+from app.core.startup import startup_report
 
-from app.api.v1.routers import analysis, auth, progress, evaluate, prompts
+with startup_report.measure("import app.db"):
+    from app.db.init_db import init_db
+    from app.db.session import SessionLocal
+
+with startup_report.measure("import app.api.v1.routers"):
+    from app.api.v1.routers import analysis, auth, progress, evaluate, prompts
+
+
+from app.services.model_manager import model_manager
+from app.services.transcription_jobs import transcription_queue
+from app.services.idempotency import idempotency_store
+
+# Load pinned Whisper tiers at import time, so a pre-forking server
+# (gunicorn --preload) shares their weights copy-on-write with its workers
+if WHISPER_PRELOAD_TIERS:
+    with startup_report.measure(f"preload Whisper {','.join(WHISPER_PRELOAD_TIERS)}"):
+        model_manager.preload(WHISPER_PRELOAD_TIERS)
+
+
+def warm_up():
+    """Load the heavy models now so the first request does not pay for them."""
+    from app.utils.text_utils import get_language_tool
+
+    with startup_report.measure("load LanguageTool"):
+        get_language_tool().check("Warm up.")
+    with startup_report.measure("load Whisper"):
+        model_manager.get()
 
 
 @asynccontextmanager
@@ -16,9 +43,24 @@ async def lifespan(app: FastAPI):
     Startup / shutdown lifecycle.
     NOTE: create_all is acceptable for MVP only.
     """
-    Base.metadata.create_all(bind=engine)
+    with startup_report.measure("create tables"):
+        init_db()
+    if WARMUP_MODELS:
+        await run_in_threadpool(warm_up)
+    # Pick up audio jobs a previous process left unfinished
+    transcription_queue.recover()
+    db = SessionLocal()
+    try:
+        purged = idempotency_store.purge_expired(db)
+    finally:
+        db.close()
+    if purged:
+        print(f"🧹 Purged {purged} expired idempotency keys")
+    model_manager.start_reaper()
+    startup_report.print()
     print("✅ EnglishUp backend started")
     yield
+    transcription_queue.shutdown()
     print("🛑 EnglishUp backend shutting down")
 
 
@@ -1,3 +1,7 @@
 from app.models.user import User
 from app.models.prompt import Prompt
 from app.models.transcripts import Transcript
+from app.models.analysis_result import AnalysisResult
+from app.models.transcription_job import TranscriptionJob
+from app.models.audio_blob import AudioBlob
+from app.models.idempotency_record import IdempotencyRecord
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class AnalysisResult(Base):
+    __tablename__ = "analysis_results"
+    __table_args__ = (
+        # One row per analyzer version; doubles as the lookup index
+        UniqueConstraint(
+            "transcript_id", "analyzer", "analyzer_version",
+            name="uq_analysis_results_key",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    transcript_id = Column(Integer, ForeignKey("transcripts.id"), nullable=False)
+    analyzer = Column(String(32), nullable=False)  # "language" | "speaking" | "basic"
+    analyzer_version = Column(Integer, nullable=False)
+
+    result = Column(JSON, nullable=False)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    # Relationships
+    transcript = relationship("Transcript", back_populates="analysis_results")
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class AudioBlob(Base):
+    __tablename__ = "audio_blobs"
+
+    # Content address: SHA-256 of the uploaded bytes
+    sha256 = Column(String(64), primary_key=True)
+
+    size = Column(Integer, nullable=False)  # bytes as uploaded
+    audio_format = Column(String(16), nullable=False)
+    path = Column(String, nullable=False)  # current stored file (normalized FLAC once ingested)
+
+    # Submissions (jobs/transcripts) using this audio; 0 means collectable
+    ref_count = Column(Integer, nullable=False, default=0)
+
+    # Transcript of these exact bytes, reused when they are uploaded again
+    transcript_text = Column(Text, nullable=True)
+    speech_signals = Column(JSON, nullable=True)
+    stt_tier = Column(String(16), nullable=True)
+    stt_profile = Column(String(16), nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    last_used_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class IdempotencyRecord(Base):
+    __tablename__ = "idempotency_records"
+    __table_args__ = (
+        # One claim per key and endpoint; the insert race decides the owner
+        UniqueConstraint("scope", "key", name="uq_idempotency_records_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    scope = Column(String(32), nullable=False)  # endpoint: "submit" | "score"
+    key = Column(String(255), nullable=False)  # Idempotency-Key header
+    fingerprint = Column(String(64), nullable=False)  # SHA-256 of the request
+
+    # State: "in_progress" | "done"
+    status = Column(String(16), nullable=False, default="in_progress")
+    status_code = Column(Integer, nullable=True)
+    response = Column(JSON, nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class TranscriptionJob(Base):
+    __tablename__ = "transcription_jobs"
+
+    id = Column(String(36), primary_key=True)  # uuid4
+
+    # Submission
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    prompt_id = Column(Integer, ForeignKey("prompts.id"), nullable=False)
+    audio_path = Column(String, nullable=False)
+    audio_sha256 = Column(String(64), ForeignKey("audio_blobs.sha256"), nullable=True, index=True)
+    stt_tier = Column(String(16), nullable=True)
+    stt_profile = Column(String(16), nullable=True)
+
+    # State: "queued" | "running" | "done" | "failed"
+    status = Column(String(16), nullable=False, default="queued", index=True)
+    transcript_id = Column(Integer, ForeignKey("transcripts.id"), nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
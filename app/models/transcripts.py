@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -19,6 +19,8 @@ class Transcript(Base):
     text = Column(Text, nullable=False)  # final text (typed or whisper output)
     input_mode = Column(String(10), nullable=False)  # "text" | "speech"
     audio_path = Column(String, nullable=True)
+    # Whisper segment scores and word timestamps (see app/utils/speech_signals.py)
+    speech_signals = Column(JSON, nullable=True)
 
     created_at = Column(
         DateTime(timezone=True),
@@ -30,3 +32,8 @@ class Transcript(Base):
     user = relationship("User", back_populates="transcripts")
     attempt = relationship("Attempt", back_populates="transcripts", cascade="all, delete-orphan")
     prompt = relationship("Prompt", back_populates="transcripts")
+    analysis_results = relationship(
+        "AnalysisResult",
+        back_populates="transcript",
+        cascade="all, delete-orphan"
+    )
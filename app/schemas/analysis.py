@@ -9,6 +9,8 @@ class LanguageAnalysisResponse(BaseModel):
     avg_sentence_length: float
     grammar_errors: int
     spelling_errors: int
+    style_issues: int = 0
+    issue_categories: Dict[str, int] = {}
     vocabulary_richness: float
     readability_score: float
     long_sentences: int
@@ -16,9 +18,20 @@ class LanguageAnalysisResponse(BaseModel):
 class SpeakingAnalysisResponse(BaseModel):
     total_duration: float
     words_per_minute: float
+    speech_rate: float = 0
+    articulation_rate: float = 0
+    phonation_time: float = 0
     filler_words_count: int
+    hedges_count: int = 0
+    discourse_markers_count: int = 0
+    phrases: Dict[str, dict] = {}  # per category: count, phrases, positions
     pauses_count: int
+    short_pauses_count: int = 0
+    total_pause_time: float = 0
+    mean_pause: float = 0
     pronunciation_score: float
+    repetitive_segments: int = 0
+    timing_source: str = "audio"
     fluency_score: float
     clarity_score: float
 
@@ -0,0 +1,78 @@
+# app/scripts/bench_decode_profiles.py
+"""
+Real-time factor and word error rate of each Whisper decode profile.
+
+The sample directory holds audio files, each with a reference transcript
+next to it under the same name with a .txt extension
+(e.g. answer_01.wav + answer_01.txt). Recordings are not shipped with
+the repo; point the script at a set of representative student answers.
+
+Usage: python -m app.scripts.bench_decode_profiles [sample_dir] [tier]
+"""
+import os
+import re
+import sys
+import time
+
+from app.services.decode_profiles import DECODE_PROFILES
+from app.services.model_manager import inference, model_manager
+from app.utils.audio_buffer import AudioBuffer
+
+DEFAULT_SAMPLE_DIR = "data/stt_samples"
+AUDIO_EXTENSIONS = (".wav", ".flac", ".ogg", ".webm", ".mp3", ".m4a")
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def normalize(text: str) -> list:
+    return _WORD_RE.findall(text.lower())
+
+
+def word_errors(reference: list, hypothesis: list) -> int:
+    """Word-level edit distance (substitutions + deletions + insertions)."""
+    prev = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        cur = [i] + [0] * len(hypothesis)
+        for j, hyp_word in enumerate(hypothesis, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ref_word != hyp_word))
+        prev = cur
+    return prev[-1]
+
+
+def load_samples(sample_dir: str) -> list:
+    samples = []
+    for name in sorted(os.listdir(sample_dir)):
+        stem, ext = os.path.splitext(name)
+        reference = os.path.join(sample_dir, stem + ".txt")
+        if ext.lower() in AUDIO_EXTENSIONS and os.path.exists(reference):
+            with open(reference, encoding="utf-8") as f:
+                samples.append((AudioBuffer.from_file(os.path.join(sample_dir, name), cache=False), f.read()))
+    return samples
+
+
+def run(sample_dir: str = DEFAULT_SAMPLE_DIR, tier: str = "base"):
+    if not os.path.isdir(sample_dir):
+        raise SystemExit(f"❌ No sample directory {sample_dir} (audio files with matching .txt references)")
+    samples = load_samples(sample_dir)
+    if not samples:
+        raise SystemExit(f"❌ No audio/.txt pairs in {sample_dir}")
+
+    model = model_manager.get(tier)
+    audio_seconds = sum(audio.duration for audio, _ in samples)
+    ref_words = sum(len(normalize(ref)) for _, ref in samples)
+    print(f"{len(samples)} samples, {audio_seconds:.1f}s of audio, tier {tier}")
+
+    with inference():
+        model.transcribe(samples[0][0].samples, fp16=False)  # warm-up
+        for profile, options in DECODE_PROFILES.items():
+            errors = 0
+            start = time.perf_counter()
+            for audio, reference in samples:
+                text = model.transcribe(audio.samples, **options)["text"]
+                errors += word_errors(normalize(reference), normalize(text))
+            elapsed = time.perf_counter() - start
+            print(f"{profile:>9}: RTF {elapsed / audio_seconds:.3f}  WER {errors / max(ref_words, 1):.2%}  ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    run(*sys.argv[1:3])
@@ -0,0 +1,76 @@
+# app/scripts/bench_language_check.py
+"""
+Compare one LanguageTool pass per text against the old
+grammar-then-spelling double pass, with the sentence cache cold and warm.
+
+Usage: python -m app.scripts.bench_language_check [repeats]
+"""
+import sys
+import time
+
+from app.utils.text_utils import get_language_tool, check_text, sentence_cache
+
+SAMPLE_TEXTS = [
+    "My name is Priya. I am from Pune and I works in a software company.",
+    "Yesterday I goed to the market with my freind and we buyed some vegetables.",
+    (
+        "Social media have changed the way people communicate. "
+        "Many students spends hours every day on their phones, "
+        "which effect their studies and there sleep. "
+        "However, it also help them to stay connected with family."
+    ),
+]
+
+
+def double_pass(text: str):
+    tool = get_language_tool()
+    grammar = [m for m in tool.check(text) if m.ruleIssueType == "grammar"]
+    spelling = [m for m in tool.check(text) if m.ruleIssueType == "misspelling"]
+    return len(grammar), len(spelling)
+
+
+def single_pass(text: str):
+    check = check_text(text)
+    return check.grammar_errors, check.spelling_errors
+
+
+def single_pass_cold(text: str):
+    sentence_cache.clear()
+    return single_pass(text)
+
+
+def measure(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in SAMPLE_TEXTS:
+            fn(text)
+    return (time.perf_counter() - start) / (repeats * len(SAMPLE_TEXTS))
+
+
+def run(repeats: int = 20):
+    # Warm up the JVM so the first request does not skew the numbers
+    for text in SAMPLE_TEXTS:
+        get_language_tool().check(text)
+
+    # Counts must not depend on the cache
+    max_size = sentence_cache.max_size
+    sentence_cache.max_size = 0
+    uncached = [single_pass(text) for text in SAMPLE_TEXTS]
+    sentence_cache.max_size = max_size
+    sentence_cache.clear()
+    if uncached != [single_pass(text) for text in SAMPLE_TEXTS]:
+        raise SystemExit("❌ Counts differ with the sentence cache enabled")
+
+    two = measure(double_pass, repeats)
+    cold = measure(single_pass_cold, repeats)
+    sentence_cache.clear()
+    warm = measure(single_pass, repeats)
+
+    print(f"two passes:        {two * 1000:.1f} ms/text")
+    print(f"one pass (cold):   {cold * 1000:.1f} ms/text  ({two / cold:.2f}x)")
+    print(f"one pass (cached): {warm * 1000:.1f} ms/text  ({two / warm:.2f}x)")
+    print(f"cache: {sentence_cache.stats()}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
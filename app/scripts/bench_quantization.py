@@ -0,0 +1,73 @@
+# app/scripts/bench_quantization.py
+"""
+Compare the fp32 and dynamic int8 Whisper models: load time, weight
+memory, process RSS growth, per-clip latency, and how far the int8
+transcripts drift from fp32 (word error rate against the fp32 output,
+or against <clip>.txt references when they exist).
+
+Usage: python -m app.scripts.bench_quantization <audio>... [--tier base]
+"""
+import os
+import sys
+import time
+
+from app.scripts.bench_decode_profiles import normalize, word_errors
+from app.services.decode_profiles import decode_options
+from app.services.model_manager import WhisperModelManager, inference
+from app.utils.audio_buffer import AudioBuffer
+
+
+def _reference(path: str) -> str | None:
+    txt = os.path.splitext(path)[0] + ".txt"
+    if os.path.exists(txt):
+        with open(txt, encoding="utf-8") as f:
+            return f.read()
+    return None
+
+
+def run(paths: list, tier: str = "base"):
+    clips = [AudioBuffer.from_file(p, cache=False) for p in paths]
+    references = [_reference(p) for p in paths]
+    audio_seconds = sum(c.duration for c in clips)
+    options = decode_options("fast")  # deterministic, so differences come from the weights
+    manager = WhisperModelManager()
+
+    outputs = {}
+    for label, quantize in (("fp32", False), ("int8", True)):
+        entry = manager._load(tier, pinned=False, quantize=quantize)
+        model = entry.model
+        latencies = []
+        texts = []
+        with inference():
+            model.transcribe(clips[0].samples, **options)  # warm-up
+            for clip in clips:
+                start = time.perf_counter()
+                texts.append(model.transcribe(clip.samples, **options)["text"])
+                latencies.append(time.perf_counter() - start)
+        outputs[label] = texts
+
+        latencies.sort()
+        print(
+            f"{label}: load {entry.load_seconds:.2f}s, weights {entry.param_bytes / 1e6:.0f} MB, "
+            f"RSS +{entry.rss_delta / 1e6:.0f} MB, p50 {latencies[len(latencies) // 2] * 1000:.0f} ms, "
+            f"RTF {sum(latencies) / audio_seconds:.3f}"
+        )
+        del entry, model
+
+    for label, texts in outputs.items():
+        pairs = [(ref if ref is not None else fp32, hyp) for ref, fp32, hyp in zip(references, outputs["fp32"], texts)]
+        errors = sum(word_errors(normalize(ref), normalize(hyp)) for ref, hyp in pairs)
+        words = sum(len(normalize(ref)) for ref, _ in pairs)
+        print(f"{label} WER: {errors / max(words, 1):.2%}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    tier = "base"
+    if "--tier" in args:
+        i = args.index("--tier")
+        tier = args[i + 1]
+        del args[i:i + 2]
+    if not args:
+        raise SystemExit(__doc__)
+    run(args, tier)
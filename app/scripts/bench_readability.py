@@ -0,0 +1,91 @@
+# app/scripts/bench_readability.py
+"""
+Check the cached/vectorized readability metrics against textstat and
+compare throughput.
+
+Usage: python -m app.scripts.bench_readability [repeats] [tolerance]
+"""
+import sys
+import time
+
+import textstat
+
+from app.scripts.bench_language_check import SAMPLE_TEXTS
+from app.utils.readability import _pronunciations, batch_readability, syllable_cache_info
+from app.utils.text_index import DocumentIndex
+
+TEXTS = SAMPLE_TEXTS + [
+    (
+        "Learning a new language takes patience. Every day I practise speaking "
+        "with my colleagues, and I read articles about technology and science. "
+        "Sometimes I make mistakes, but my teacher says that mistakes are an "
+        "important part of learning. Next year I would like to pass the "
+        "international examination and work abroad."
+    ),
+    (
+        "Dr. Smith arrived at 5 p.m. and didn't stay long. She said it's a "
+        "well-known fact that 3.5 percent of students' essays aren't finished. "
+        "I ran. He sat. \"Why?\" we asked, e.g. about the U.S. exam results."
+    ),
+]
+
+METRICS = [
+    "flesch_reading_ease",
+    "flesch_kincaid_grade",
+    "coleman_liau_index",
+    "automated_readability_index",
+    "smog_index",
+]
+
+
+def use_same_syllable_source():
+    """
+    textstat downloads CMUdict when it is missing, while we fall back to
+    Pyphen: without a local copy, make textstat use Pyphen too.
+    """
+    if not _pronunciations():
+        from textstat.backend.counts import _count_syllables
+
+        _count_syllables.get_cmudict = lambda lang: {}
+        print("CMUdict not installed: comparing Pyphen syllable counts")
+
+
+def run(repeats: int = 50, tolerance: float = 0.1):
+    use_same_syllable_source()
+    for text in TEXTS:
+        index = DocumentIndex(text)
+        ours = (index.word_count, index.sentence_count)
+        reference = (textstat.lexicon_count(text), textstat.sentence_count(text))
+        if ours != reference:
+            raise SystemExit(f"❌ Words/sentences {ours} != textstat {reference} for {text[:40]!r}")
+
+    ours = batch_readability(TEXTS)
+    worst = 0.0
+    for name in METRICS:
+        reference = [getattr(textstat, name)(t) for t in TEXTS]
+        diffs = [abs(a - b) for a, b in zip(ours[name], reference)]
+        worst = max(worst, max(diffs))
+        print(f"{name:>28}: max |diff| {max(diffs):.2f}")
+
+    # Distinct texts, so textstat's per-text result cache does not hide its cost
+    texts = [f"{t} Attempt number {i}." for i in range(repeats) for t in TEXTS]
+    start = time.perf_counter()
+    for t in texts:
+        textstat.flesch_kincaid_grade(t)
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_readability(texts)
+    batch_time = time.perf_counter() - start
+
+    print(f"textstat: {reference_time / len(texts) * 1e6:8.1f} µs/text (FK only)")
+    print(f"batch:    {batch_time / len(texts) * 1e6:8.1f} µs/text (all metrics)")
+    print(f"syllable cache: {syllable_cache_info()}")
+
+    if worst > tolerance:
+        raise SystemExit(f"❌ Differs from textstat by more than {tolerance}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(int(args[0]) if args else 50, float(args[1]) if len(args) > 1 else 0.1)
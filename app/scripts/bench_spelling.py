@@ -0,0 +1,60 @@
+# app/scripts/bench_spelling.py
+"""
+Compare the local spelling index against LanguageTool's misspelling rule:
+agreement on which words are flagged, and throughput.
+
+Usage: python -m app.scripts.bench_spelling [repeats]
+"""
+import sys
+import time
+
+from app.scripts.bench_language_check import SAMPLE_TEXTS
+from app.utils.spelling import get_spell_checker
+from app.utils.text_utils import get_language_tool
+
+
+def languagetool_flags(text: str) -> set:
+    matches = get_language_tool().check(text)
+    return {m.offset for m in matches if m.ruleIssueType == "misspelling"}
+
+
+def local_flags(checker, text: str) -> set:
+    return {offset for offset, _ in checker.misspelled(text)}
+
+
+def run(repeats: int = 20):
+    checker = get_spell_checker()
+    if checker is None:
+        raise SystemExit("❌ No spelling index: run python -m app.scripts.build_spelling_index first")
+
+    both = only_lt = only_local = 0
+    for text in SAMPLE_TEXTS:
+        lt, local = languagetool_flags(text), local_flags(checker, text)
+        both += len(lt & local)
+        only_lt += len(lt - local)
+        only_local += len(local - lt)
+
+    precision = both / (both + only_local) if both + only_local else 1.0
+    recall = both / (both + only_lt) if both + only_lt else 1.0
+    print(f"agreement vs LanguageTool: precision {precision:.2f}, recall {recall:.2f}")
+
+    words = sum(len(t.split()) for t in SAMPLE_TEXTS) * repeats
+    for name, fn in (
+        ("languagetool", languagetool_flags),
+        ("local index", lambda t: local_flags(checker, t)),
+    ):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for text in SAMPLE_TEXTS:
+                fn(text)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>12}: {elapsed / words * 1e6:8.1f} µs/word")
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        checker.suggestions("freind")
+    print(f" suggestions: {(time.perf_counter() - start) / repeats * 1e6:8.1f} µs/word")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,72 @@
+# app/scripts/bench_whisper_batching.py
+"""
+Throughput of dynamic batching against one-at-a-time transcription.
+Sends `requests` transcriptions of the given short clips from as many
+concurrent threads, first through model.transcribe, then through the
+batcher, and reports clips per second for each. Both paths use the
+decode profile's options and align word timestamps, as transcription
+jobs do.
+
+Usage: python -m app.scripts.bench_whisper_batching <audio>... [--requests N] [--tier base] [--batch 8] [--profile fast]
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.decode_profiles import decode_options
+from app.services.model_manager import inference, model_manager
+from app.services.whisper_batcher import WhisperBatcher
+from app.utils.audio_buffer import AudioBuffer
+
+
+def _timed(fn, clips: list, requests: int, workers: int) -> float:
+    jobs = [clips[i % len(clips)] for i in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(fn, jobs))
+    return time.perf_counter() - start
+
+
+def run(paths: list, requests: int = 32, tier: str = "base", batch_size: int = 8, profile: str = "fast"):
+    model = model_manager.get(tier)
+    batcher = WhisperBatcher(model_manager, max_batch_size=batch_size)
+    options = decode_options(profile)
+    # Decode up front so both paths measure inference only
+    clips = [AudioBuffer.from_file(p, cache=False) for p in paths]
+
+    def single(clip):
+        with inference():
+            return model.transcribe(clip.samples, word_timestamps=True, **options)
+
+    def batched(clip):
+        return batcher.transcribe(clip, tier, options, word_timestamps=True)
+
+    # Warm up both paths so model loading and first-call costs are excluded
+    single(clips[0])
+    batched(clips[0])
+
+    # The single path serializes on the model anyway; one worker avoids thread thrash
+    single_time = _timed(single, clips, requests, workers=1)
+    batched_time = _timed(batched, clips, requests, workers=batch_size * 2)
+
+    stats = batcher.stats()
+    print(f"{requests} requests, tier {tier}, profile {profile}, {len(paths)} distinct clips")
+    print(f"  single : {single_time:7.2f}s  {requests / single_time:6.2f} clips/s")
+    print(f"  batched: {batched_time:7.2f}s  {requests / batched_time:6.2f} clips/s  (x{single_time / batched_time:.2f})")
+    print(f"  batch sizes {stats['batch_sizes']}, avg wait {stats['avg_wait_ms']} ms, avg decode {stats['avg_decode_ms']} ms")
+    print(f"  fallbacks {stats['fallback_clips']}, over 30s {stats['single_clips']}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = {"--requests": 32, "--tier": "base", "--batch": 8, "--profile": "fast"}
+    paths = []
+    while args:
+        arg = args.pop(0)
+        if arg in options:
+            options[arg] = type(options[arg])(args.pop(0))
+        else:
+            paths.append(arg)
+    if not paths:
+        raise SystemExit(__doc__)
+    run(paths, options["--requests"], options["--tier"], options["--batch"], options["--profile"])
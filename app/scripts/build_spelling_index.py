@@ -0,0 +1,28 @@
+# app/scripts/build_spelling_index.py
+"""
+Build the memory-mapped spelling index from a word list.
+Lines are either 'word' or 'word frequency' (e.g. SymSpell's
+frequency_dictionary_en_82_765.txt).
+
+Usage: python -m app.scripts.build_spelling_index [word_list] [output]
+"""
+import os
+import sys
+import time
+
+from app.core.config import SPELLING_INDEX_PATH
+from app.utils.spelling import build_index, read_word_list
+
+DEFAULT_WORD_LIST = "/usr/share/dict/words"
+
+
+def run(word_list: str = DEFAULT_WORD_LIST, output: str = SPELLING_INDEX_PATH):
+    start = time.perf_counter()
+    words = read_word_list(word_list)
+    build_index(words, output)
+    size_mb = os.path.getsize(output) / 1e6
+    print(f"✅ Indexed {len(words)} words into {output} ({size_mb:.1f} MB) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    run(*sys.argv[1:3])
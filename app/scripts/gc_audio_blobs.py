@@ -0,0 +1,33 @@
+# app/scripts/gc_audio_blobs.py
+"""
+Delete stored audio nobody references any more: blobs whose reference
+count dropped to zero and that have been unused for the grace period,
+plus files in the store that no blob points to.
+
+Usage: python -m app.scripts.gc_audio_blobs [--dry-run] [grace_seconds]
+"""
+import sys
+
+from app.core.config import AUDIO_BLOB_GC_GRACE_SECONDS
+from app.db.session import SessionLocal
+from app.services.audio_store import audio_store
+
+
+def run(grace_seconds: float = AUDIO_BLOB_GC_GRACE_SECONDS, dry_run: bool = False):
+    db = SessionLocal()
+    try:
+        result = audio_store.collect_garbage(db, grace_seconds, dry_run=dry_run)
+    finally:
+        db.close()
+    prefix = "🔎 Would delete" if dry_run else "🧹 Deleted"
+    print(
+        f"{prefix} {result['blobs_deleted']} blobs and {result['orphan_files_deleted']} orphan files, "
+        f"{result['bytes_freed'] / 1e6:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    dry_run = "--dry-run" in args
+    args = [a for a in args if a != "--dry-run"]
+    run(float(args[0]) if args else AUDIO_BLOB_GC_GRACE_SECONDS, dry_run)
@@ -0,0 +1,39 @@
+# app/scripts/run_languagetool_pool.py
+"""
+Start a pool of local LanguageTool servers shared by every API worker
+on this host, then point the workers at it:
+
+    python -m app.scripts.run_languagetool_pool
+    LANGUAGETOOL_SERVERS=http://127.0.0.1:8081,http://127.0.0.1:8082 uvicorn app.main:app --workers 4
+
+JVM memory then grows with LANGUAGETOOL_POOL_SIZE, not with --workers.
+"""
+from app.core.config import (
+    LANGUAGETOOL_POOL_SIZE,
+    LANGUAGETOOL_POOL_BASE_PORT,
+    LANGUAGETOOL_JAVA_HEAP,
+    LANGUAGETOOL_JAR_DIR,
+)
+from app.utils.languagetool_pool import LanguageToolServerPool
+
+
+def run():
+    pool = LanguageToolServerPool(
+        size=LANGUAGETOOL_POOL_SIZE,
+        base_port=LANGUAGETOOL_POOL_BASE_PORT,
+        jar_dir=LANGUAGETOOL_JAR_DIR,
+        heap=LANGUAGETOOL_JAVA_HEAP,
+    )
+    pool.start()
+    print(f"✅ LanguageTool pool started: LANGUAGETOOL_SERVERS={','.join(pool.urls)}")
+    try:
+        pool.supervise()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+        print("🛑 LanguageTool pool stopped")
+
+
+if __name__ == "__main__":
+    run()
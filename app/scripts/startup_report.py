@@ -0,0 +1,48 @@
+# app/scripts/startup_report.py
+"""
+Measure what startup costs: time per import and per model load.
+
+Usage: python -m app.scripts.startup_report [--no-models]
+"""
+import importlib
+import sys
+
+from app.core.startup import StartupReport
+
+# In dependency order; each line only pays for what earlier ones did not load
+MODULES = [
+    "app.db.session",
+    "app.models",
+    "app.utils.text_utils",
+    "app.utils.audio_utils",
+    "app.services.language_analysis",
+    "app.services.speaking_analysis",
+    "app.services.speech_to_text",
+    "app.api.v1.routers.analysis",
+    "app.api.v1.routers.evaluate",
+    "app.main",
+]
+
+
+def run(load_models: bool = True):
+    report = StartupReport()
+
+    for module in MODULES:
+        with report.measure(f"import {module}"):
+            importlib.import_module(module)
+
+    if load_models:
+        from app.services.model_manager import model_manager
+        from app.utils.text_utils import get_language_tool
+
+        with report.measure("load LanguageTool"):
+            get_language_tool().check("Warm up.")
+        for tier in model_manager.tiers:
+            with report.measure(f"load Whisper {tier}"):
+                model_manager.get(tier)
+
+    report.print()
+
+
+if __name__ == "__main__":
+    run(load_models="--no-models" not in sys.argv)
@@ -0,0 +1,175 @@
+# app/services/analysis_pipeline.py
+from app.utils.spelling import get_spell_checker
+from app.utils.text_index import DocumentIndex
+from app.utils.text_utils import check_text, compute_readability
+
+
+class AnalysisStage:
+    """
+    One step of the text analysis pipeline.
+    `provides` are the keys it adds to the context (output fields or
+    intermediate artifacts), `requires` the keys it reads, and `cost`
+    a rough relative price used to order and report the plan.
+    """
+
+    def __init__(self, name: str, provides, requires, cost: int, func):
+        self.name = name
+        self.provides = tuple(provides)
+        self.requires = tuple(requires)
+        self.cost = cost
+        self.func = func
+
+
+STAGES = {}
+_PROVIDERS = {}
+
+# Context keys that are internal artifacts, not response fields
+ARTIFACTS = {"index", "language_check"}
+
+# Short names accepted in ?fields=
+FIELD_ALIASES = {
+    "readability": "readability_score",
+    "grammar": "grammar_errors",
+    "spelling": "spelling_errors",
+    "style": "style_issues",
+}
+
+
+def register_stage(name: str, provides, requires=(), cost: int = 1):
+    """Decorator that registers a stage function `func(ctx) -> dict`."""
+    def decorator(func):
+        stage = AnalysisStage(name, provides, requires, cost, func)
+        STAGES[name] = stage
+        for key in stage.provides:
+            _PROVIDERS[key] = stage
+        return func
+    return decorator
+
+
+# ---------------- Stages ----------------
+@register_stage("index", provides=("index",), cost=1)
+def _index_stage(ctx):
+    return {"index": DocumentIndex(ctx["text"])}
+
+
+@register_stage(
+    "counts",
+    provides=("word_count", "sentence_count", "avg_sentence_length", "vocabulary_richness", "long_sentences"),
+    requires=("index",),
+    cost=1,
+)
+def _counts_stage(ctx):
+    index = ctx["index"]
+    word_count = index.word_count
+    sentence_count = index.sentence_count
+    avg_sentence_length = word_count / sentence_count if sentence_count > 0 else 0
+    vocabulary_richness = index.unique_word_count / word_count if word_count > 0 else 0
+    return {
+        "word_count": word_count,
+        "sentence_count": sentence_count,
+        "avg_sentence_length": round(avg_sentence_length, 2),
+        "vocabulary_richness": round(vocabulary_richness, 2),
+        "long_sentences": index.long_sentence_count(20),
+    }
+
+
+@register_stage("readability", provides=("readability_score",), requires=("index",), cost=5)
+def _readability_stage(ctx):
+    return {"readability_score": round(compute_readability(ctx["text"], ctx["index"]), 2)}
+
+
+@register_stage("language_check", provides=("language_check",), requires=("index",), cost=100)
+def _language_check_stage(ctx):
+    return {"language_check": check_text(ctx["text"], ctx["index"])}
+
+
+@register_stage(
+    "language_issues",
+    provides=("grammar_errors", "style_issues", "issue_categories"),
+    requires=("language_check",),
+    cost=1,
+)
+def _language_issues_stage(ctx):
+    check = ctx["language_check"]
+    return {
+        "grammar_errors": check.grammar_errors,
+        "style_issues": check.style_issues,
+        "issue_categories": check.category_counts,
+    }
+
+
+@register_stage("spelling", provides=("spelling_errors",), requires=("index",), cost=3)
+def _spelling_stage(ctx):
+    checker = get_spell_checker()
+    if checker is not None:
+        return {"spelling_errors": checker.count_errors(ctx["text"])}
+    # No local index: fall back to LanguageTool and keep its result for later stages
+    check = ctx.get("language_check") or check_text(ctx["text"], ctx["index"])
+    return {"spelling_errors": check.spelling_errors, "language_check": check}
+
+
+# ---------------- Planning & running ----------------
+def available_fields() -> dict:
+    """Every selectable field and the total cost of computing it alone."""
+    return {
+        key: sum(s.cost for s in plan([key]))
+        for key in _PROVIDERS
+        if key not in ARTIFACTS
+    }
+
+
+def parse_fields(fields: str | None, allowed=None) -> list | None:
+    """
+    Turn 'word_count,readability' into field names; None means all.
+    `allowed` limits the fields a caller may ask for.
+    """
+    if not fields:
+        return None
+    names = [FIELD_ALIASES.get(f.strip(), f.strip()) for f in fields.split(",") if f.strip()]
+    unknown = [f for f in names if f not in _PROVIDERS or f in ARTIFACTS]
+    if unknown:
+        raise ValueError(f"Unknown analysis fields: {', '.join(unknown)}")
+    if allowed is not None:
+        refused = [f for f in names if f not in allowed]
+        if refused:
+            raise ValueError(f"Fields not available here: {', '.join(refused)} (available: {', '.join(allowed)})")
+    return names
+
+
+def plan(fields, available=()) -> list:
+    """Stages needed for `fields`, dependencies first, skipping keys already `available`."""
+    ordered = []
+    seen = set()
+
+    def visit(stage):
+        if stage.name in seen:
+            return
+        seen.add(stage.name)
+        # Cheaper dependencies first
+        deps = [_PROVIDERS[k] for k in stage.requires if k not in available]
+        for dep in sorted(deps, key=lambda s: s.cost):
+            visit(dep)
+        ordered.append(stage)
+
+    stages = {_PROVIDERS[f] for f in fields if f not in available}
+    for stage in sorted(stages, key=lambda s: s.cost):
+        visit(stage)
+    return ordered
+
+
+def run_pipeline(text: str, fields=None, context: dict | None = None) -> dict:
+    """
+    Compute only the stages `fields` need and return those fields.
+    `context` may carry precomputed artifacts (index, language_check).
+    """
+    if fields is None:
+        fields = [k for k in _PROVIDERS if k not in ARTIFACTS]
+    ctx = {k: v for k, v in (context or {}).items() if v is not None}
+    ctx["text"] = text
+
+    for stage in plan(fields, available=ctx.keys()):
+        if all(key in ctx for key in stage.provides):
+            continue  # an earlier stage already produced it
+        ctx.update(stage.func(ctx))
+
+    return {f: ctx[f] for f in fields}
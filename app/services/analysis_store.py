@@ -0,0 +1,142 @@
+# app/services/analysis_store.py
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.analysis_result import AnalysisResult
+from app.models.transcripts import Transcript
+from app.services.analysis_pipeline import run_pipeline
+from app.services.basic_analysis import BasicAnalysisService
+from app.services.language_analysis import LanguageAnalysisService
+from app.services.speaking_analysis import SpeakingAnalysisService
+from app.utils.audio_buffer import AudioBuffer
+from app.utils.text_index import DocumentIndex
+
+# Results are stored with the analyzer's VERSION and only served while it
+# matches: an analyzer bumps its VERSION whenever its output changes, and
+# stored results of older versions are recomputed on the next read.
+ANALYZERS = {
+    BasicAnalysisService.ANALYZER: BasicAnalysisService,
+    LanguageAnalysisService.ANALYZER: LanguageAnalysisService,
+    SpeakingAnalysisService.ANALYZER: SpeakingAnalysisService,
+}
+
+
+# ---------------- Running analyzers ----------------
+def applicable_analyzers(transcript: Transcript) -> list:
+    """Analyzers that can run on this transcript."""
+    names = [BasicAnalysisService.ANALYZER, LanguageAnalysisService.ANALYZER]
+    if transcript.audio_path:
+        names.append(SpeakingAnalysisService.ANALYZER)
+    return names
+
+
+def run_analyzer(
+    analyzer: str,
+    transcript: Transcript,
+    index: DocumentIndex | None = None,
+    audio: AudioBuffer | None = None,
+) -> dict:
+    if analyzer == BasicAnalysisService.ANALYZER:
+        return BasicAnalysisService.analyze(transcript.text, index)
+    if analyzer == LanguageAnalysisService.ANALYZER:
+        return LanguageAnalysisService(transcript.text, index=index).analyze()
+    if analyzer == SpeakingAnalysisService.ANALYZER:
+        return SpeakingAnalysisService(
+            transcript.text, transcript.audio_path, audio=audio, signals=transcript.speech_signals
+        ).analyze()
+    raise ValueError(f"Unknown analyzer: {analyzer}")
+
+
+# ---------------- Stored results ----------------
+def get_stored_result(db: Session, transcript_id: int, analyzer: str) -> dict | None:
+    """Result for the current analyzer version, or None."""
+    row = (
+        db.query(AnalysisResult.result)
+        .filter(
+            AnalysisResult.transcript_id == transcript_id,
+            AnalysisResult.analyzer == analyzer,
+            AnalysisResult.analyzer_version == ANALYZERS[analyzer].VERSION,
+        )
+        .first()
+    )
+    return row.result if row else None
+
+
+def store_result(db: Session, transcript_id: int, analyzer: str, result: dict) -> dict:
+    """Save a result; if another worker stored it first, keep theirs."""
+    record = AnalysisResult(
+        transcript_id=transcript_id,
+        analyzer=analyzer,
+        analyzer_version=ANALYZERS[analyzer].VERSION,
+        result=result,
+    )
+    try:
+        db.add(record)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return get_stored_result(db, transcript_id, analyzer) or result
+    except Exception:
+        db.rollback()
+        raise
+    return result
+
+
+def get_analysis(
+    db: Session,
+    transcript: Transcript,
+    analyzer: str,
+    index: DocumentIndex | None = None,
+    audio: AudioBuffer | None = None,
+) -> dict:
+    """
+    Read a materialized result, computing and storing it on a miss
+    (first read after a version bump, or before the background job ran).
+    """
+    result = get_stored_result(db, transcript.id, analyzer)
+    if result is None:
+        result = store_result(db, transcript.id, analyzer, run_analyzer(analyzer, transcript, index, audio))
+    return result
+
+
+def get_analysis_fields(
+    db: Session,
+    transcript: Transcript,
+    analyzer: str,
+    fields: list | None = None,
+) -> dict:
+    """
+    Like get_analysis, but only for the requested text fields.
+    Served from the stored result when it has them; otherwise only the
+    pipeline stages those fields need are run (and nothing is stored).
+    """
+    if not fields:
+        return get_analysis(db, transcript, analyzer)
+
+    stored = get_stored_result(db, transcript.id, analyzer) or {}
+    result = {f: stored[f] for f in fields if f in stored}
+    missing = [f for f in fields if f not in result]
+    if missing:
+        result.update(run_pipeline(transcript.text, missing))
+    return {f: result[f] for f in fields}
+
+
+def materialize_analyses(transcript_id: int, audio: AudioBuffer | None = None):
+    """
+    Background task: compute every applicable analysis for a new transcript.
+    Uses its own session because the request session is closed by then.
+    `audio` is the already decoded recording, when the caller has it.
+    """
+    db = SessionLocal()
+    try:
+        transcript = db.query(Transcript).filter(Transcript.id == transcript_id).first()
+        if not transcript:
+            return
+        index = DocumentIndex(transcript.text)  # shared by the text analyzers
+        for analyzer in applicable_analyzers(transcript):
+            get_analysis(db, transcript, analyzer, index, audio)
+    except Exception as e:
+        print(f"❌ Error materializing analysis for transcript {transcript_id}: {e}")
+    finally:
+        db.close()
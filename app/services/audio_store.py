@@ -0,0 +1,169 @@
+# app/services/audio_store.py
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import AUDIO_STORE_DIR, AUDIO_BLOB_GC_GRACE_SECONDS
+from app.models.audio_blob import AudioBlob
+from app.models.transcription_job import TranscriptionJob
+from app.models.transcripts import Transcript
+from app.utils.upload import SavedUpload
+
+# Files derived from a stored blob (see AudioBuffer and ingest_audio)
+_DERIVED_SUFFIXES = (".16k.npy", ".16k.npy.json")
+
+
+class AudioStore:
+    """
+    Content-addressed audio storage. Each distinct upload is kept once,
+    under a path derived from its SHA-256 and sharded over two directory
+    levels, and shared by every submission of the same bytes.
+    """
+
+    def __init__(self, root: str = AUDIO_STORE_DIR):
+        self.root = root
+
+    def blob_path(self, sha256: str, extension: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], f"{sha256}.{extension}")
+
+    # ---------------- References ----------------
+    def add(self, db: Session, upload: SavedUpload) -> AudioBlob:
+        """
+        Take a reference on the blob for this upload, moving the file into
+        the store if the bytes are new, or dropping it if they are known.
+        """
+        blob = db.get(AudioBlob, upload.sha256)
+        if blob is None:
+            path = self.blob_path(upload.sha256, upload.audio_format)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(upload.path, path)
+            blob = AudioBlob(
+                sha256=upload.sha256,
+                size=upload.size,
+                audio_format=upload.audio_format,
+                path=path,
+                ref_count=0,
+            )
+            try:
+                db.add(blob)
+                db.flush()
+            except IntegrityError:
+                # Another request stored the same bytes first
+                db.rollback()
+                blob = db.get(AudioBlob, upload.sha256)
+        else:
+            os.remove(upload.path)
+
+        blob.ref_count += 1
+        blob.last_used_at = datetime.now(timezone.utc)
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return blob
+
+    def release(self, db: Session, sha256: str):
+        """Drop one reference; the blob becomes collectable at zero."""
+        blob = db.get(AudioBlob, sha256)
+        if blob is not None and blob.ref_count > 0:
+            blob.ref_count -= 1
+            db.commit()
+
+    @staticmethod
+    def move_references(db: Session, old_path: str, new_path: str):
+        """
+        Point transcripts and pending jobs that use `old_path` at `new_path`
+        (after ingest replaced a blob's file). Committed by the caller.
+        """
+        db.query(Transcript).filter(Transcript.audio_path == old_path).update(
+            {Transcript.audio_path: new_path}, synchronize_session=False
+        )
+        db.query(TranscriptionJob).filter(
+            TranscriptionJob.audio_path == old_path,
+            TranscriptionJob.status == "queued",
+        ).update({TranscriptionJob.audio_path: new_path}, synchronize_session=False)
+
+    @staticmethod
+    def referenced_paths(db: Session) -> set:
+        """Absolute paths some blob, transcript or unfinished job still points at."""
+        paths = {path for (path,) in db.query(AudioBlob.path).all()}
+        paths.update(
+            path for (path,) in db.query(Transcript.audio_path).filter(Transcript.audio_path.isnot(None)).all()
+        )
+        paths.update(
+            path for (path,) in db.query(TranscriptionJob.audio_path)
+            .filter(TranscriptionJob.status.in_(("queued", "running"))).all()
+        )
+        return {os.path.abspath(p) for p in paths}
+
+    # ---------------- Cached transcripts ----------------
+    @staticmethod
+    def cached_transcript(blob: AudioBlob, stt_tier: str, stt_profile: str) -> dict | None:
+        """The stored transcript of these bytes, if it was made with the same settings."""
+        if blob.transcript_text and blob.stt_tier == stt_tier and blob.stt_profile == stt_profile:
+            return {"text": blob.transcript_text, "signals": blob.speech_signals}
+        return None
+
+    @staticmethod
+    def remember_transcript(blob: AudioBlob, text: str, signals: dict | None, stt_tier: str, stt_profile: str):
+        blob.transcript_text = text
+        blob.speech_signals = signals
+        blob.stt_tier = stt_tier
+        blob.stt_profile = stt_profile
+
+    # ---------------- Garbage collection ----------------
+    def _remove_files(self, path: str):
+        for p in (path,) + tuple(path + suffix for suffix in _DERIVED_SUFFIXES):
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+
+    def collect_garbage(self, db: Session, grace_seconds: float = AUDIO_BLOB_GC_GRACE_SECONDS, dry_run: bool = False) -> dict:
+        """
+        Delete blobs with no references that have been unused for
+        `grace_seconds`, then files in the store that no blob points to.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+        unreferenced = db.query(AudioBlob).filter(AudioBlob.ref_count <= 0).all()
+        expired = [
+            b for b in unreferenced
+            if b.last_used_at is None or _aware(b.last_used_at) < cutoff
+        ]
+        freed = 0
+        for blob in expired:
+            if os.path.exists(blob.path):
+                freed += os.path.getsize(blob.path)
+            if not dry_run:
+                self._remove_files(blob.path)
+                db.delete(blob)
+        if not dry_run:
+            db.commit()
+
+        # Files left behind by crashes, or originals replaced by ingest that
+        # no transcript or unfinished job uses any more
+        known = self.referenced_paths(db)
+        orphans = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.abspath(os.path.join(dirpath, name))
+                owner = next((path[: -len(s)] for s in _DERIVED_SUFFIXES if path.endswith(s)), path)
+                if owner in known or os.path.getmtime(path) > cutoff.timestamp():
+                    continue
+                orphans += 1
+                freed += os.path.getsize(path)
+                if not dry_run:
+                    os.remove(path)
+
+        return {"blobs_deleted": len(expired), "orphan_files_deleted": orphans, "bytes_freed": freed, "dry_run": dry_run}
+
+
+def _aware(dt: datetime) -> datetime:
+    # SQLite returns naive datetimes
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+audio_store = AudioStore()
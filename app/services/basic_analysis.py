@@ -1,21 +1,13 @@
-import re
+from app.services.analysis_pipeline import run_pipeline
+from app.utils.text_index import DocumentIndex
 
 class BasicAnalysisService:
-    @staticmethod
-    def analyze(text: str) -> dict:
-        sentences = re.split(r'[.!?]+', text.strip())
-        sentences = [s for s in sentences if s.strip()]
-
-        words = re.findall(r'\b\w+\b', text)
+    ANALYZER = "basic"
+    VERSION = 3
 
-        word_count = len(words)
-        sentence_count = len(sentences)
-        avg_sentence_length = (
-            round(word_count / sentence_count, 2) if sentence_count > 0 else 0
-        )
+    # Cheap counts only: never touches LanguageTool
+    FIELDS = ("word_count", "sentence_count", "avg_sentence_length")
 
-        return {
-            "word_count": word_count,
-            "sentence_count": sentence_count,
-            "avg_sentence_length": avg_sentence_length,
-        }
+    @staticmethod
+    def analyze(text: str, index: DocumentIndex | None = None) -> dict:
+        return run_pipeline(text, BasicAnalysisService.FIELDS, {"index": index})
@@ -0,0 +1,34 @@
+# app/services/decode_profiles.py
+from app.core.config import WHISPER_DECODE_PROFILE
+
+# Keyword arguments for model.transcribe. EnglishUp only takes English
+# answers, so "fast" skips language detection, decodes greedily with no
+# temperature fallback and does not condition each window on the
+# previous one. "accurate" is Whisper's default behaviour (fp16 is off
+# either way: it is not supported on CPU).
+DECODE_PROFILES = {
+    "fast": {
+        "language": "en",
+        "task": "transcribe",
+        "temperature": 0.0,
+        "beam_size": None,
+        "best_of": None,
+        "condition_on_previous_text": False,
+        "fp16": False,
+    },
+    "accurate": {
+        "fp16": False,
+    },
+}
+
+
+def resolve_profile(profile: str | None) -> str:
+    profile = profile or WHISPER_DECODE_PROFILE
+    if profile not in DECODE_PROFILES:
+        raise ValueError(f"Unknown decode profile '{profile}', expected one of {', '.join(DECODE_PROFILES)}")
+    return profile
+
+
+def decode_options(profile: str | None) -> dict:
+    """transcribe() keyword arguments for `profile` (deployment default if None)."""
+    return dict(DECODE_PROFILES[resolve_profile(profile)])
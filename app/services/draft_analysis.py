@@ -0,0 +1,104 @@
+# app/services/draft_analysis.py
+import threading
+import time
+
+from app.services.analysis_pipeline import run_pipeline
+from app.services.language_analysis import LanguageAnalysisService
+from app.utils.text_index import DocumentIndex
+from app.utils.text_utils import LanguageCheckResult, check_sentences
+
+
+class DraftSession:
+    """
+    State of one live draft: LanguageTool issues per sentence.
+    On every update only sentences that were not in the previous draft
+    are checked; sentences that disappeared are dropped, so memory is
+    bounded by the size of the current draft.
+    """
+
+    def __init__(self, session_id: int, user_id: int, max_chars: int = 20000):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.max_chars = max_chars
+        self.last_active = time.monotonic()
+        self._sentences = {}  # sentence text -> issues (sentence-relative offsets)
+
+    def update(self, text: str) -> dict:
+        self.last_active = time.monotonic()
+        text = text[: self.max_chars]
+        index = DocumentIndex(text)
+        sentences = index.sentences()
+
+        current = set(sentences)
+        changed = [s for s in current if s not in self._sentences]
+        for sentence, issues in zip(changed, check_sentences(changed)):
+            self._sentences[sentence] = issues
+        for sentence in [s for s in self._sentences if s not in current]:
+            del self._sentences[sentence]
+
+        issues = []
+        for (start, _end), sentence in zip(index.sentence_spans(), sentences):
+            for issue in self._sentences[sentence]:
+                issues.append(issue._replace(offset=issue.offset + start))
+        check = LanguageCheckResult(text, issues)
+
+        metrics = run_pipeline(
+            text,
+            LanguageAnalysisService.FIELDS,
+            {"index": index, "language_check": check},
+        )
+        return {
+            "metrics": metrics,
+            "changed_sentences": len(changed),
+            "issues": [
+                {
+                    "offset": i.offset,
+                    "length": i.length,
+                    "type": i.issue_type,
+                    "message": i.message,
+                    "replacements": list(i.replacements),
+                }
+                for i in issues
+            ],
+        }
+
+
+class DraftSessionRegistry:
+    """Caps the number of live draft sessions and evicts idle ones."""
+
+    def __init__(self, max_sessions: int = 200, idle_timeout: float = 300.0):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def evict_idle(self) -> int:
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            idle = [sid for sid, s in self._sessions.items() if s.last_active < cutoff]
+            for sid in idle:
+                del self._sessions[sid]
+        return len(idle)
+
+    def open(self, user_id: int, max_chars: int = 20000) -> DraftSession | None:
+        """New session, or None when the registry is full."""
+        self.evict_idle()
+        with self._lock:
+            if len(self._sessions) >= self.max_sessions:
+                return None
+            self._next_id += 1
+            session = DraftSession(self._next_id, user_id, max_chars)
+            self._sessions[session.session_id] = session
+            return session
+
+    def is_open(self, session: DraftSession) -> bool:
+        with self._lock:
+            return session.session_id in self._sessions
+
+    def close(self, session: DraftSession):
+        with self._lock:
+            self._sessions.pop(session.session_id, None)
+
+    def __len__(self):
+        return len(self._sessions)
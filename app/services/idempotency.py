@@ -0,0 +1,222 @@
+# app/services/idempotency.py
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_WAIT_SECONDS, IDEMPOTENCY_LOCK_SECONDS
+from app.models.idempotency_record import IdempotencyRecord
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used for a different request."""
+
+
+class IdempotencyInProgress(Exception):
+    """The first request with this key is still running after the wait."""
+
+
+class StoredResponse(NamedTuple):
+    status_code: int
+    content: dict
+
+
+def request_fingerprint(**fields) -> str:
+    """SHA-256 of the request fields that decide its outcome."""
+    payload = json.dumps(fields, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Idempotency keys backed by the database. The first request with a key
+    claims it by inserting a row and stores its response when it is done;
+    retries with the same key wait for that response and replay it instead
+    of running the request again. Keys expire after `ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        ttl: float = IDEMPOTENCY_TTL_SECONDS,
+        wait_timeout: float = IDEMPOTENCY_WAIT_SECONDS,
+        lock_timeout: float = IDEMPOTENCY_LOCK_SECONDS,
+        poll_interval: float = 0.25,
+    ):
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.lock_timeout = lock_timeout
+        # Completion in this process wakes waiters at once; polling covers other processes
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._waiters = {}  # (scope, key) -> [(loop, asyncio.Event)]
+
+        self.replayed = 0
+        self.waited = 0
+
+    # ---------------- Claiming ----------------
+    async def begin(self, db: Session, scope: str, key: str, fingerprint: str) -> StoredResponse | None:
+        """
+        Claim `key` for this request. Returns None when the caller owns it
+        (run the request, then complete() or abandon()), or the stored
+        response of the first request with this key. Database work runs on
+        the threadpool, so only the wait itself is on the event loop.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        waited = False
+        while True:
+            record = await run_in_threadpool(self._claim, db, scope, key, fingerprint)
+            if record is None:
+                return None
+            if record.status == "done":
+                self.replayed += 1
+                return StoredResponse(record.status_code, record.response)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise IdempotencyInProgress(f"A request with Idempotency-Key {key!r} is still in progress")
+            if not waited:
+                waited = True
+                self.waited += 1
+            # Forget the row (its owner may delete it) and hand the
+            # connection back to the pool while waiting
+            db.expunge(record)
+            await run_in_threadpool(db.rollback)
+            await self._wait(scope, key, min(remaining, self.poll_interval))
+
+    def _claim(self, db: Session, scope: str, key: str, fingerprint: str) -> IdempotencyRecord | None:
+        """Insert the claim row, or return the existing one that blocks it."""
+        now = datetime.now(timezone.utc)
+        record = self._get(db, scope, key)
+        if record is not None:
+            if _aware(record.expires_at) <= now:
+                self._delete(db, record)  # expired: the key is free again
+                record = None
+            elif record.fingerprint != fingerprint:
+                raise IdempotencyConflict(f"Idempotency-Key {key!r} was already used for a different request")
+            elif record.status != "done" and _aware(record.created_at) <= now - timedelta(seconds=self.lock_timeout):
+                print(f"⚠️ Taking over abandoned idempotency key {scope}:{key}")
+                self._delete(db, record)
+                record = None
+        if record is not None:
+            return record
+
+        db.add(IdempotencyRecord(
+            scope=scope,
+            key=key,
+            fingerprint=fingerprint,
+            status="in_progress",
+            created_at=now,
+            expires_at=now + timedelta(seconds=self.ttl),
+        ))
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent retry claimed it first
+            db.rollback()
+            record = self._get(db, scope, key)
+            if record is not None and record.fingerprint != fingerprint:
+                raise IdempotencyConflict(f"Idempotency-Key {key!r} was already used for a different request")
+            return record or self._claim(db, scope, key, fingerprint)
+        except Exception:
+            db.rollback()
+            raise
+        return None
+
+    @staticmethod
+    def _get(db: Session, scope: str, key: str) -> IdempotencyRecord | None:
+        # populate_existing: re-read rows another session has updated meanwhile
+        return (
+            db.query(IdempotencyRecord)
+            .populate_existing()
+            .filter(IdempotencyRecord.scope == scope, IdempotencyRecord.key == key)
+            .first()
+        )
+
+    @staticmethod
+    def _delete(db: Session, record: IdempotencyRecord):
+        db.delete(record)
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+    # ---------------- Finishing ----------------
+    def complete(self, db: Session, scope: str, key: str, status_code: int, content: dict):
+        """Store the response of the request that owns `key`."""
+        record = self._get(db, scope, key)
+        if record is not None:
+            now = datetime.now(timezone.utc)
+            record.status = "done"
+            record.status_code = status_code
+            record.response = content
+            record.completed_at = now
+            record.expires_at = now + timedelta(seconds=self.ttl)
+            try:
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+        self._notify(scope, key)
+
+    def abandon(self, db: Session, scope: str, key: str):
+        """Release `key` after a failed request, so a retry runs it again."""
+        try:
+            db.rollback()
+            record = self._get(db, scope, key)
+            if record is not None and record.status != "done":
+                self._delete(db, record)
+        except Exception as e:
+            print(f"❌ Could not release idempotency key {scope}:{key}: {e}")
+        self._notify(scope, key)
+
+    def purge_expired(self, db: Session) -> int:
+        """Delete expired keys; returns how many."""
+        deleted = (
+            db.query(IdempotencyRecord)
+            .filter(IdempotencyRecord.expires_at <= datetime.now(timezone.utc))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted
+
+    # ---------------- Waiting ----------------
+    async def _wait(self, scope: str, key: str, timeout: float):
+        event = asyncio.Event()
+        with self._lock:
+            self._waiters.setdefault((scope, key), []).append((asyncio.get_running_loop(), event))
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                waiters = self._waiters.get((scope, key), [])
+                waiters[:] = [w for w in waiters if w[1] is not event]
+                if not waiters:
+                    self._waiters.pop((scope, key), None)
+
+    def _notify(self, scope: str, key: str):
+        with self._lock:
+            waiters = list(self._waiters.get((scope, key), []))
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def stats(self) -> dict:
+        return {"replayed": self.replayed, "waited": self.waited}
+
+
+def _aware(dt: datetime) -> datetime:
+    # SQLite returns naive datetimes
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+idempotency_store = IdempotencyStore()
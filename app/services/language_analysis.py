@@ -1,29 +1,40 @@
 # app/services/language_analysis.py
-from app.utils.text_utils import tokenize_sentences, tokenize_words, count_grammar_errors, count_spelling_errors, compute_readability
+from app.services.analysis_pipeline import run_pipeline
+from app.utils.text_index import DocumentIndex
+from app.utils.text_utils import LanguageCheckResult
 
 class LanguageAnalysisService:
-    def __init__(self, text: str):
-        self.text = text
+    ANALYZER = "language"
+    VERSION = 6
+
+    FIELDS = (
+        "word_count",
+        "sentence_count",
+        "avg_sentence_length",
+        "grammar_errors",
+        "spelling_errors",
+        "style_issues",
+        "issue_categories",
+        "vocabulary_richness",
+        "readability_score",
+        "long_sentences",
+    )
 
-    def analyze(self):
-        sentences = tokenize_sentences(self.text)
-        words = tokenize_words(self.text)
-        word_count = len(words)
-        sentence_count = len(sentences)
-        avg_sentence_length = word_count / sentence_count if sentence_count > 0 else 0
-        grammar_errors = count_grammar_errors(self.text)
-        spelling_errors = count_spelling_errors(self.text)
-        vocabulary_richness = len(set(words)) / word_count if word_count > 0 else 0
-        readability_score = compute_readability(self.text)
-        long_sentences = sum(1 for s in sentences if len(tokenize_words(s)) > 20)
+    def __init__(
+        self,
+        text: str,
+        check: LanguageCheckResult | None = None,
+        index: DocumentIndex | None = None,
+    ):
+        self.text = text
+        # LanguageTool output / document index can be passed in when the caller already has them
+        self.check = check
+        self.index = index
 
-        return {
-            "word_count": word_count,
-            "sentence_count": sentence_count,
-            "avg_sentence_length": round(avg_sentence_length, 2),
-            "grammar_errors": grammar_errors,
-            "spelling_errors": spelling_errors,
-            "vocabulary_richness": round(vocabulary_richness, 2),
-            "readability_score": round(readability_score, 2),
-            "long_sentences": long_sentences
-        }
+    def analyze(self, fields=None):
+        """Run the pipeline for `fields` (default: every language field)."""
+        return run_pipeline(
+            self.text,
+            fields or self.FIELDS,
+            {"index": self.index, "language_check": self.check},
+        )
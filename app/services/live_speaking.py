@@ -0,0 +1,247 @@
+# app/services/live_speaking.py
+import hashlib
+import os
+import threading
+import time
+import uuid
+
+import numpy as np
+import soundfile as sf
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    LIVE_WINDOW_SECONDS,
+    LIVE_STEP_SECONDS,
+    LIVE_MAX_SECONDS,
+    LIVE_MAX_SESSIONS,
+    PAUSE_LONG_SECONDS,
+)
+from app.models.transcripts import Transcript
+from app.services.audio_store import audio_store
+from app.services.speaking_analysis import SpeakingAnalysisService
+from app.services.speech_to_text import SpeechToTextService, get_speech_service
+from app.utils.audio_buffer import AudioBuffer, SAMPLE_RATE
+from app.utils.audio_ingest import NORMALIZED_SUFFIX
+from app.utils.upload import SavedUpload
+
+# Shorter tails are not worth a Whisper pass
+MIN_PASS_SECONDS = 0.5
+
+
+class LiveSpeakingSession:
+    """
+    One live speaking answer. PCM16 audio arrives in chunks while the user
+    talks; the uncommitted tail (everything after the last commit point)
+    is re-transcribed every `step_seconds` of new audio, and words are
+    committed once the tail reaches `window_seconds` or ends in a long
+    pause. Each pass therefore covers at most about one window, however
+    long the answer gets, and closing the stream only costs the last pass.
+    """
+
+    def __init__(
+        self,
+        session_id: int,
+        user_id: int,
+        prompt_id: int,
+        tier: str | None = None,
+        profile: str | None = None,
+        window_seconds: float = LIVE_WINDOW_SECONDS,
+        step_seconds: float = LIVE_STEP_SECONDS,
+        max_seconds: float = LIVE_MAX_SECONDS,
+        speech: SpeechToTextService | None = None,
+    ):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.prompt_id = prompt_id
+        self.tier = tier
+        self.profile = profile
+        self.window_seconds = window_seconds
+        self.step_seconds = step_seconds
+        self.max_seconds = max_seconds
+        self.speech = speech or get_speech_service()
+
+        self._pcm = bytearray()  # whole answer as PCM16, kept for the stored recording
+        self.committed_until = 0.0  # seconds; audio before this is final
+        self._transcribed_until = 0.0
+        self._words = []  # committed [word, start, end, probability]
+        self._segments = []
+        self._tentative_words = []
+        self._tentative_segments = []
+        self.passes = 0
+        self.transcribe_seconds = 0.0
+
+    # ---------------- Audio ----------------
+    @property
+    def duration(self) -> float:
+        return len(self._pcm) // 2 / SAMPLE_RATE
+
+    def feed(self, chunk: bytes) -> bool:
+        """Append PCM16 LE mono 16 kHz audio; False once the answer is at its length limit."""
+        room = int(self.max_seconds * SAMPLE_RATE) * 2 - len(self._pcm)
+        self._pcm += chunk[: max(room, 0)]
+        return len(chunk) <= room
+
+    def step_due(self) -> bool:
+        return self.duration - self._transcribed_until >= self.step_seconds
+
+    def _samples(self, start: float = 0.0) -> np.ndarray:
+        pcm = np.frombuffer(self._pcm, dtype="<i2", count=len(self._pcm) // 2)
+        return pcm[int(start * SAMPLE_RATE):].astype(np.float32) / 32768.0
+
+    # ---------------- Transcription ----------------
+    def step(self, final: bool = False) -> dict:
+        """Re-transcribe the uncommitted tail, commit what is settled, return a live update."""
+        end = self.duration
+        start = self.committed_until
+        self._transcribed_until = end
+        samples = self._samples(start)
+        if len(samples) < MIN_PASS_SECONDS * SAMPLE_RATE and not (final and len(samples)):
+            return self.update()
+
+        pass_start = time.perf_counter()
+        result = self.speech.transcribe_window(
+            samples, start, self.tier, self.profile, initial_prompt=self.committed_text[-200:] or None
+        )
+        self.passes += 1
+        self.transcribe_seconds += time.perf_counter() - pass_start
+
+        words = result["signals"]["words"]
+        segments = result["signals"]["segments"]
+        cut = self._commit_point(words, start, end, final)
+        if cut is None:
+            self._tentative_words, self._tentative_segments = words, segments
+        else:
+            self._words += [w for w in words if w[1] < cut]
+            self._segments += [s for s in segments if s["start"] < cut]
+            self._tentative_words = [w for w in words if w[1] >= cut]
+            self._tentative_segments = [s for s in segments if s["start"] >= cut]
+            self.committed_until = cut
+        return self.update()
+
+    def _commit_point(self, words: list, start: float, end: float, final: bool) -> float | None:
+        """Where to move the commit point after a pass over [start, end], or None to wait."""
+        if final:
+            return end
+        if words and end - words[-1][2] >= PAUSE_LONG_SECONDS:
+            # The speaker paused: everything heard so far is settled
+            return (words[-1][2] + end) / 2
+        if end - start < self.window_seconds:
+            return None
+        if len(words) > 1:
+            # Window full: keep the last word open, it may be cut off
+            return words[-1][1]
+        return end
+
+    # ---------------- Results ----------------
+    @property
+    def committed_text(self) -> str:
+        return " ".join(w[0] for w in self._words)
+
+    def signals(self) -> dict:
+        return {
+            "duration": round(self.duration, 3),
+            "segments": self._segments + self._tentative_segments,
+            "words": self._words + self._tentative_words,
+        }
+
+    def metrics(self) -> dict:
+        """The speaking metrics of the answer so far, from word timings only."""
+        signals = self.signals()
+        if not signals["words"]:
+            return {}
+        text = " ".join(w[0] for w in signals["words"])
+        return SpeakingAnalysisService(text, None, signals=signals).analyze()
+
+    def update(self) -> dict:
+        return {
+            "committed": self.committed_text,
+            "tentative": " ".join(w[0] for w in self._tentative_words),
+            "audio_seconds": round(self.duration, 2),
+            "committed_until": round(self.committed_until, 2),
+            "metrics": self.metrics(),
+        }
+
+    def finish(self) -> dict:
+        """Transcribe what is left and commit everything."""
+        if self.duration > self.committed_until:
+            self.step(final=True)
+        return self.update()
+
+    def save(self, db: Session) -> Transcript | None:
+        """
+        Store the recording in the audio store and the transcript, with
+        its speech signals, as a normal speech submission. None if no
+        words were heard.
+        """
+        text = self.committed_text
+        if not text:
+            return None
+
+        path = os.path.join(audio_store.root, f"{uuid.uuid4()}_live{NORMALIZED_SUFFIX}")
+        os.makedirs(audio_store.root, exist_ok=True)
+        sf.write(path, self._samples(), SAMPLE_RATE, format="FLAC", subtype="PCM_16")
+        with open(path, "rb") as f:
+            sha256 = hashlib.sha256(f.read()).hexdigest()
+        upload = SavedUpload(path, os.path.getsize(path), sha256, "flac", 0.0, 0.0)
+        blob = audio_store.add(db, upload)
+
+        signals = self.signals()
+        transcript = Transcript(
+            user_id=self.user_id,
+            prompt_id=self.prompt_id,
+            text=text,
+            input_mode="speech",
+            audio_path=blob.path,
+            speech_signals=signals,
+        )
+        try:
+            db.add(transcript)
+            audio_store.remember_transcript(blob, text, signals, self.tier, self.profile)
+            db.commit()
+            db.refresh(transcript)
+        except Exception:
+            db.rollback()
+            raise
+        return transcript
+
+    def audio_buffer(self, path: str | None = None) -> AudioBuffer:
+        """The answer's audio, for the analyses that run after saving."""
+        return AudioBuffer(self._samples(), path=path, source_format="pcm_s16le",
+                           source_sample_rate=SAMPLE_RATE, source_channels=1)
+
+    def stats(self) -> dict:
+        return {
+            "passes": self.passes,
+            "transcribe_seconds": round(self.transcribe_seconds, 3),
+            "realtime_factor": round(self.transcribe_seconds / self.duration, 3) if self.duration else None,
+        }
+
+
+class LiveSessionRegistry:
+    """Caps the number of concurrent live speaking sessions (each one runs Whisper)."""
+
+    def __init__(self, max_sessions: int = LIVE_MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def open(self, user_id: int, prompt_id: int, **kwargs) -> LiveSpeakingSession | None:
+        """New session, or None when the registry is full."""
+        with self._lock:
+            if len(self._sessions) >= self.max_sessions:
+                return None
+            self._next_id += 1
+            session = LiveSpeakingSession(self._next_id, user_id, prompt_id, **kwargs)
+            self._sessions[session.session_id] = session
+            return session
+
+    def close(self, session: LiveSpeakingSession):
+        with self._lock:
+            self._sessions.pop(session.session_id, None)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+live_sessions = LiveSessionRegistry()
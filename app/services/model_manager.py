@@ -0,0 +1,242 @@
+# app/services/model_manager.py
+import gc
+import os
+import threading
+import time
+
+from app.core.config import (
+    WHISPER_TIERS,
+    WHISPER_DEFAULT_TIER,
+    WHISPER_IDLE_TTL_SECONDS,
+    WHISPER_QUANTIZE,
+    WHISPER_MODEL_CACHE_DIR,
+)
+
+
+def _process_rss() -> int:
+    """Resident memory of this process in bytes (0 if psutil is missing)."""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss
+    except ImportError:
+        return 0
+
+
+def _model_bytes(model) -> int:
+    """Weight memory, counting the packed int8 weights of quantized linear layers."""
+    total = sum(p.numel() * p.element_size() for p in model.parameters())
+    for module in model.modules():
+        if hasattr(module, "_packed_params"):
+            weight = module.weight()
+            total += weight.numel() * weight.element_size()
+    return total
+
+
+def inference():
+    """
+    torch.inference_mode() for a block of model calls. Grad mode is per
+    thread, so it has to be entered by the thread that runs the model.
+    """
+    import torch
+
+    return torch.inference_mode()
+
+
+def quantize_model(model):
+    """
+    Dynamic int8 quantization of every linear layer.
+    Whisper uses its own nn.Linear subclass (it only casts weights to the
+    input dtype), which quantize_dynamic does not match, so those layers
+    are turned back into plain nn.Linear first.
+    """
+    import torch
+    import whisper
+
+    for module in model.modules():
+        if isinstance(module, whisper.model.Linear):
+            module.__class__ = torch.nn.Linear
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _quantized_cache_path(tier: str) -> str:
+    # Pickled modules are only valid for the library versions that wrote them
+    import torch
+    import whisper
+
+    version = f"torch{torch.__version__}-whisper{whisper.__version__}".replace("+", "_")
+    return os.path.join(WHISPER_MODEL_CACHE_DIR, f"{tier}-int8-{version}.pt")
+
+
+class LoadedModel:
+    def __init__(self, tier: str, model, load_seconds: float, rss_delta: int, pinned: bool, quantized: bool = False):
+        self.tier = tier
+        self.model = model
+        self.load_seconds = load_seconds
+        self.rss_delta = rss_delta
+        self.pinned = pinned
+        self.quantized = quantized
+        self.loaded_at = time.time()
+        self.last_used = time.monotonic()
+        self.uses = 0
+        self.param_bytes = _model_bytes(model)
+
+
+class WhisperModelManager:
+    """
+    Loads Whisper models on demand by tier and unloads the ones that have
+    been idle longer than `idle_ttl`.
+
+    Models loaded through preload() are pinned. Call it in the parent
+    process before workers fork: the weights are then shared copy-on-write
+    (inference never writes to them, and gc.freeze() keeps the collector
+    from touching the objects that own them).
+    """
+
+    def __init__(
+        self,
+        tiers=WHISPER_TIERS,
+        default_tier: str = WHISPER_DEFAULT_TIER,
+        idle_ttl: float = WHISPER_IDLE_TTL_SECONDS,
+        quantize: bool = WHISPER_QUANTIZE,
+    ):
+        self.tiers = tuple(tiers)
+        self.default_tier = default_tier
+        self.idle_ttl = idle_ttl
+        self.quantize = quantize
+        self._models = {}
+        self._lock = threading.Lock()
+        self._tier_locks = {tier: threading.Lock() for tier in self.tiers}
+        self._reaper = None
+
+    def resolve_tier(self, tier: str | None) -> str:
+        tier = tier or self.default_tier
+        if tier not in self.tiers:
+            raise ValueError(f"Unknown Whisper tier '{tier}', expected one of {', '.join(self.tiers)}")
+        return tier
+
+    def _load(self, tier: str, pinned: bool, quantize: bool | None = None) -> LoadedModel:
+        import whisper
+
+        quantize = self.quantize if quantize is None else quantize
+        rss_before = _process_rss()
+        start = time.perf_counter()
+        try:
+            model = self._load_quantized(tier) if quantize else whisper.load_model(tier, device="cpu")
+        except Exception as e:
+            raise RuntimeError(f"Failed to load Whisper model '{tier}': {e}")
+        model.eval()
+        for p in model.parameters():
+            p.requires_grad_(False)
+        elapsed = time.perf_counter() - start
+        return LoadedModel(tier, model, elapsed, _process_rss() - rss_before, pinned, quantized=quantize)
+
+    def _load_quantized(self, tier: str):
+        """The int8 model from the on-disk cache, quantizing and caching it on a miss."""
+        import torch
+        import whisper
+
+        path = _quantized_cache_path(tier)
+        if os.path.exists(path):
+            try:
+                return torch.load(path, map_location="cpu", weights_only=False)
+            except Exception as e:
+                print(f"⚠️ Ignoring unreadable quantized model cache {path}: {e}")
+
+        model = quantize_model(whisper.load_model(tier, device="cpu").eval())
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.tmp"
+            torch.save(model, tmp)
+            os.replace(tmp, path)
+            print(f"💾 Cached quantized Whisper '{tier}' at {path}")
+        except OSError as e:
+            print(f"⚠️ Could not cache quantized Whisper '{tier}': {e}")
+        return model
+
+    def get(self, tier: str | None = None):
+        """The model for `tier` (default tier if None), loading it if needed."""
+        tier = self.resolve_tier(tier)
+        with self._lock:
+            entry = self._models.get(tier)
+        if entry is None:
+            # Per-tier lock: concurrent requests for one tier load it once,
+            # while other tiers stay usable
+            with self._tier_locks[tier]:
+                with self._lock:
+                    entry = self._models.get(tier)
+                if entry is None:
+                    entry = self._load(tier, pinned=False)
+                    with self._lock:
+                        self._models[tier] = entry
+        with self._lock:
+            entry.last_used = time.monotonic()
+            entry.uses += 1
+        return entry.model
+
+    def preload(self, tiers):
+        """Load and pin `tiers` (call before forking workers)."""
+        for tier in tiers:
+            tier = self.resolve_tier(tier)
+            with self._tier_locks[tier]:
+                if tier not in self._models:
+                    self._models[tier] = self._load(tier, pinned=True)
+                else:
+                    self._models[tier].pinned = True
+        gc.collect()
+        gc.freeze()
+
+    def unload_idle(self) -> list:
+        cutoff = time.monotonic() - self.idle_ttl
+        with self._lock:
+            idle = [
+                tier for tier, entry in self._models.items()
+                if not entry.pinned and entry.last_used < cutoff
+            ]
+            for tier in idle:
+                del self._models[tier]
+        if idle:
+            gc.collect()
+            print(f"🧹 Unloaded idle Whisper models: {', '.join(idle)}")
+        return idle
+
+    def start_reaper(self, interval: float = 60.0):
+        """Background thread that calls unload_idle every `interval` seconds."""
+        if self._reaper is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.unload_idle()
+
+        self._reaper = threading.Thread(target=loop, name="whisper-reaper", daemon=True)
+        self._reaper.start()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            models = {
+                tier: {
+                    "loaded": True,
+                    "pinned": entry.pinned,
+                    "quantized": entry.quantized,
+                    "load_seconds": round(entry.load_seconds, 3),
+                    "param_mb": round(entry.param_bytes / 1e6, 1),
+                    "rss_delta_mb": round(entry.rss_delta / 1e6, 1),
+                    "idle_seconds": round(now - entry.last_used, 1),
+                    "uses": entry.uses,
+                }
+                for tier, entry in self._models.items()
+            }
+        for tier in self.tiers:
+            models.setdefault(tier, {"loaded": False})
+        return {
+            "default_tier": self.default_tier,
+            "quantize": self.quantize,
+            "idle_ttl_seconds": self.idle_ttl,
+            "process_rss_mb": round(_process_rss() / 1e6, 1),
+            "models": models,
+        }
+
+
+model_manager = WhisperModelManager()
@@ -1,28 +1,64 @@
 # app/services/speaking_analysis.py
-from app.utils.audio_utils import get_audio_duration, count_pauses, count_filler_words, compute_pronunciation_score
+from app.utils.audio_buffer import AudioBuffer
+from app.utils.audio_utils import get_audio_duration, detect_pauses, count_phrases, compute_pronunciation_score
+from app.utils.speech_signals import repetitive_segments, word_timing
+from app.utils.text_index import DocumentIndex
 
 class SpeakingAnalysisService:
-    def __init__(self, text: str, audio_path: str):
+    ANALYZER = "speaking"
+    VERSION = 7
+
+    def __init__(self, text: str, audio_path: str, audio: AudioBuffer | None = None, signals: dict | None = None):
         self.text = text
         self.audio_path = audio_path
+        self.audio = audio
+        self.signals = signals
+
+    def _timing(self):
+        """(duration, pauses, source): from Whisper's word timings when stored, else from the audio."""
+        pauses = word_timing(self.signals) if self.signals else None
+        if pauses is not None:
+            return self.signals["duration"], pauses, "whisper"
+        # Decode once; every metric reads the same buffer
+        audio = self.audio if self.audio is not None else AudioBuffer.from_file(self.audio_path)
+        return get_audio_duration(audio), detect_pauses(audio), "audio"
 
     def analyze(self):
-        total_duration = get_audio_duration(self.audio_path)
-        filler_words_count = count_filler_words(self.text)
-        pauses_count = count_pauses(self.audio_path)
-        pronunciation_score = compute_pronunciation_score(self.text, self.audio_path)
+        total_duration, pauses, source = self._timing()
+        # Fillers, hedges and discourse markers in one pass over the text
+        phrases = count_phrases(self.text)
+        filler_words_count = phrases.get("filler", {}).get("count", 0)
+        pauses_count = pauses["long_pause_count"]
+        pronunciation_score = compute_pronunciation_score(self.text, signals=self.signals)
 
-        words = self.text.split()
-        words_per_minute = len(words) / (total_duration / 60) if total_duration > 0 else 0
-        fluency_score = max(0, min(1, 1 - (pauses_count / max(len(words), 1))))  # simple heuristic
+        index = DocumentIndex(self.text)
+        word_count = index.word_count
+        # Rates over the time actually spent speaking, not silence
+        phonation_time = pauses["phonation_time"] or total_duration
+        speaking_time = (pauses["speech_end"] - pauses["speech_start"]) or total_duration
+        words_per_minute = word_count / (phonation_time / 60) if phonation_time > 0 else 0
+        speech_rate = word_count / (speaking_time / 60) if speaking_time > 0 else 0
+        articulation_rate = index.syllable_count / phonation_time if phonation_time > 0 else 0
+        fluency_score = max(0, min(1, 1 - (pauses_count / max(word_count, 1))))  # simple heuristic
         clarity_score = pronunciation_score  # for now same as pronunciation
 
         return {
             "total_duration": round(total_duration, 2),
             "words_per_minute": round(words_per_minute, 2),
+            "speech_rate": round(speech_rate, 2),
+            "articulation_rate": round(articulation_rate, 2),
+            "phonation_time": pauses["phonation_time"],
             "filler_words_count": filler_words_count,
+            "hedges_count": phrases.get("hedge", {}).get("count", 0),
+            "discourse_markers_count": phrases.get("discourse", {}).get("count", 0),
+            "phrases": phrases,
             "pauses_count": pauses_count,
+            "short_pauses_count": pauses["pause_count"] - pauses_count,
+            "total_pause_time": pauses["total_pause_time"],
+            "mean_pause": pauses["mean_pause"],
             "pronunciation_score": round(pronunciation_score, 2),
+            "repetitive_segments": repetitive_segments(self.signals) if self.signals else 0,
+            "timing_source": source,
             "fluency_score": round(fluency_score, 2),
             "clarity_score": round(clarity_score, 2)
         }
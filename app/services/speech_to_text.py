@@ -1,34 +1,138 @@
 # app/services/speech_to_text.py
-import whisper
+import threading
+
+from app.core.config import WHISPER_BATCHING
+from app.services.decode_profiles import decode_options
+from app.services.model_manager import WhisperModelManager, inference, model_manager
+from app.services.whisper_batcher import WhisperBatcher
+from app.utils.audio_buffer import AudioBuffer
+from app.utils.audio_stream import SAMPLE_RATE, read_audio_windows, split_on_silence
+from app.utils.speech_signals import signals_from_result
+
 
 class SpeechToTextService:
     """
     Service for converting audio to text using OpenAI Whisper.
     """
-    def __init__(self, model_name: str = "base"):
+    def __init__(self, model_name: str | None = None, manager: WhisperModelManager | None = None, batching: bool = WHISPER_BATCHING):
         """
-        Initialize Whisper model.
         Args:
-            model_name (str): Whisper model variant ('tiny', 'base', 'small', 'medium', 'large')
+            model_name (str): Default Whisper tier ('tiny', 'base', 'small');
+                models are loaded on first use by the model manager
+            batching (bool): Decode short clips from concurrent callers together
         """
-        try:
-            self.model = whisper.load_model(model_name)
-        except Exception as e:
-            raise RuntimeError(f"Failed to load Whisper model '{model_name}': {e}")
+        self.manager = manager or model_manager
+        self.model_name = self.manager.resolve_tier(model_name)
+        self.batcher = WhisperBatcher(self.manager) if batching else None
 
-    def transcribe(self, audio_path: str) -> str:
+    def transcribe(self, audio: AudioBuffer | str, tier: str | None = None, profile: str | None = None) -> str:
         """
-        Transcribe audio file to text.
+        Transcribe audio to text.
         Args:
-            audio_path (str): Path to the audio file
+            audio (AudioBuffer | str): Decoded audio, or a path for Whisper to decode
+            tier (str): Whisper tier for this request (quality vs latency)
+            profile (str): Decode profile ('fast', 'accurate'); deployment default if None
         Returns:
             str: Transcribed text
         """
+        tier = tier or self.model_name
+        options = decode_options(profile)
+        model = self.manager.get(tier) if self.batcher is None else None
         try:
-            result = self.model.transcribe(audio_path)
+            if self.batcher is not None:
+                return self.batcher.transcribe(audio, tier, options)["text"].strip()
+            if isinstance(audio, AudioBuffer):
+                audio = audio.samples
+            with inference():
+                result = model.transcribe(audio, **options)
             text = result.get("text", "").strip()
             return text
         except Exception as e:
             # Return empty string on failure, caller can handle
             print(f"Error during transcription: {e}")
             return ""
+
+    def transcribe_detailed(self, audio: AudioBuffer | str, tier: str | None = None, profile: str | None = None) -> dict:
+        """
+        Transcribe and keep what Whisper measured along the way.
+        Returns:
+            dict: text, plus signals (segment scores and word timestamps,
+                see app/utils/speech_signals.py); {"text": ""} on failure
+        """
+        tier = tier or self.model_name
+        options = decode_options(profile)
+        model = self.manager.get(tier) if self.batcher is None else None
+        try:
+            audio = audio if isinstance(audio, AudioBuffer) else AudioBuffer.from_file(audio)
+            if self.batcher is not None:
+                result = self.batcher.transcribe(audio, tier, options, word_timestamps=True)
+            else:
+                with inference():
+                    result = model.transcribe(audio.samples, word_timestamps=True, **options)
+            return {
+                "text": result.get("text", "").strip(),
+                "signals": signals_from_result(result, audio.duration),
+            }
+        except Exception as e:
+            print(f"Error during transcription: {e}")
+            return {"text": ""}
+
+    def transcribe_stream(self, audio_path: str, tier: str | None = None, profile: str | None = None):
+        """
+        Transcribe a recording segment by segment, as a generator.
+        Audio is decoded in windows and split at pauses, so memory stays
+        flat however long the recording is.
+        Yields:
+            dict: index, start, end (seconds), text and signals of each segment
+        """
+        previous = ""
+        segments = split_on_silence(read_audio_windows(audio_path))
+        for index, (start, samples) in enumerate(segments):
+            # The tail of the previous segment keeps wording consistent across cuts
+            result = self.transcribe_window(samples, start, tier, profile, initial_prompt=previous[-200:] or None)
+            previous = result["text"] or previous
+            yield {
+                "index": index,
+                "start": round(start, 2),
+                "end": round(start + len(samples) / SAMPLE_RATE, 2),
+                **result,
+            }
+
+    def transcribe_window(
+        self,
+        samples,
+        offset: float = 0.0,
+        tier: str | None = None,
+        profile: str | None = None,
+        initial_prompt: str | None = None,
+    ) -> dict:
+        """
+        Transcribe a slice of a longer recording that starts `offset`
+        seconds in; signal timestamps are relative to the whole recording.
+        Errors are raised, not swallowed.
+        Returns:
+            dict: text and signals
+        """
+        options = decode_options(profile)
+        model = self.manager.get(tier or self.model_name)
+        with inference():
+            result = model.transcribe(samples, initial_prompt=initial_prompt, word_timestamps=True, **options)
+        end = offset + len(samples) / SAMPLE_RATE
+        return {
+            "text": result.get("text", "").strip(),
+            "signals": signals_from_result(result, end, offset=offset),
+        }
+
+
+_speech_service = None
+_speech_service_lock = threading.Lock()
+
+
+def get_speech_service() -> SpeechToTextService:
+    """Return the shared speech service."""
+    global _speech_service
+    if _speech_service is None:
+        with _speech_service_lock:
+            if _speech_service is None:
+                _speech_service = SpeechToTextService()
+    return _speech_service
@@ -0,0 +1,307 @@
+# app/services/transcription_jobs.py
+import asyncio
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.config import STT_WORKERS, STT_MAX_PENDING_JOBS, STT_JOB_STALE_SECONDS, AUDIO_KEEP_ORIGINAL
+from app.db.session import SessionLocal
+from app.models.audio_blob import AudioBlob
+from app.models.transcription_job import TranscriptionJob
+from app.models.transcripts import Transcript
+from app.services.analysis_store import materialize_analyses
+from app.services.audio_store import audio_store
+from app.services.speech_to_text import get_speech_service
+from app.utils.audio_ingest import ingest_audio
+
+FINISHED = ("done", "failed")
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class TranscriptionQueue:
+    """
+    Bounded pool of worker threads that turn uploaded audio into Transcripts.
+    Jobs are rows in transcription_jobs, so queued or interrupted work is
+    picked up again by recover() after a restart.
+    """
+
+    def __init__(self, workers: int = STT_WORKERS, max_pending: int = STT_MAX_PENDING_JOBS):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._waiters = {}  # job_id -> [(loop, asyncio.Event)]
+        self._wait_times = deque(maxlen=1000)
+        self._run_times = deque(maxlen=1000)
+        self.completed = 0
+        self.failed = 0
+
+    # ---------------- Submitting ----------------
+    def submit(
+        self,
+        db: Session,
+        user_id: int,
+        prompt_id: int,
+        audio_path: str,
+        stt_tier: str | None = None,
+        stt_profile: str | None = None,
+        audio_sha256: str | None = None,
+    ) -> TranscriptionJob:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFullError("Transcription queue is full, try again later")
+            self._pending += 1
+
+        job = TranscriptionJob(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            prompt_id=prompt_id,
+            audio_path=audio_path,
+            audio_sha256=audio_sha256,
+            stt_tier=stt_tier,
+            stt_profile=stt_profile,
+            status="queued",
+        )
+        try:
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        self._executor.submit(self._run, job.id, time.monotonic())
+        return job
+
+    @staticmethod
+    def find_active(
+        db: Session,
+        user_id: int,
+        prompt_id: int,
+        audio_sha256: str,
+        stt_tier: str,
+        stt_profile: str,
+    ) -> TranscriptionJob | None:
+        """
+        A queued or running job of the same user and prompt for the same
+        audio and settings (a client retry). Other users uploading the same
+        bytes get their own job and transcript.
+        """
+        return (
+            db.query(TranscriptionJob)
+            .filter(
+                TranscriptionJob.user_id == user_id,
+                TranscriptionJob.prompt_id == prompt_id,
+                TranscriptionJob.audio_sha256 == audio_sha256,
+                TranscriptionJob.stt_tier == stt_tier,
+                TranscriptionJob.stt_profile == stt_profile,
+                TranscriptionJob.status.in_(("queued", "running")),
+            )
+            .first()
+        )
+
+    def recover(self, stale_after: float = STT_JOB_STALE_SECONDS) -> int:
+        """
+        Pick up queued jobs, and re-queue jobs that have been "running"
+        for longer than `stale_after` seconds (their worker died). Jobs
+        other workers are still running are left alone; if several
+        processes pick up the same queued job, only one claims it in _run.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_after)
+        db = SessionLocal()
+        try:
+            stale = (
+                db.query(TranscriptionJob)
+                .filter(
+                    TranscriptionJob.status == "running",
+                    or_(TranscriptionJob.started_at.is_(None), TranscriptionJob.started_at < cutoff),
+                )
+                .update({"status": "queued", "started_at": None}, synchronize_session=False)
+            )
+            db.commit()
+            if stale:
+                print(f"⚠️ Re-queued {stale} stale running transcription jobs")
+            job_ids = [
+                job_id for (job_id,) in
+                db.query(TranscriptionJob.id).filter(TranscriptionJob.status == "queued").all()
+            ]
+        finally:
+            db.close()
+
+        with self._lock:
+            self._pending += len(job_ids)
+        for job_id in job_ids:
+            self._executor.submit(self._run, job_id, time.monotonic())
+        if job_ids:
+            print(f"🔁 Re-queued {len(job_ids)} transcription jobs")
+        return len(job_ids)
+
+    # ---------------- Worker ----------------
+    def _run(self, job_id: str, enqueued_at: float):
+        started = time.monotonic()
+        with self._lock:
+            self._running += 1
+        self._wait_times.append(started - enqueued_at)
+
+        db = SessionLocal()
+        transcript_id = None
+        audio = None
+        try:
+            # Atomic claim: of several workers handed the same job, one wins
+            claimed = (
+                db.query(TranscriptionJob)
+                .filter(TranscriptionJob.id == job_id, TranscriptionJob.status == "queued")
+                .update(
+                    {"status": "running", "started_at": datetime.now(timezone.utc)},
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if not claimed:
+                return
+            job = db.query(TranscriptionJob).filter(TranscriptionJob.id == job_id).first()
+
+            # Stored blobs may have been normalized by an earlier job
+            blob = db.get(AudioBlob, job.audio_sha256) if job.audio_sha256 else None
+            if blob is not None:
+                job.audio_path = blob.path
+
+            # Normalized and decoded once here, reused by the speaking analysis below.
+            # A shared blob keeps its original file: other rows may still read it,
+            # and the blob-store GC removes it once nothing points there.
+            original_path = job.audio_path
+            audio, ingest = ingest_audio(original_path, keep_original=blob is not None or AUDIO_KEEP_ORIGINAL)
+            if audio.path != original_path:
+                job.audio_path = audio.path
+                if blob is not None:
+                    blob.path = audio.path
+                    audio_store.move_references(db, original_path, audio.path)
+                db.commit()
+                print(
+                    f"🎙️ Ingested job {job_id}: {ingest['original_duration']}s -> {ingest['duration']}s, "
+                    f"{ingest['original_bytes'] // 1024} KB -> {ingest['stored_bytes'] // 1024} KB"
+                )
+            transcription = get_speech_service().transcribe_detailed(
+                audio, tier=job.stt_tier, profile=job.stt_profile
+            )
+            text = transcription["text"]
+            if not text:
+                raise RuntimeError("Could not transcribe audio")
+
+            transcript = Transcript(
+                user_id=job.user_id,
+                prompt_id=job.prompt_id,
+                text=text,
+                input_mode="speech",
+                audio_path=job.audio_path,
+                speech_signals=transcription.get("signals"),
+            )
+            db.add(transcript)
+            db.flush()
+            if blob is not None:
+                audio_store.remember_transcript(
+                    blob, text, transcription.get("signals"), job.stt_tier, job.stt_profile
+                )
+            job.transcript_id = transcript.id
+            job.status = "done"
+            job.finished_at = datetime.now(timezone.utc)
+            db.commit()
+            transcript_id = transcript.id
+            self.completed += 1
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Transcription job {job_id} failed: {e}")
+            job = db.query(TranscriptionJob).filter(TranscriptionJob.id == job_id).first()
+            if job is not None:
+                job.status = "failed"
+                job.error = str(e)
+                job.finished_at = datetime.now(timezone.utc)
+                db.commit()
+                if job.audio_sha256:
+                    audio_store.release(db, job.audio_sha256)
+            self.failed += 1
+        finally:
+            db.close()
+            self._run_times.append(time.monotonic() - started)
+            with self._lock:
+                self._pending -= 1
+                self._running -= 1
+            self._notify(job_id)
+
+        if transcript_id is not None:
+            materialize_analyses(transcript_id, audio)
+
+    # ---------------- Waiting ----------------
+    def _notify(self, job_id: str):
+        with self._lock:
+            waiters = self._waiters.pop(job_id, [])
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    async def wait(self, db: Session, job_id: str, timeout: float) -> TranscriptionJob | None:
+        """Wait up to `timeout` seconds for the job to finish, then return it."""
+        event = asyncio.Event()
+        with self._lock:
+            self._waiters.setdefault(job_id, []).append((asyncio.get_running_loop(), event))
+
+        job = db.query(TranscriptionJob).filter(TranscriptionJob.id == job_id).first()
+        if job is not None and job.status not in FINISHED and timeout > 0:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            db.refresh(job)
+
+        with self._lock:
+            waiters = self._waiters.get(job_id, [])
+            waiters[:] = [w for w in waiters if w[1] is not event]
+            if not waiters:
+                self._waiters.pop(job_id, None)
+        return job
+
+    # ---------------- Metrics ----------------
+    def stats(self) -> dict:
+        def summary(values):
+            values = sorted(values)
+            if not values:
+                return {"count": 0}
+            return {
+                "count": len(values),
+                "avg": round(sum(values) / len(values), 3),
+                "p50": round(values[len(values) // 2], 3),
+                "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 3),
+                "max": round(values[-1], 3),
+            }
+
+        with self._lock:
+            depth = self._pending - self._running
+            running = self._running
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "queue_depth": depth,
+            "running": running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait_seconds": summary(list(self._wait_times)),
+            "run_seconds": summary(list(self._run_times)),
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+transcription_queue = TranscriptionQueue()
@@ -0,0 +1,265 @@
+# app/services/whisper_batcher.py
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+from app.core.config import WHISPER_BATCH_SIZE, WHISPER_BATCH_WAIT_MS
+from app.services.model_manager import WhisperModelManager, inference, model_manager
+from app.utils.audio_buffer import SAMPLE_RATE, as_audio_buffer
+
+MAX_BATCH_SECONDS = 30  # Whisper's input window
+
+# model.transcribe's defaults for what its options leave out
+_DEFAULT_TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+_COMPRESSION_RATIO_THRESHOLD = 2.4
+_LOGPROB_THRESHOLD = -1.0
+_NO_SPEECH_THRESHOLD = 0.6
+
+
+class _Request:
+    __slots__ = ("audio", "word_timestamps", "future", "enqueued_at")
+
+    def __init__(self, audio, word_timestamps: bool):
+        self.audio = audio
+        self.word_timestamps = word_timestamps
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class WhisperBatcher:
+    """
+    Collects clips from concurrent callers and decodes them together.
+
+    One scheduler thread per tier and decode options takes the first
+    pending clip, then waits up to `max_wait` seconds for more, up to
+    `max_batch_size`. The batch is turned into one mel tensor and run
+    through whisper.decode, which handles the whole batch in a single
+    forward pass per token. Word timestamps are then aligned clip by clip
+    from the decoded tokens, as model.transcribe does, and each caller
+    gets a result shaped like model.transcribe's.
+
+    Clips longer than 30 seconds need Whisper's sliding window, and clips
+    whose first decode fails transcribe's quality checks need its
+    temperature fallback: both go through model.transcribe on the
+    caller's thread instead.
+    """
+
+    def __init__(
+        self,
+        manager: WhisperModelManager | None = None,
+        max_batch_size: int = WHISPER_BATCH_SIZE,
+        max_wait: float = WHISPER_BATCH_WAIT_MS / 1000,
+    ):
+        self.manager = manager or model_manager
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queues = {}
+        self._lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._single = 0
+        self._fallbacks = 0
+        self._wait_total = 0.0
+        self._decode_total = 0.0
+
+    # ---------------- Callers ----------------
+    def transcribe(self, audio, tier: str | None = None, options: dict | None = None, word_timestamps: bool = False) -> dict:
+        """
+        Transcribe one AudioBuffer or file with model.transcribe keyword
+        `options` (see decode_profiles), sharing a decode with concurrent
+        callers when it is short.
+        Returns:
+            dict: text, segments (with words if `word_timestamps`) and language
+        """
+        tier = self.manager.resolve_tier(tier)
+        options = dict(options or {})
+        audio = as_audio_buffer(audio).samples
+        if len(audio) <= MAX_BATCH_SECONDS * SAMPLE_RATE:
+            request = _Request(audio, word_timestamps)
+            self._queue_for(tier, options).put(request)
+            result = request.future.result()
+            if result is not None:
+                return result
+            with self._lock:
+                self._fallbacks += 1
+        else:
+            with self._lock:
+                self._single += 1
+
+        model = self.manager.get(tier)
+        with inference():
+            return model.transcribe(audio, word_timestamps=word_timestamps, **options)
+
+    def _queue_for(self, tier: str, options: dict) -> queue.Queue:
+        # Clips in one batch share their decoding options
+        key = (tier, tuple(sorted(options.items())))
+        with self._lock:
+            q = self._queues.get(key)
+            if q is None:
+                q = self._queues[key] = queue.Queue()
+                threading.Thread(
+                    target=self._loop, args=(tier, options, q), name=f"whisper-batch-{tier}", daemon=True
+                ).start()
+        return q
+
+    # ---------------- Scheduler ----------------
+    def _collect(self, q: queue.Queue) -> list:
+        batch = [q.get()]
+        deadline = batch[0].enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                # Deadline passed: still take whatever is already waiting
+                try:
+                    batch.append(q.get_nowait())
+                    continue
+                except queue.Empty:
+                    break
+            try:
+                batch.append(q.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self, tier: str, options: dict, q: queue.Queue):
+        while True:
+            batch = self._collect(q)
+            started = time.monotonic()
+            try:
+                with inference():
+                    results = self._decode(tier, options, batch)
+            except Exception as e:
+                for r in batch:
+                    r.future.set_exception(e)
+                continue
+            finished = time.monotonic()
+
+            with self._lock:
+                self._batch_sizes[len(batch)] += 1
+                self._wait_total += sum(started - r.enqueued_at for r in batch)
+                self._decode_total += finished - started
+            for r, result in zip(batch, results):
+                r.future.set_result(result)
+
+    def _decode(self, tier: str, options: dict, batch: list) -> list:
+        """model.transcribe-shaped results, or None for clips that need its fallback."""
+        import torch
+        import whisper
+        from whisper.audio import HOP_LENGTH
+        from whisper.timing import add_word_timestamps
+        from whisper.tokenizer import get_tokenizer
+
+        model = self.manager.get(tier)
+        mels = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(r.audio), model.dims.n_mels)
+            for r in batch
+        ]).to(model.device)
+        decoded = whisper.decode(model, mels, self._decoding_options(options))
+
+        temperatures = options.get("temperature", _DEFAULT_TEMPERATURES)
+        can_fall_back = isinstance(temperatures, (list, tuple)) and len(temperatures) > 1
+        compression_threshold = options.get("compression_ratio_threshold", _COMPRESSION_RATIO_THRESHOLD)
+        logprob_threshold = options.get("logprob_threshold", _LOGPROB_THRESHOLD)
+        no_speech_threshold = options.get("no_speech_threshold", _NO_SPEECH_THRESHOLD)
+
+        results = []
+        for r, mel, d in zip(batch, mels, decoded):
+            duration = len(r.audio) / SAMPLE_RATE
+            result = {"text": "", "segments": [], "language": d.language}
+            # transcribe's checks: silence is skipped, a doubtful decode is retried hotter
+            silent = (
+                no_speech_threshold is not None
+                and d.no_speech_prob > no_speech_threshold
+                and logprob_threshold is not None
+                and d.avg_logprob < logprob_threshold
+            )
+            if silent:
+                results.append(result)
+                continue
+            doubtful = (
+                (compression_threshold is not None and d.compression_ratio > compression_threshold)
+                or (logprob_threshold is not None and d.avg_logprob < logprob_threshold)
+            )
+            if doubtful and can_fall_back:
+                results.append(None)
+                continue
+
+            segment = {
+                "id": 0,
+                "seek": 0,
+                "start": 0.0,
+                "end": duration,
+                "text": d.text,
+                "tokens": d.tokens,
+                "temperature": d.temperature,
+                "avg_logprob": d.avg_logprob,
+                "compression_ratio": d.compression_ratio,
+                "no_speech_prob": d.no_speech_prob,
+            }
+            if r.word_timestamps:
+                tokenizer = get_tokenizer(
+                    model.is_multilingual,
+                    num_languages=model.num_languages,
+                    language=d.language,
+                    task=options.get("task", "transcribe"),
+                )
+                add_word_timestamps(
+                    segments=[segment],
+                    model=model,
+                    tokenizer=tokenizer,
+                    mel=mel,
+                    num_frames=len(r.audio) // HOP_LENGTH,
+                    last_speech_timestamp=0.0,
+                )
+            result["text"] = d.text
+            result["segments"] = [segment]
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _decoding_options(options: dict):
+        """whisper.DecodingOptions for model.transcribe keyword `options`, at its first temperature."""
+        import whisper
+
+        temperature = options.get("temperature", _DEFAULT_TEMPERATURES)
+        if isinstance(temperature, (list, tuple)):
+            temperature = temperature[0]
+        kwargs = {
+            "task": options.get("task", "transcribe"),
+            "language": options.get("language"),
+            "temperature": temperature,
+            "prompt": options.get("initial_prompt"),
+            "fp16": False,
+            # One window per clip: segment times come from the word timings
+            "without_timestamps": True,
+        }
+        # As in transcribe: beam search when greedy, best_of when sampling
+        if temperature > 0:
+            kwargs["best_of"] = options.get("best_of")
+        else:
+            kwargs["beam_size"] = options.get("beam_size")
+            kwargs["patience"] = options.get("patience")
+        return whisper.DecodingOptions(**kwargs)
+
+    # ---------------- Metrics ----------------
+    def stats(self) -> dict:
+        with self._lock:
+            pending = Counter()
+            for (tier, _), q in self._queues.items():
+                pending[tier] += q.qsize()
+            batches = sum(self._batch_sizes.values())
+            clips = sum(size * n for size, n in self._batch_sizes.items())
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": round(self.max_wait * 1000, 1),
+                "batches": batches,
+                "batched_clips": clips,
+                "single_clips": self._single,
+                "fallback_clips": self._fallbacks,
+                "avg_batch_size": round(clips / batches, 2) if batches else 0,
+                "batch_sizes": dict(sorted(self._batch_sizes.items())),
+                "avg_wait_ms": round(self._wait_total / clips * 1000, 1) if clips else 0,
+                "avg_decode_ms": round(self._decode_total / batches * 1000, 1) if batches else 0,
+                "pending": dict(pending),
+            }
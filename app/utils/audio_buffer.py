@@ -0,0 +1,168 @@
+# app/utils/audio_buffer.py
+"""
+Decode-once audio shared by speech-to-text and every audio metric.
+
+A recording is decoded a single time into 16 kHz mono float32 (the format
+Whisper works in) and kept with its source metadata. The decoded samples
+are cached next to the upload as .npy, so later readers (e.g. the
+background analysis) memory-map them instead of decoding again.
+"""
+import json
+import os
+import subprocess
+import time
+
+import numpy as np
+
+from app.core.config import AUDIO_DECODE_CACHE
+
+SAMPLE_RATE = 16000
+
+
+class AudioBuffer:
+    """16 kHz mono float32 samples plus the source file's format metadata."""
+
+    __slots__ = ("samples", "sample_rate", "path", "source_format", "source_sample_rate", "source_channels", "decode_seconds")
+
+    def __init__(self, samples: np.ndarray, path: str | None = None, source_format: str | None = None,
+                 source_sample_rate: int | None = None, source_channels: int | None = None, decode_seconds: float = 0.0):
+        self.samples = samples
+        self.sample_rate = SAMPLE_RATE
+        self.path = path
+        self.source_format = source_format
+        self.source_sample_rate = source_sample_rate
+        self.source_channels = source_channels
+        self.decode_seconds = decode_seconds
+
+    def __len__(self):
+        return len(self.samples)
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+    def metadata(self) -> dict:
+        return {
+            "source_format": self.source_format,
+            "source_sample_rate": self.source_sample_rate,
+            "source_channels": self.source_channels,
+            "duration": round(self.duration, 3),
+            "decode_seconds": round(self.decode_seconds, 4),
+        }
+
+    # ---------------- Loading ----------------
+    @classmethod
+    def from_file(cls, path: str, cache: bool = AUDIO_DECODE_CACHE) -> "AudioBuffer":
+        """Decode `path` (wav, flac, ogg, webm, mp3, ...) or reuse its cached decode."""
+        cache_path = f"{path}.16k.npy"
+        if cache and _is_fresh(cache_path, path):
+            return cls._load_cached(path, cache_path)
+
+        start = time.perf_counter()
+        samples, meta = _decode_soundfile(path)
+        if samples is None:
+            samples, meta = _decode_ffmpeg(path)
+        buffer = cls(samples, path=path, decode_seconds=time.perf_counter() - start, **meta)
+
+        if cache:
+            buffer._save_cache(cache_path)
+        return buffer
+
+    @classmethod
+    def _load_cached(cls, path: str, cache_path: str) -> "AudioBuffer":
+        start = time.perf_counter()
+        samples = np.load(cache_path, mmap_mode="r")
+        try:
+            with open(f"{cache_path}.json") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        return cls(
+            samples,
+            path=path,
+            source_format=meta.get("source_format"),
+            source_sample_rate=meta.get("source_sample_rate"),
+            source_channels=meta.get("source_channels"),
+            decode_seconds=time.perf_counter() - start,
+        )
+
+    def _save_cache(self, cache_path: str):
+        try:
+            tmp = f"{cache_path}.tmp.npy"
+            np.save(tmp, self.samples)
+            with open(f"{cache_path}.json", "w") as f:
+                json.dump(self.metadata(), f)
+            os.replace(tmp, cache_path)
+        except OSError as e:
+            print(f"⚠️ Could not cache decoded audio for {self.path}: {e}")
+
+
+def as_audio_buffer(audio) -> AudioBuffer:
+    """Accept an AudioBuffer or a file path."""
+    return audio if isinstance(audio, AudioBuffer) else AudioBuffer.from_file(audio)
+
+
+# ---------------- Decoders ----------------
+def _is_fresh(cache_path: str, path: str) -> bool:
+    try:
+        return os.path.getmtime(cache_path) >= os.path.getmtime(path)
+    except OSError:
+        return False
+
+
+def _decode_soundfile(path: str):
+    """
+    Fast in-process path for files already at 16 kHz (wav, flac, ogg/vorbis).
+    Returns (None, None) when the file needs ffmpeg (other rates, webm, mp3).
+    """
+    try:
+        import soundfile as sf
+        info = sf.info(path)
+        if info.samplerate != SAMPLE_RATE:
+            return None, None
+        samples = sf.read(path, dtype="float32", always_2d=True)[0]
+    except Exception:
+        return None, None
+    if samples.shape[1] > 1:
+        samples = samples.mean(axis=1, dtype=np.float32)
+    else:
+        samples = samples[:, 0]
+    meta = {
+        "source_format": info.format.lower(),
+        "source_sample_rate": info.samplerate,
+        "source_channels": info.channels,
+    }
+    return np.ascontiguousarray(samples), meta
+
+
+def _probe(path: str) -> dict:
+    """Container format, sample rate and channels of the first audio stream."""
+    cmd = [
+        "ffprobe", "-v", "error", "-select_streams", "a:0",
+        "-show_entries", "format=format_name:stream=sample_rate,channels", "-of", "json", path,
+    ]
+    try:
+        info = json.loads(subprocess.run(cmd, capture_output=True, check=True).stdout)
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return {"source_format": os.path.splitext(path)[1].lstrip(".").lower() or None}
+    stream = (info.get("streams") or [{}])[0]
+    return {
+        "source_format": info.get("format", {}).get("format_name"),
+        "source_sample_rate": int(stream["sample_rate"]) if stream.get("sample_rate") else None,
+        "source_channels": stream.get("channels"),
+    }
+
+
+def _decode_ffmpeg(path: str):
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-i", path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-",
+    ]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    except FileNotFoundError:
+        raise RuntimeError("ffmpeg is required to decode this audio format")
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to decode audio: {e.stderr.decode(errors='ignore').strip()}")
+    samples = np.frombuffer(out[: len(out) // 2 * 2], dtype="<i2").astype(np.float32) / 32768.0
+    return samples, _probe(path)
@@ -0,0 +1,67 @@
+# app/utils/audio_ingest.py
+import os
+import time
+
+from app.core.config import AUDIO_MAX_SECONDS, AUDIO_TRIM_PADDING_SECONDS, AUDIO_KEEP_ORIGINAL
+from app.utils.audio_buffer import AudioBuffer
+from app.utils.audio_utils import detect_pauses
+
+NORMALIZED_SUFFIX = ".16k.flac"
+
+
+def ingest_audio(
+    path: str,
+    max_seconds: float = AUDIO_MAX_SECONDS,
+    padding: float = AUDIO_TRIM_PADDING_SECONDS,
+    keep_original: bool = AUDIO_KEEP_ORIGINAL,
+) -> tuple:
+    """
+    Normalize an upload before transcription: 16 kHz mono, edge silence
+    trimmed (keeping `padding` seconds), capped at `max_seconds`, stored
+    as FLAC next to the upload. Already normalized files are returned as is.
+    Returns:
+        (AudioBuffer of the stored audio, stats dict)
+    """
+    if path.endswith(NORMALIZED_SUFFIX):
+        return AudioBuffer.from_file(path, cache=False), {"normalized": True}
+
+    import soundfile as sf
+
+    start = time.perf_counter()
+    original = AudioBuffer.from_file(path, cache=False)
+    sr = original.sample_rate
+
+    timing = detect_pauses(original)
+    first, last = 0, len(original)
+    if timing["speech_end"] > timing["speech_start"]:
+        first = max(0, int((timing["speech_start"] - padding) * sr))
+        last = min(len(original), int((timing["speech_end"] + padding) * sr))
+    max_samples = int(max_seconds * sr)
+    truncated = last - first > max_samples
+    last = min(last, first + max_samples)
+    samples = original.samples[first:last]
+
+    out_path = os.path.splitext(path)[0] + NORMALIZED_SUFFIX
+    sf.write(out_path, samples, sr, format="FLAC", subtype="PCM_16")
+
+    stats = {
+        "original_duration": round(original.duration, 2),
+        "duration": round(len(samples) / sr, 2),
+        "trimmed_start": round(first / sr, 2),
+        "truncated": truncated,
+        "original_bytes": os.path.getsize(path),
+        "stored_bytes": os.path.getsize(out_path),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    if not keep_original:
+        os.remove(path)
+
+    audio = AudioBuffer(
+        samples,
+        path=out_path,
+        source_format=original.source_format,
+        source_sample_rate=original.source_sample_rate,
+        source_channels=original.source_channels,
+        decode_seconds=original.decode_seconds,
+    )
+    return audio, stats
@@ -0,0 +1,119 @@
+# app/utils/audio_stream.py
+"""
+Streaming audio input for long recordings.
+
+ffmpeg decodes the file to 16 kHz mono PCM on a pipe, which is read a
+window at a time, and an energy VAD cuts the stream into speech segments
+at pauses. Only the current segment is held in memory, so peak memory
+does not grow with the length of the recording.
+"""
+import subprocess
+
+import numpy as np
+
+from app.core.config import (
+    STREAM_WINDOW_SECONDS,
+    STREAM_VAD_THRESHOLD_DB,
+    STREAM_MIN_SILENCE_MS,
+    STREAM_MIN_SEGMENT_SECONDS,
+    STREAM_MAX_SEGMENT_SECONDS,
+)
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+
+
+# ---------------- Reading ----------------
+def read_audio_windows(audio_path: str, window_seconds: float = STREAM_WINDOW_SECONDS, sr: int = SAMPLE_RATE):
+    """Yield float32 mono windows of `window_seconds` decoded by ffmpeg."""
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-i", audio_path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sr), "-",
+    ]
+    window_bytes = int(window_seconds * sr) * 2
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while True:
+            data = process.stdout.read(window_bytes)
+            if not data:
+                break
+            data = data[: len(data) // 2 * 2]
+            yield np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed: {process.stderr.read().decode(errors='ignore').strip()}")
+    finally:
+        # Also reached when the consumer stops early (e.g. client disconnect)
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+
+# ---------------- Segmentation ----------------
+def frame_energy_db(samples: np.ndarray, frame: int) -> np.ndarray:
+    """RMS level in dBFS of each complete `frame`-sample frame."""
+    n = len(samples) // frame
+    frames = samples[: n * frame].reshape(n, frame)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20 * np.log10(rms + 1e-10)
+
+
+def split_on_silence(
+    windows,
+    sr: int = SAMPLE_RATE,
+    threshold_db: float = STREAM_VAD_THRESHOLD_DB,
+    min_silence_ms: float = STREAM_MIN_SILENCE_MS,
+    min_segment_seconds: float = STREAM_MIN_SEGMENT_SECONDS,
+    max_segment_seconds: float = STREAM_MAX_SEGMENT_SECONDS,
+):
+    """
+    Yield (start_seconds, samples) speech segments from a stream of windows.
+    A segment ends in the middle of the first pause of at least
+    `min_silence_ms` once it is `min_segment_seconds` long, and is cut
+    at `max_segment_seconds` regardless. Leading silence is dropped and
+    segments without any speech are skipped.
+    """
+    frame = sr * FRAME_MS // 1000
+    min_silence = max(1, int(min_silence_ms / FRAME_MS))
+    min_frames = int(min_segment_seconds * 1000 / FRAME_MS)
+    max_frames = int(max_segment_seconds * 1000 / FRAME_MS)
+
+    buffer = np.empty(0, dtype=np.float32)
+    offset = 0        # sample position of buffer[0] in the recording
+    scanned = 0       # frames of buffer already classified
+    silence_run = 0
+    voiced = False
+
+    for window in windows:
+        buffer = np.concatenate([buffer, window])
+        silent = frame_energy_db(buffer[scanned * frame:], frame) < threshold_db
+        i = scanned
+        for is_silent in silent:
+            i += 1
+            if is_silent:
+                silence_run += 1
+            else:
+                silence_run = 0
+                voiced = True
+
+            cut = None
+            if not voiced:
+                cut = i  # nothing said yet: drop the silence
+            elif silence_run >= min_silence and i >= min_frames:
+                cut = i - silence_run // 2
+            elif i >= max_frames:
+                cut = i
+
+            if cut is not None:
+                if voiced:
+                    yield offset / sr, buffer[: cut * frame]
+                buffer = buffer[cut * frame:]
+                offset += cut * frame
+                i -= cut
+                voiced = silence_run < i  # speech left after the cut
+                silence_run = min(silence_run, i)
+        scanned = i
+
+    if voiced and len(buffer):
+        yield offset / sr, buffer
@@ -1,43 +1,147 @@
 # app/utils/audio_utils.py
-import wave
-import contextlib
 import re
-import speech_recognition as sr
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.core.config import PAUSE_MIN_SECONDS, PAUSE_LONG_SECONDS
+from app.utils.audio_buffer import AudioBuffer, as_audio_buffer
+from app.utils.phrase_matcher import get_phrase_matcher
+from app.utils.speech_signals import pronunciation_confidence
+
+HOP_MS = 10      # frame step
+FRAME_HOPS = 3   # frame length = 30 ms
+DIGITAL_SILENCE_DB = -90.0  # frames at or below this are padding, not room noise
+
+# Audio metrics take an AudioBuffer (decoded once and shared) or a file path
 
 # ---------------- Audio Duration ----------------
-def get_audio_duration(audio_path: str) -> float:
+def get_audio_duration(audio: AudioBuffer | str) -> float:
     """Return audio duration in seconds."""
-    with contextlib.closing(wave.open(audio_path, 'r')) as f:
-        frames = f.getnframes()
-        rate = f.getframerate()
-        duration = frames / float(rate)
-        return duration
+    return as_audio_buffer(audio).duration
+
+
+# ---------------- Pauses ----------------
+def frame_energy_db(samples: np.ndarray, sr: int, hop_ms: int = HOP_MS, frame_hops: int = FRAME_HOPS) -> np.ndarray:
+    """
+    RMS level (dBFS) of overlapping frames, one per hop.
+    Squared sums are taken per hop on a reshaped view (no copy of the
+    audio), then summed over `frame_hops` neighbours with a strided window.
+    """
+    hop = sr * hop_ms // 1000
+    n = len(samples) // hop
+    if n < frame_hops:
+        return np.empty(0)
+    blocks = np.asarray(samples[: n * hop], dtype=np.float32).reshape(n, hop)
+    hop_energy = np.einsum("ij,ij->i", blocks, blocks, dtype=np.float64)
+    frame_energy = sliding_window_view(hop_energy, frame_hops).sum(axis=1)
+    rms = np.sqrt(frame_energy / (hop * frame_hops))
+    return 20 * np.log10(rms + 1e-10)
 
 
-# ---------------- Pauses & Filler Words ----------------
-def count_pauses(audio_path: str, threshold: float = 1.0) -> int:
+def adaptive_threshold_db(levels: np.ndarray, ratio: float = 0.3, min_gap_db: float = 6.0) -> float:
     """
-    Count long pauses (> threshold seconds).
-    Placeholder: Implement with real audio processing later.
+    Silence threshold between the noise floor (10th percentile level)
+    and the speech level (95th percentile), so it follows the recording's
+    gain and background noise. Digitally silent frames (zero padding,
+    muted input) are left out, or they would pull the noise floor far
+    below the real one.
     """
-    # For MVP, return 0 as placeholder
-    return 0
+    audible = levels[levels > DIGITAL_SILENCE_DB]
+    if len(audible):
+        levels = audible
+    noise, speech = np.percentile(levels, [10, 95])
+    return max(noise + min_gap_db, noise + ratio * (speech - noise))
+
+
+def _runs(mask: np.ndarray):
+    """Start, end (exclusive) and value of each run of equal values."""
+    change = np.flatnonzero(mask[1:] != mask[:-1]) + 1
+    starts = np.concatenate(([0], change))
+    ends = np.concatenate((change, [len(mask)]))
+    return starts, ends, mask[starts]
+
+
+def detect_pauses(
+    audio: AudioBuffer | str,
+    min_pause: float = PAUSE_MIN_SECONDS,
+    long_pause: float = PAUSE_LONG_SECONDS,
+    min_speech: float = 0.05,
+) -> dict:
+    """
+    Silent stretches inside the speech, and how long the speaker was voicing.
+    Leading and trailing silence are not pauses. Voiced blips shorter than
+    `min_speech` (clicks, breaths) do not split a pause.
+    """
+    audio = as_audio_buffer(audio)
+    levels = frame_energy_db(audio.samples, audio.sample_rate)
+    hop_seconds = HOP_MS / 1000
+    empty = {
+        "pause_count": 0,
+        "long_pause_count": 0,
+        "pause_durations": [],
+        "total_pause_time": 0.0,
+        "mean_pause": 0.0,
+        "phonation_time": 0.0,
+        "speech_start": 0.0,
+        "speech_end": 0.0,
+    }
+    if len(levels) == 0:
+        return empty
+
+    silent = levels < adaptive_threshold_db(levels)
+
+    # Fold voiced runs that are too short to be speech into the silence around them
+    starts, ends, values = _runs(silent)
+    blips = ~values & ((ends - starts) * hop_seconds < min_speech)
+    silent = np.repeat(values | blips, ends - starts)
+
+    voiced = np.flatnonzero(~silent)
+    if len(voiced) == 0:
+        return empty
+    first, last = voiced[0], voiced[-1] + 1
+
+    starts, ends, values = _runs(silent[first:last])
+    durations = (ends - starts)[values] * hop_seconds
+    pauses = durations[durations >= min_pause]
+    phonation = (last - first) * hop_seconds - pauses.sum()
+
+    return {
+        "pause_count": int(len(pauses)),
+        "long_pause_count": int((pauses >= long_pause).sum()),
+        "pause_durations": [round(float(d), 2) for d in pauses],
+        "total_pause_time": round(float(pauses.sum()), 2),
+        "mean_pause": round(float(pauses.mean()), 2) if len(pauses) else 0.0,
+        "phonation_time": round(float(phonation), 2),
+        "speech_start": round(float(first) * hop_seconds, 2),
+        "speech_end": round(float(last) * hop_seconds, 2),
+    }
+
+
+def count_pauses(audio: AudioBuffer | str, threshold: float = PAUSE_LONG_SECONDS) -> int:
+    """Count long pauses (>= threshold seconds)."""
+    return detect_pauses(audio, long_pause=threshold)["long_pause_count"]
+
+
+# ---------------- Filler Words ----------------
+def count_phrases(transcribed_text: str) -> dict:
+    """Fillers, hedges and discourse markers: count, per-phrase counts and positions per category."""
+    return get_phrase_matcher().count(transcribed_text)
 
 
 def count_filler_words(transcribed_text: str) -> int:
-    """Count filler words like 'um', 'uh', 'like', 'you know'."""
-    fillers = ['um', 'uh', 'like', 'you know', 'ah', 'er']
-    words = transcribed_text.lower().split()
-    count = sum(1 for w in words if w in fillers)
-    return count
+    """Count hesitation fillers like 'um', 'uh', 'er'."""
+    return count_phrases(transcribed_text).get("filler", {}).get("count", 0)
 
 # ---------------- Pronunciation Score ----------------
-def compute_pronunciation_score(transcribed_text: str, audio_path: str) -> float:
+def compute_pronunciation_score(transcribed_text: str, audio: AudioBuffer | str | None = None, signals: dict | None = None) -> float:
     """
-    Simple heuristic:
-    Compare number of words in audio vs transcribed text.
+    Whisper's confidence in the words it heard, when its signals were kept.
+    Otherwise a simple heuristic:
     For MVP, assume 0.8–1.0 if transcript exists, else lower.
     """
+    if signals and (signals.get("words") or signals.get("segments")):
+        return pronunciation_confidence(signals)
     if transcribed_text.strip():
         return 0.95  # placeholder, good enough for MVP
     return 0.5
@@ -0,0 +1,22 @@
+# app/utils/constants.py
+
+# Phrase lists for PhraseMatcher (app/utils/phrase_matcher.py), by category.
+# Phrases are matched on whole words, case-insensitively; multi-word
+# phrases are fine. PHRASE_LISTS_PATH can extend or replace them.
+DEFAULT_PHRASES = {
+    # Only hesitation sounds, which are never anything but fillers. Words
+    # and phrases that can be fillers ("like", "you know", "i mean") are
+    # as often meant literally, and are left out
+    "filler": ("um", "umm", "uh", "uhm", "er", "erm", "ah", "hmm", "mm"),
+    "hedge": (
+        "maybe", "perhaps", "probably", "possibly", "i think", "i guess",
+        "i suppose", "i believe", "i feel like", "sort of", "kind of",
+        "somewhat", "a bit", "a little bit", "it seems", "more or less",
+    ),
+    "discourse": (
+        "anyway", "however", "therefore", "moreover",
+        "furthermore", "in addition", "on the other hand",
+        "for example", "for instance", "in fact", "as a result", "first of all",
+        "in conclusion", "to sum up", "by the way", "after all",
+    ),
+}
@@ -0,0 +1,191 @@
+# app/utils/languagetool_pool.py
+import os
+import subprocess
+import threading
+import time
+import urllib.request
+
+import language_tool_python
+
+
+# ---------------- Client side (one per API worker) ----------------
+class LanguageToolClientPool:
+    """
+    Drop-in replacement for a LanguageTool instance that sends each check
+    to the least-loaded healthy server of a shared pool.
+    Clients are plain HTTP clients, so API workers do not start a JVM.
+    """
+
+    def __init__(self, urls, language: str = "en-US", cooldown: float = 30.0):
+        if not urls:
+            raise ValueError("LanguageToolClientPool needs at least one server URL")
+        self.urls = list(urls)
+        self.language = language
+        self.cooldown = cooldown
+        self._clients = [None] * len(self.urls)
+        self._in_flight = [0] * len(self.urls)
+        self._down_until = [0.0] * len(self.urls)
+        self._lock = threading.Lock()
+
+    def _acquire(self, tried: set) -> int:
+        with self._lock:
+            now = time.monotonic()
+            candidates = [i for i in range(len(self.urls)) if i not in tried]
+            healthy = [i for i in candidates if self._down_until[i] <= now]
+            if healthy:
+                index = min(healthy, key=lambda i: self._in_flight[i])
+            else:
+                # Every server is cooling down: try the one that failed longest ago
+                index = min(candidates, key=lambda i: self._down_until[i])
+            self._in_flight[index] += 1
+            return index
+
+    def _release(self, index: int, failed: bool = False):
+        with self._lock:
+            self._in_flight[index] -= 1
+            if failed:
+                self._down_until[index] = time.monotonic() + self.cooldown
+                self._clients[index] = None
+
+    def _client(self, index: int):
+        client = self._clients[index]
+        if client is None:
+            # Creating a remote client queries the server, so do it lazily
+            client = language_tool_python.LanguageTool(self.language, remote_server=self.urls[index])
+            self._clients[index] = client
+        return client
+
+    def check(self, text: str):
+        tried = set()
+        last_error = None
+        while len(tried) < len(self.urls):
+            index = self._acquire(tried)
+            tried.add(index)
+            try:
+                matches = self._client(index).check(text)
+            except Exception as e:
+                self._release(index, failed=True)
+                print(f"⚠️ LanguageTool server {self.urls[index]} failed: {e}")
+                last_error = e
+                continue
+            self._release(index)
+            return matches
+        raise RuntimeError(f"All LanguageTool servers failed: {last_error}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                url: {
+                    "in_flight": self._in_flight[i],
+                    "healthy": self._down_until[i] <= now,
+                }
+                for i, url in enumerate(self.urls)
+            }
+
+
+# ---------------- Server side (one per host) ----------------
+def find_languagetool_jar_dir(jar_dir: str | None = None) -> str:
+    """Directory holding languagetool-server.jar (downloaded by language_tool_python)."""
+    if not jar_dir:
+        from language_tool_python.utils import get_language_tool_directory
+        jar_dir = str(get_language_tool_directory())
+    if not os.path.exists(os.path.join(jar_dir, "languagetool-server.jar")):
+        raise FileNotFoundError(f"languagetool-server.jar not found in {jar_dir}")
+    return jar_dir
+
+
+class LanguageToolServerPool:
+    """
+    Runs N local LanguageTool HTTP servers on consecutive ports,
+    health-checks them and restarts any that die or stop answering.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        base_port: int = 8081,
+        jar_dir: str | None = None,
+        heap: str = "512m",
+        host: str = "127.0.0.1",
+        startup_grace: float = 60.0,
+    ):
+        self.size = size
+        self.ports = [base_port + i for i in range(size)]
+        self.jar_dir = find_languagetool_jar_dir(jar_dir)
+        self.heap = heap
+        self.host = host
+        self.startup_grace = startup_grace
+        self._procs = {}
+        self._started_at = {}
+        self._failures = {port: 0 for port in self.ports}
+        self.restarts = {port: 0 for port in self.ports}
+
+    @property
+    def urls(self):
+        return [f"http://{self.host}:{port}" for port in self.ports]
+
+    def _spawn(self, port: int):
+        cmd = [
+            "java", f"-Xmx{self.heap}",
+            "-cp", os.path.join(self.jar_dir, "languagetool-server.jar"),
+            "org.languagetool.server.HTTPServer",
+            "--port", str(port),
+            "--allow-origin", "*",
+        ]
+        self._procs[port] = subprocess.Popen(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        self._started_at[port] = time.monotonic()
+        self._failures[port] = 0
+
+    def start(self):
+        for port in self.ports:
+            self._spawn(port)
+
+    def stop(self):
+        for proc in self._procs.values():
+            proc.terminate()
+        for proc in self._procs.values():
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    def is_healthy(self, port: int, timeout: float = 5.0) -> bool:
+        try:
+            with urllib.request.urlopen(f"http://{self.host}:{port}/v2/languages", timeout=timeout) as r:
+                return r.status == 200
+        except Exception:
+            return False
+
+    def restart(self, port: int):
+        proc = self._procs.get(port)
+        if proc and proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        self.restarts[port] += 1
+        print(f"🔁 Restarting LanguageTool server on port {port}")
+        self._spawn(port)
+
+    def check_once(self):
+        """One health-check round; restarts dead or unresponsive servers."""
+        for port in self.ports:
+            proc = self._procs[port]
+            if proc.poll() is not None:
+                self.restart(port)
+                continue
+            if time.monotonic() - self._started_at[port] < self.startup_grace:
+                continue  # JVM still loading
+            if self.is_healthy(port):
+                self._failures[port] = 0
+            else:
+                self._failures[port] += 1
+                if self._failures[port] >= 3:
+                    self.restart(port)
+
+    def supervise(self, interval: float = 10.0):
+        """Block forever, health-checking every `interval` seconds."""
+        while True:
+            self.check_once()
+            time.sleep(interval)
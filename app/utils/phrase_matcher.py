@@ -0,0 +1,166 @@
+# app/utils/phrase_matcher.py
+"""
+Word-level multi-phrase matching (Aho-Corasick).
+
+All phrases of all categories are compiled once into one automaton whose
+symbols are lowercase words, so a text is scanned in a single pass
+whatever the number of phrases, and multi-word phrases ("you know",
+"on the other hand") match like single words. Words are \\w+ runs, so
+phrases match across punctuation the way they are spoken.
+"""
+import json
+import re
+import threading
+from typing import NamedTuple
+
+from app.core.config import PHRASE_LISTS_PATH
+from app.utils.constants import DEFAULT_PHRASES
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class PhraseMatch(NamedTuple):
+    category: str
+    phrase: str
+    start: int  # character offsets in the text
+    end: int
+
+
+def _words(phrase: str) -> tuple:
+    return tuple(w.lower() for w in _WORD_RE.findall(phrase))
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over words. Overlapping matches are resolved
+    leftmost-longest, so with both "you know" and "know" in the lists,
+    "you know" counts once, as the longer phrase.
+    """
+
+    def __init__(self, phrases: dict):
+        """
+        Args:
+            phrases (dict): category -> iterable of phrases
+        """
+        self.categories = tuple(phrases)
+        self._goto = [{}]  # state -> {word: next state}
+        self._fail = [0]
+        self._outputs = [[]]  # state -> [(phrase length in words, phrase, categories)]
+
+        entries = {}
+        for category, items in phrases.items():
+            for phrase in items:
+                words = _words(phrase)
+                if words:
+                    entries.setdefault(words, []).append(category)
+        for words, categories in entries.items():
+            self._add(words, " ".join(words), tuple(dict.fromkeys(categories)))
+        self._phrase_count = len(entries)
+        self._build_failure_links()
+
+    def _add(self, words: tuple, phrase: str, categories: tuple):
+        state = 0
+        for word in words:
+            nxt = self._goto[state].get(word)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][word] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = nxt
+        self._outputs[state].append((len(words), phrase, categories))
+
+    def _build_failure_links(self):
+        # Breadth-first, so a state's failure target is final before its children use it
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for word, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(word, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # Phrases that end here via a shorter suffix, longest first
+                self._outputs[nxt] = sorted(self._outputs[nxt] + self._outputs[self._fail[nxt]], reverse=True)
+
+    def __len__(self):
+        return self._phrase_count
+
+    # ---------------- Matching ----------------
+    def find(self, text: str) -> list:
+        """Non-overlapping matches in text order (one per category a phrase belongs to)."""
+        spans = []  # (start word, end word, phrase, categories)
+        starts = []
+        ends = []
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for i, m in enumerate(_WORD_RE.finditer(text)):
+            word = m.group().lower()
+            starts.append(m.start())
+            ends.append(m.end())
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for length, phrase, categories in outputs[state]:
+                spans.append((i - length + 1, i, phrase, categories))
+
+        # Leftmost-longest: earliest start first, then the longest phrase there
+        spans.sort(key=lambda s: (s[0], s[0] - s[1]))
+        matches = []
+        next_free = 0
+        for first, last, phrase, categories in spans:
+            if first < next_free:
+                continue
+            next_free = last + 1
+            for category in categories:
+                matches.append(PhraseMatch(category, phrase, starts[first], ends[last]))
+        return matches
+
+    def count(self, text: str) -> dict:
+        """
+        Per category: total count, count per phrase and the
+        [start, end] character offsets of every match.
+        """
+        result = {c: {"count": 0, "phrases": {}, "positions": []} for c in self.categories}
+        for match in self.find(text):
+            entry = result[match.category]
+            entry["count"] += 1
+            entry["phrases"][match.phrase] = entry["phrases"].get(match.phrase, 0) + 1
+            entry["positions"].append([match.start, match.end])
+        return result
+
+
+# ---------------- Default matcher ----------------
+def load_phrase_lists(path: str | None = PHRASE_LISTS_PATH) -> dict:
+    """
+    DEFAULT_PHRASES, updated from a JSON file of {category: [phrases]}
+    when `path` is set. A category in the file replaces the default list;
+    prefix its name with "+" to add to it instead (e.g. "+filler").
+    """
+    phrases = {c: list(items) for c, items in DEFAULT_PHRASES.items()}
+    if not path:
+        return phrases
+    with open(path, encoding="utf-8") as f:
+        custom = json.load(f)
+    for category, items in custom.items():
+        if category.startswith("+"):
+            phrases.setdefault(category[1:], []).extend(items)
+        else:
+            phrases[category] = list(items)
+    return phrases
+
+
+_phrase_matcher = None
+_phrase_matcher_lock = threading.Lock()
+
+
+def get_phrase_matcher() -> PhraseMatcher:
+    """Return the shared matcher for the configured phrase lists, built on first use."""
+    global _phrase_matcher
+    if _phrase_matcher is None:
+        with _phrase_matcher_lock:
+            if _phrase_matcher is None:
+                _phrase_matcher = PhraseMatcher(load_phrase_lists())
+    return _phrase_matcher
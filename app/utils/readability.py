@@ -0,0 +1,124 @@
+# app/utils/readability.py
+"""
+Readability metrics computed from word, sentence and syllable counts.
+
+Syllables are counted with the same rule textstat uses (CMUdict vowel
+phones, Pyphen for unknown words), but each distinct word is looked up
+once and kept in a bounded cache. The batch API computes every grade
+metric for many texts at once with NumPy.
+"""
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from app.core.config import SYLLABLE_CACHE_SIZE
+
+_VOWEL_GROUP_RE = re.compile(r"[aeiouy]+")
+
+_pyphen = None
+_cmudict = None
+
+
+def _pronunciations():
+    """NLTK's CMUdict if it has been downloaded, else an empty dict."""
+    global _cmudict
+    if _cmudict is None:
+        try:
+            import nltk
+            nltk.data.find("corpora/cmudict")
+            _cmudict = nltk.corpus.cmudict.dict()
+        except (ImportError, LookupError):
+            _cmudict = {}
+    return _cmudict
+
+
+def _hyphenator():
+    global _pyphen
+    if _pyphen is None:
+        try:
+            import pyphen
+            _pyphen = pyphen.Pyphen(lang="en_US")
+        except ImportError:
+            _pyphen = False
+    return _pyphen
+
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def count_syllables(word: str) -> int:
+    """Syllables in one lowercase word (cached)."""
+    phones = _pronunciations().get(word)
+    if phones:
+        return sum(1 for p in phones[0] if p[-1].isdigit())
+    hyphenator = _hyphenator()
+    if hyphenator:
+        return len(hyphenator.positions(word)) + 1
+    # Fallback: count vowel groups
+    return max(1, len(_VOWEL_GROUP_RE.findall(word)))
+
+
+def syllable_cache_info():
+    return count_syllables.cache_info()
+
+
+# ---------------- Grade metrics ----------------
+def _ratio(a, b):
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    return np.divide(a, b, out=np.zeros(np.broadcast(a, b).shape), where=b > 0)
+
+
+def grade_metrics(words, sentences, syllables, polysyllables, letters, chars, tokens) -> dict:
+    """
+    Every metric for arrays of per-text counts, computed in a few vector ops,
+    with textstat's formulas. Texts without words or sentences score 0.
+    """
+    words = np.asarray(words, dtype=np.float64)
+    sentences = np.asarray(sentences, dtype=np.float64)
+    valid = (words > 0) & (sentences > 0)
+
+    words_per_sentence = _ratio(words, sentences)
+    syllables_per_word = _ratio(syllables, words)
+    letters_per_word = _ratio(letters, words)
+    # textstat's ARI divides all non-space characters by all tokens
+    chars_per_token = _ratio(chars, tokens)
+
+    metrics = {
+        "flesch_reading_ease": 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word,
+        "flesch_kincaid_grade": 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59,
+        "smog_index": 1.043 * np.sqrt(_ratio(np.asarray(polysyllables) * 30.0, sentences)) + 3.1291,
+        "coleman_liau_index": 0.058 * letters_per_word * 100 - 0.296 * _ratio(sentences, words) * 100 - 15.8,
+        "automated_readability_index": 4.71 * chars_per_token + 0.5 * words_per_sentence - 21.43,
+    }
+    return {name: np.where(valid, values, 0.0) for name, values in metrics.items()}
+
+
+def index_counts(indexes) -> tuple:
+    """Per-text count arrays from DocumentIndex objects."""
+    n = len(indexes)
+    words = np.fromiter((i.word_count for i in indexes), dtype=np.int64, count=n)
+    sentences = np.fromiter((i.sentence_count for i in indexes), dtype=np.int64, count=n)
+    syllables = np.fromiter((i.syllable_count for i in indexes), dtype=np.int64, count=n)
+    polysyllables = np.fromiter((i.polysyllable_count for i in indexes), dtype=np.int64, count=n)
+    letters = np.fromiter((i.letter_count for i in indexes), dtype=np.int64, count=n)
+    chars = np.fromiter((i.char_count for i in indexes), dtype=np.int64, count=n)
+    tokens = np.fromiter((i.token_count for i in indexes), dtype=np.int64, count=n)
+    return words, sentences, syllables, polysyllables, letters, chars, tokens
+
+
+def batch_readability(texts) -> dict:
+    """Every grade metric for a list of texts, as NumPy arrays aligned with `texts`."""
+    from app.utils.text_index import DocumentIndex
+
+    return grade_metrics(*index_counts([DocumentIndex(t) for t in texts]))
+
+
+def flesch_kincaid_grade(index) -> float:
+    """Flesch-Kincaid grade for one DocumentIndex."""
+    if index.word_count == 0 or index.sentence_count == 0:
+        return 0.0
+    return (
+        0.39 * (index.word_count / index.sentence_count)
+        + 11.8 * (index.syllable_count / index.word_count)
+        - 15.59
+    )
@@ -0,0 +1,60 @@
+# app/utils/sentence_cache.py
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class SentenceCache:
+    """
+    Size-bounded LRU cache keyed by a content hash of a normalized sentence.
+    A max_size of 0 disables storage but still counts misses.
+    """
+
+    def __init__(self, max_size: int = 5000):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(sentence: str) -> str:
+        return hashlib.blake2b(sentence.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, sentence: str):
+        key = self.key(sentence)
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, sentence: str, value):
+        if self.max_size <= 0:
+            return
+        key = self.key(sentence)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,111 @@
+# app/utils/speech_signals.py
+"""
+Fluency and pronunciation signals kept from a Whisper transcription.
+
+Whisper already scores every segment (avg_logprob, no_speech_prob,
+compression_ratio) and, with word_timestamps, times and scores every
+word. Those are stored with the transcript as a compact JSON document,
+and the speaking metrics are derived from it without touching the
+audio again.
+
+Stored shape:
+    {"duration": 12.3,
+     "segments": [{"start", "end", "avg_logprob", "no_speech_prob", "compression_ratio"}, ...],
+     "words": [[word, start, end, probability], ...]}
+"""
+import math
+
+import numpy as np
+
+from app.core.config import PAUSE_MIN_SECONDS, PAUSE_LONG_SECONDS
+
+# Segments above this compression ratio are usually repetition loops
+MAX_COMPRESSION_RATIO = 2.4
+
+
+def signals_from_result(result: dict, duration: float, offset: float = 0.0) -> dict:
+    """Compact signals from a model.transcribe(..., word_timestamps=True) result."""
+    segments = []
+    words = []
+    for seg in result.get("segments", []):
+        segments.append({
+            "start": round(seg["start"] + offset, 2),
+            "end": round(seg["end"] + offset, 2),
+            "avg_logprob": round(seg.get("avg_logprob", 0.0), 4),
+            "no_speech_prob": round(seg.get("no_speech_prob", 0.0), 4),
+            "compression_ratio": round(seg.get("compression_ratio", 0.0), 3),
+        })
+        for w in seg.get("words", []):
+            words.append([
+                w["word"].strip(),
+                round(w["start"] + offset, 2),
+                round(w["end"] + offset, 2),
+                round(w.get("probability", 0.0), 4),
+            ])
+    return {"duration": round(duration, 3), "segments": segments, "words": words}
+
+
+def merge_signals(parts: list) -> dict:
+    """Concatenate signals of consecutive chunks (already offset)."""
+    return {
+        "duration": round(max((p["duration"] for p in parts), default=0.0), 3),
+        "segments": [s for p in parts for s in p["segments"]],
+        "words": [w for p in parts for w in p["words"]],
+    }
+
+
+# ---------------- Derived metrics ----------------
+def pronunciation_confidence(signals: dict) -> float:
+    """
+    0..1 confidence of the recognizer in what it heard.
+    Duration-weighted mean word probability; falls back to exp(avg_logprob)
+    of speech segments when word timings are missing.
+    """
+    words = signals.get("words") or []
+    if words:
+        probs = np.array([w[3] for w in words], dtype=np.float64)
+        weights = np.array([max(w[2] - w[1], 0.01) for w in words], dtype=np.float64)
+        return float(np.clip(np.average(probs, weights=weights), 0.0, 1.0))
+
+    speech = [s for s in signals.get("segments", []) if s["no_speech_prob"] < 0.5]
+    if not speech:
+        return 0.0
+    weights = [max(s["end"] - s["start"], 0.01) for s in speech]
+    score = sum(math.exp(s["avg_logprob"]) * w for s, w in zip(speech, weights)) / sum(weights)
+    return min(1.0, max(0.0, score))
+
+
+def repetitive_segments(signals: dict) -> int:
+    """Segments whose compression ratio suggests a repetition loop."""
+    return sum(1 for s in signals.get("segments", []) if s["compression_ratio"] > MAX_COMPRESSION_RATIO)
+
+
+def word_timing(
+    signals: dict,
+    min_pause: float = PAUSE_MIN_SECONDS,
+    long_pause: float = PAUSE_LONG_SECONDS,
+) -> dict | None:
+    """
+    Pauses and phonation time from the gaps between timed words, in the
+    same shape as audio_utils.detect_pauses. None without word timings.
+    """
+    words = signals.get("words") or []
+    if not words:
+        return None
+    starts = np.array([w[1] for w in words], dtype=np.float64)
+    ends = np.array([w[2] for w in words], dtype=np.float64)
+
+    gaps = starts[1:] - np.maximum.accumulate(ends)[:-1]
+    pauses = gaps[gaps >= min_pause]
+    speech_start, speech_end = float(starts[0]), float(ends.max())
+
+    return {
+        "pause_count": int(len(pauses)),
+        "long_pause_count": int((pauses >= long_pause).sum()),
+        "pause_durations": [round(float(d), 2) for d in pauses],
+        "total_pause_time": round(float(pauses.sum()), 2),
+        "mean_pause": round(float(pauses.mean()), 2) if len(pauses) else 0.0,
+        "phonation_time": round(speech_end - speech_start - float(pauses.sum()), 2),
+        "speech_start": round(speech_start, 2),
+        "speech_end": round(speech_end, 2),
+    }
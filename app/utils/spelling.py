@@ -0,0 +1,248 @@
+# app/utils/spelling.py
+"""
+In-process spelling checker using a symmetric-delete (SymSpell-style) index.
+
+The index is built once from a word list (see app/scripts/build_spelling_index.py),
+written to a compact binary file and memory-mapped at runtime, so every worker
+shares the same pages and lookups cost a hash plus a binary search.
+
+File layout (little-endian, every section 8-byte aligned):
+    header          magic, max_distance, prefix_length, section sizes
+    word_hashes     uint64[n_words]      sorted; word id = position
+    word_freqs      uint32[n_words]
+    word_offsets    uint32[n_words + 1]  into the words blob
+    delete_hashes   uint64[n_deletes]    sorted
+    posting_offsets uint32[n_deletes + 1]
+    postings        uint32[n_postings]   word ids per delete
+    words blob      utf-8
+"""
+import hashlib
+import mmap
+import os
+import re
+import struct
+import threading
+
+import numpy as np
+
+MAGIC = b"EUSPELL1"
+_HEADER = struct.Struct("<8sIIQQQQ")
+
+_WORD_RE = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)*")
+_SUFFIXES = ("'s", "'t", "'re", "'ve", "'ll", "'d", "'m")
+
+
+def _hash(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _deletes(word: str, max_distance: int) -> set:
+    """Every string reachable from `word` by up to max_distance deletions."""
+    result = set()
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for w in frontier:
+            if len(w) <= 1:
+                continue
+            for i in range(len(w)):
+                d = w[:i] + w[i + 1:]
+                if d not in result:
+                    next_frontier.add(d)
+        result |= next_frontier
+        frontier = next_frontier
+    return result
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance; returns max_distance + 1 when exceeded."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    prev_prev = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev_prev[j - 2] + 1)
+            row_min = min(row_min, cur[j])
+        if row_min > max_distance:
+            return max_distance + 1
+        prev_prev, prev = prev, cur
+    return prev[-1]
+
+
+# ---------------- Building ----------------
+def read_word_list(path: str) -> dict:
+    """Read 'word' or 'word count' lines into {word: frequency}."""
+    words = {}
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            word = parts[0].lower()
+            if not _WORD_RE.fullmatch(word):
+                continue
+            freq = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 1
+            words[word] = words.get(word, 0) + freq
+    return words
+
+
+def build_index(words: dict, path: str, max_distance: int = 2, prefix_length: int = 7):
+    """Write the binary index for {word: frequency} to `path`."""
+    # Sort words by hash so a word's id is its position in word_hashes
+    items = sorted(((_hash(w), w, f) for w, f in words.items()), key=lambda t: t[0])
+    word_hashes = np.array([h for h, _, _ in items], dtype="<u8")
+    word_freqs = np.array([min(f, 2**32 - 1) for _, _, f in items], dtype="<u4")
+    encoded = [w.encode("utf-8") for _, w, _ in items]
+    word_offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    np.cumsum([len(e) for e in encoded], out=word_offsets[1:])
+    blob = b"".join(encoded)
+
+    pair_hashes = []
+    pair_ids = []
+    for word_id, (_, word, _) in enumerate(items):
+        for d in _deletes(word[:prefix_length], max_distance):
+            pair_hashes.append(_hash(d))
+            pair_ids.append(word_id)
+    pair_hashes = np.array(pair_hashes, dtype="<u8")
+    pair_ids = np.array(pair_ids, dtype="<u4")
+    order = np.argsort(pair_hashes, kind="stable")
+    pair_hashes = pair_hashes[order]
+    postings = pair_ids[order]
+    delete_hashes, starts = np.unique(pair_hashes, return_index=True)
+    posting_offsets = np.append(starts, len(postings)).astype("<u4")
+
+    sections = [
+        word_hashes, word_freqs, word_offsets,
+        delete_hashes.astype("<u8"), posting_offsets, postings,
+        np.frombuffer(blob, dtype=np.uint8),
+    ]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, max_distance, prefix_length, len(items), len(delete_hashes), len(postings), len(blob)))
+        for section in sections:
+            f.write(section.tobytes())
+            f.write(b"\0" * (-f.tell() % 8))
+    os.replace(tmp, path)
+
+
+# ---------------- Lookup ----------------
+class SpellChecker:
+    """Memory-mapped SymSpell index."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.max_distance, self.prefix_length, n_words, n_deletes, n_postings, blob_len = (
+            _HEADER.unpack_from(self._mm, 0)
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a spelling index")
+
+        offset = _HEADER.size
+
+        def section(dtype, count):
+            nonlocal offset
+            arr = np.frombuffer(self._mm, dtype=dtype, count=count, offset=offset)
+            offset += arr.nbytes + (-(offset + arr.nbytes) % 8)
+            return arr
+
+        self._word_hashes = section("<u8", n_words)
+        self._word_freqs = section("<u4", n_words)
+        self._word_offsets = section("<u4", n_words + 1)
+        self._delete_hashes = section("<u8", n_deletes)
+        self._posting_offsets = section("<u4", n_deletes + 1)
+        self._postings = section("<u4", n_postings)
+        self._blob = section(np.uint8, blob_len)
+
+    def __len__(self):
+        return len(self._word_hashes)
+
+    def _find(self, sorted_hashes, h: int) -> int:
+        # np.uint64 keeps searchsorted on the fast integer path
+        i = int(sorted_hashes.searchsorted(np.uint64(h)))
+        if i < len(sorted_hashes) and int(sorted_hashes[i]) == h:
+            return i
+        return -1
+
+    def _find_many(self, sorted_hashes, hashes):
+        """Positions of every hash found in `sorted_hashes` (vectorized)."""
+        keys = np.array(hashes, dtype="<u8")
+        positions = sorted_hashes.searchsorted(keys)
+        positions = np.minimum(positions, max(len(sorted_hashes) - 1, 0))
+        return positions[sorted_hashes[positions] == keys]
+
+    def _word(self, word_id: int) -> str:
+        start, end = self._word_offsets[word_id], self._word_offsets[word_id + 1]
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+    def known(self, word: str) -> bool:
+        word = word.lower()
+        if self._find(self._word_hashes, _hash(word)) >= 0:
+            return True
+        # Contractions and possessives: accept "<known word>'s" etc.
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and self._find(self._word_hashes, _hash(word[: -len(suffix)])) >= 0:
+                return True
+        return False
+
+    def suggestions(self, word: str, max_distance: int | None = None, limit: int = 5) -> list:
+        """[(word, distance, frequency)] sorted by distance, then frequency."""
+        word = word.lower()
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        prefix = word[: self.prefix_length]
+
+        hashes = [_hash(key) for key in {prefix} | _deletes(prefix, max_distance)]
+        candidate_ids = set(self._find_many(self._word_hashes, hashes).tolist())
+        for i in self._find_many(self._delete_hashes, hashes).tolist():
+            start, end = self._posting_offsets[i], self._posting_offsets[i + 1]
+            candidate_ids.update(self._postings[start:end].tolist())
+
+        results = []
+        for word_id in candidate_ids:
+            candidate = self._word(word_id)
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                results.append((candidate, distance, int(self._word_freqs[word_id])))
+        results.sort(key=lambda r: (r[1], -r[2], r[0]))
+        return results[:limit]
+
+    def misspelled(self, text: str) -> list:
+        """[(offset, word)] for every unknown word in the text."""
+        errors = []
+        for m in _WORD_RE.finditer(text):
+            word = m.group()
+            if len(word) > 1 and word.isupper():
+                continue  # acronyms
+            if not self.known(word):
+                errors.append((m.start(), word))
+        return errors
+
+    def count_errors(self, text: str) -> int:
+        return len(self.misspelled(text))
+
+
+_checker = None
+_checker_lock = threading.Lock()
+
+
+def get_spell_checker(path: str | None = None) -> SpellChecker | None:
+    """The shared checker, or None when no index file has been built."""
+    global _checker
+    if _checker is None:
+        from app.core.config import SPELLING_ENGINE, SPELLING_INDEX_PATH
+
+        path = path or SPELLING_INDEX_PATH
+        if SPELLING_ENGINE == "languagetool" or not os.path.exists(path):
+            return None
+        with _checker_lock:
+            if _checker is None:
+                _checker = SpellChecker(path)
+    return _checker
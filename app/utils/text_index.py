@@ -0,0 +1,168 @@
+# app/utils/text_index.py
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from app.utils.readability import count_syllables
+
+# Words and sentences are counted the way textstat counts them, so the
+# readability grades agree with it. A word is a whitespace-separated token
+# with at least one word character ("don't", "p.m." and "well-known" are one
+# word each); its lexicon form drops punctuation except contraction apostrophes.
+_WORD_TOKEN_RE = re.compile(r"[^\s\w]*\w\S*")  # a token with a word character in it
+_NON_WORD_CHAR_RE = re.compile(r"[^\w\s]")
+_NON_CONTRACTION_APOSTROPHE_RE = re.compile(r"'(?!(?:[tsd]|ve|ll|re))")
+_PUNCTUATION_RE = re.compile(r"[^\w\s']")
+# textstat's sentence segments: text up to and including its end marks
+_SEGMENT_RE = re.compile(r"\b[^.!?]+[.!?]*")
+# Shorter segments ("Dr.", the "m." of "p.m.", the "3." of "3.5") are not
+# sentences: they join the sentence before them, or the next one
+_MIN_SENTENCE_WORDS = 3
+# Closing quotes and brackets stay with the sentence they end
+_TRAILING_PUNCTUATION_RE = re.compile(r"[^\w\s]*")
+
+
+def _lexicon_form(text: str) -> str:
+    return _PUNCTUATION_RE.sub("", _NON_CONTRACTION_APOSTROPHE_RE.sub("", text))
+
+
+class DocumentIndex:
+    """
+    Compact index of a text, built in one pass over its words and one
+    over its sentence segments: word and sentence offset arrays, words per
+    sentence, a lowercase vocabulary with counts, and syllable counts.
+    All text metrics read from it instead of re-tokenizing.
+    """
+
+    __slots__ = (
+        "text",
+        "word_starts",
+        "word_ends",
+        "sentence_starts",
+        "sentence_ends",
+        "sentence_word_counts",
+        "vocabulary",
+        "letter_count",
+        "char_count",
+        "token_count",
+        "_syllable_count",
+        "_polysyllable_count",
+    )
+
+    def __init__(self, text: str):
+        self.text = text
+        self.sentence_starts = array("l")
+        self.sentence_ends = array("l")
+        self.sentence_word_counts = array("l")
+        self._syllable_count = None
+        self._polysyllable_count = None
+
+        tokens = text.split()
+        self.token_count = len(tokens)  # punctuation-only tokens included
+        self.char_count = sum(map(len, tokens))  # non-space characters
+        self.letter_count = self.char_count - len(_NON_WORD_CHAR_RE.findall(text))  # word characters
+
+        words = list(_WORD_TOKEN_RE.finditer(text))
+        self.word_starts = array("l", [m.start() for m in words])
+        self.word_ends = array("l", [m.end() for m in words])
+        # Only word tokens keep characters once punctuation is stripped
+        self.vocabulary = Counter(_lexicon_form(text).lower().split())
+
+        self._index_sentences()
+
+    def _index_sentences(self):
+        text = self.text
+        groups = []  # [start, end] of the first and last segment of each sentence
+        pending = None
+        last_end = 0
+        for m in _SEGMENT_RE.finditer(text):
+            last_end = m.end()
+            if self._segment_is_sentence(m.start(), m.end()):
+                groups.append([m.start() if pending is None else pending, m.end()])
+                pending = None
+            elif groups:
+                groups[-1][1] = m.end()
+            elif pending is None:
+                pending = m.start()
+        if pending is not None:
+            groups.append([pending, last_end])  # no segment is long enough: one sentence
+
+        previous_end = 0
+        for start, end in groups:
+            # Take in opening quotes or brackets before the first segment
+            start -= len(text[previous_end:start].lstrip())
+            end = _TRAILING_PUNCTUATION_RE.match(text, end).end()
+            end = len(text[:end].rstrip())
+            self._add_sentence(start, end)
+            previous_end = end
+
+    def _segment_is_sentence(self, start: int, end: int) -> bool:
+        # Words starting in the segment are within one of its own word count:
+        # a word cut at either edge may count on one side only
+        starts = self.word_starts
+        estimate = bisect_left(starts, end) - bisect_left(starts, start)
+        if estimate != _MIN_SENTENCE_WORDS and estimate != _MIN_SENTENCE_WORDS - 1:
+            return estimate > _MIN_SENTENCE_WORDS
+        return len(_WORD_TOKEN_RE.findall(self.text, start, end)) >= _MIN_SENTENCE_WORDS
+
+    def _add_sentence(self, start: int, end: int):
+        self.sentence_starts.append(start)
+        self.sentence_ends.append(end)
+        self.sentence_word_counts.append(
+            bisect_left(self.word_starts, end) - bisect_left(self.word_starts, start)
+        )
+
+    # ---------------- Counts ----------------
+    @property
+    def word_count(self) -> int:
+        return len(self.word_starts)
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_starts)
+
+    @property
+    def unique_word_count(self) -> int:
+        return len(self.vocabulary)
+
+    def _count_syllables(self):
+        # Counted once per distinct word, weighted by its frequency
+        total = 0
+        poly = 0
+        for word, n in self.vocabulary.items():
+            syllables = count_syllables(word)
+            total += syllables * n
+            if syllables >= 3:
+                poly += n
+        self._syllable_count = total
+        self._polysyllable_count = poly
+
+    @property
+    def syllable_count(self) -> int:
+        if self._syllable_count is None:
+            self._count_syllables()
+        return self._syllable_count
+
+    @property
+    def polysyllable_count(self) -> int:
+        """Words with three or more syllables."""
+        if self._polysyllable_count is None:
+            self._count_syllables()
+        return self._polysyllable_count
+
+    def long_sentence_count(self, min_words: int = 20) -> int:
+        return sum(1 for n in self.sentence_word_counts if n > min_words)
+
+    # ---------------- Access ----------------
+    def words(self):
+        """Lowercase words in order."""
+        text = self.text
+        return [text[s:e].lower() for s, e in zip(self.word_starts, self.word_ends)]
+
+    def sentence_spans(self):
+        return list(zip(self.sentence_starts, self.sentence_ends))
+
+    def sentences(self):
+        text = self.text
+        return [text[s:e] for s, e in zip(self.sentence_starts, self.sentence_ends)]
@@ -1,17 +1,65 @@
 
 import re
-import language_tool_python
-from textstat import flesch_kincaid_grade
+import threading
+from bisect import bisect_right
+from collections import Counter
+from typing import NamedTuple
 
-# Initialize the grammar checker once
-tool = language_tool_python.LanguageTool('en-US')
+from app.core.config import LANGUAGE_CACHE_SIZE, LANGUAGETOOL_SERVERS
+from app.utils.sentence_cache import SentenceCache
+from app.utils.text_index import DocumentIndex
+
+# The grammar checker is created on first use (or by the startup warm-up):
+# either a client for the shared server pool, or an in-process LanguageTool
+# with its own JVM. Importing this module stays cheap.
+_tool = None
+_tool_lock = threading.Lock()
+
+# LanguageTool issues per normalized sentence
+sentence_cache = SentenceCache(max_size=LANGUAGE_CACHE_SIZE)
+
+# Joins uncached sentences into one LanguageTool request. Normalized
+# sentences contain no newlines, so every sentence becomes its own paragraph.
+_BATCH_SEPARATOR = "\n\n"
+# LanguageTool rules that look beyond one sentence: repeated sentence
+# starts and words, brackets or quotes paired across sentences, paragraph
+# layout. What they report depends on which sentences share a request,
+# so their matches are dropped and cached issues stay per sentence.
+_CONTEXT_RULES = frozenset({
+    "ENGLISH_WORD_REPEAT_BEGINNING_RULE",
+    "PARAGRAPH_REPEAT_BEGINNING_RULE",
+    "EN_UNPAIRED_BRACKETS",
+    "EN_UNPAIRED_QUOTES",
+    "PUNCTUATION_PARAGRAPH_END",
+    "PUNCTUATION_PARAGRAPH_END2",
+    "WHITESPACE_PARAGRAPH",
+    "WHITESPACE_PARAGRAPH_BEGIN",
+    "EMPTY_LINE",
+    "TOO_LONG_PARAGRAPH",
+    "STYLE_REPEATED_WORD_RULE_EN",
+})
+_CONTEXT_RULE_PREFIXES = ("EN_REPEATEDWORDS_",)
+
+
+def get_language_tool():
+    """Return the shared LanguageTool checker, creating it on first call."""
+    global _tool
+    if _tool is None:
+        with _tool_lock:
+            if _tool is None:
+                if LANGUAGETOOL_SERVERS:
+                    from app.utils.languagetool_pool import LanguageToolClientPool
+                    _tool = LanguageToolClientPool(LANGUAGETOOL_SERVERS)
+                else:
+                    import language_tool_python
+                    _tool = language_tool_python.LanguageTool('en-US')
+    return _tool
 
 
 # ---------------- Text Tokenization ----------------
 def tokenize_sentences(text: str):
-    """Split text into sentences."""
-    sentences = re.split(r'(?<=[.!?]) +', text.strip())
-    return [s for s in sentences if s]
+    """Split text into sentences (the DocumentIndex rule)."""
+    return DocumentIndex(text).sentences()
 
 
 def tokenize_words(text: str):
@@ -20,34 +68,195 @@ def tokenize_words(text: str):
     return words
 
 
-# ---------------- Grammar & Spelling ----------------
-def count_grammar_errors(text: str) -> int:
-    """Count grammar mistakes using LanguageTool."""
-    matches = tool.check(text)
-    # Filter only grammar mistakes (exclude style/writing suggestions if needed)
-    grammar_errors = [m for m in matches if m.ruleIssueType == "grammar"]
-    return len(grammar_errors)
+# ---------------- LanguageTool Check ----------------
+class LanguageIssue(NamedTuple):
+    """A single LanguageTool match, detached from the JVM response."""
+    rule_id: str
+    category: str
+    issue_type: str
+    offset: int
+    length: int
+    message: str
+    replacements: tuple
 
 
-def count_spelling_errors(text: str) -> int:
-    """Count spelling mistakes using LanguageTool."""
-    matches = tool.check(text)
-    spelling_errors = [m for m in matches if m.ruleIssueType == "misspelling"]
-    return len(spelling_errors)
+class LanguageCheckResult:
+    """
+    LanguageTool output for one text.
+    Run the check once and read grammar, spelling, style and
+    per-category counts from the same match list.
+    """
 
+    def __init__(self, text: str, issues):
+        self.text = text
+        self.issues = list(issues)
 
-# ---------------- Readability ----------------
-def compute_readability(text: str) -> float:
-    """Compute Flesch-Kincaid grade level."""
-    try:
-        score = flesch_kincaid_grade(text)
-        return score
-    except Exception:
-        return 0.0
+    @classmethod
+    def from_matches(cls, text: str, matches) -> "LanguageCheckResult":
+        issues = [
+            LanguageIssue(
+                rule_id=m.ruleId,
+                category=m.category,
+                issue_type=m.ruleIssueType,
+                offset=m.offset,
+                length=m.errorLength,
+                message=m.message,
+                replacements=tuple(m.replacements[:5]),
+            )
+            for m in matches
+        ]
+        return cls(text, issues)
+
+    def count(self, issue_type: str) -> int:
+        return sum(1 for i in self.issues if i.issue_type == issue_type)
+
+    @property
+    def grammar_errors(self) -> int:
+        return self.count("grammar")
+
+    @property
+    def spelling_errors(self) -> int:
+        return self.count("misspelling")
+
+    @property
+    def style_issues(self) -> int:
+        return self.count("style")
+
+    @property
+    def category_counts(self) -> dict:
+        return dict(Counter(i.category for i in self.issues))
+
+
+def sentence_spans(text: str):
+    """(start, end) offsets of the sentences returned by tokenize_sentences."""
+    return DocumentIndex(text).sentence_spans()
+
+
+def normalize_sentence(sentence: str):
+    """
+    Collapse whitespace runs to single spaces.
+    Returns the normalized sentence and, for every character in it,
+    its offset in the original sentence.
+    """
+    chars = []
+    positions = []
+    prev_space = False
+    for i, ch in enumerate(sentence):
+        if ch.isspace():
+            if prev_space:
+                continue
+            ch = " "
+            prev_space = True
+        else:
+            prev_space = False
+        chars.append(ch)
+        positions.append(i)
+    return "".join(chars), positions
 
 
+def _check_uncached(sentences: list) -> dict:
+    """
+    Check normalized sentences in one LanguageTool request and split the
+    matches back by offset. Matches of context rules, and matches that
+    reach into a separator, are dropped.
+    """
+    starts = []
+    position = 0
+    for sentence in sentences:
+        starts.append(position)
+        position += len(sentence) + len(_BATCH_SEPARATOR)
+    joined = _BATCH_SEPARATOR.join(sentences)
 
+    found = {sentence: [] for sentence in sentences}
+    for issue in LanguageCheckResult.from_matches(joined, get_language_tool().check(joined)).issues:
+        if issue.rule_id in _CONTEXT_RULES or issue.rule_id.startswith(_CONTEXT_RULE_PREFIXES):
+            continue
+        i = bisect_right(starts, issue.offset) - 1
+        offset = issue.offset - starts[i]
+        if offset + issue.length <= len(sentences[i]):
+            found[sentences[i]].append(issue._replace(offset=offset))
+    return {sentence: tuple(issues) for sentence, issues in found.items()}
 
 
+def _remap(issues, positions: list, sentence: str) -> list:
+    """Move issue offsets from the normalized sentence back to the original one."""
+    remapped = []
+    for issue in issues:
+        start = positions[issue.offset] if issue.offset < len(positions) else len(sentence)
+        last = issue.offset + issue.length - 1
+        end = positions[last] + 1 if 0 <= last < len(positions) else start
+        remapped.append(issue._replace(offset=start, length=max(end - start, 0)))
+    return remapped
 
 
+def check_sentences(sentences) -> list:
+    """
+    LanguageTool issues for each sentence, offsets relative to that sentence.
+    Cached sentences are served from the cache; the rest go to
+    LanguageTool together in a single request.
+    """
+    normalized = [normalize_sentence(sentence) for sentence in sentences]
+    issues = {}
+    for text, _positions in normalized:
+        if text not in issues:
+            issues[text] = sentence_cache.get(text)
+
+    uncached = [text for text, found in issues.items() if found is None]
+    if uncached:
+        for text, found in _check_uncached(uncached).items():
+            issues[text] = found
+            sentence_cache.put(text, found)
+
+    return [
+        _remap(issues[text], positions, sentence)
+        for sentence, (text, positions) in zip(sentences, normalized)
+    ]
+
+
+def check_sentence(sentence: str):
+    """LanguageTool issues for one sentence, offsets relative to the sentence."""
+    return check_sentences([sentence])[0]
+
+
+def check_text(text: str, index: DocumentIndex | None = None) -> LanguageCheckResult:
+    """
+    Run LanguageTool over the text sentence by sentence.
+    Sentences seen before are served from the cache and the rest are
+    checked in one request. The text is always split the same way and
+    rules that look across sentences are left out, so counts do not
+    depend on the cache or on which sentences were checked together.
+    """
+    spans = index.sentence_spans() if index is not None else sentence_spans(text)
+    issues = []
+    checked = check_sentences([text[start:end] for start, end in spans])
+    for (start, _end), sentence_issues in zip(spans, checked):
+        for issue in sentence_issues:
+            issues.append(issue._replace(offset=issue.offset + start))
+    return LanguageCheckResult(text, issues)
+
+
+# ---------------- Grammar & Spelling ----------------
+def count_grammar_errors(text: str, check: LanguageCheckResult | None = None) -> int:
+    """Count grammar mistakes using LanguageTool."""
+    # Filter only grammar mistakes (exclude style/writing suggestions if needed)
+    check = check or check_text(text)
+    return check.grammar_errors
+
+
+def count_spelling_errors(text: str, check: LanguageCheckResult | None = None) -> int:
+    """Count spelling mistakes with the local index, or LanguageTool without one."""
+    from app.utils.spelling import get_spell_checker
+
+    checker = get_spell_checker()
+    if checker is not None:
+        return checker.count_errors(text)
+    check = check or check_text(text)
+    return check.spelling_errors
+
+
+# ---------------- Readability ----------------
+def compute_readability(text: str, index: DocumentIndex | None = None) -> float:
+    """Compute Flesch-Kincaid grade level from the document index."""
+    from app.utils.readability import flesch_kincaid_grade
+
+    return flesch_kincaid_grade(index or DocumentIndex(text))
@@ -0,0 +1,151 @@
+# app/utils/upload.py
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from typing import NamedTuple
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import MAX_UPLOAD_BYTES, UPLOAD_CHUNK_BYTES
+
+
+class UploadRejected(Exception):
+    """Upload refused; status_code is 413 (too large) or 415 (not audio)."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class SavedUpload(NamedTuple):
+    path: str
+    size: int
+    sha256: str
+    audio_format: str
+    seconds: float
+    loop_blocked_seconds: float
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "bytes": self.size,
+            "sha256": self.sha256,
+            "format": self.audio_format,
+            "seconds": round(self.seconds, 4),
+            "bytes_per_second": round(self.bytes_per_second),
+            "loop_blocked_ms": round(self.loop_blocked_seconds * 1000, 2),
+        }
+
+
+# ---------------- Format sniffing ----------------
+def sniff_audio_format(head: bytes) -> str | None:
+    """Audio container from the first bytes of a file, or None if it is not audio."""
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"  # Matroska/WebM (MediaRecorder in Chrome and Firefox)
+    if head[:3] == b"ID3" or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return "mp3"
+    if head[4:8] == b"ftyp":
+        return "mp4"  # m4a/aac (MediaRecorder in Safari)
+    return None
+
+
+# ---------------- Event loop lag ----------------
+class LoopLagMonitor:
+    """
+    Measures how long the event loop was blocked: a task sleeps `interval`
+    seconds in a loop and adds up how late it wakes up.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.blocked = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - start - self.interval
+            if lag > 0.001:  # below this is timer jitter
+                self.blocked += lag
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+# ---------------- Saving ----------------
+async def save_upload(
+    upload: UploadFile,
+    directory: str,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_BYTES,
+) -> SavedUpload:
+    """
+    Stream an audio upload to `directory` in chunks.
+    Rejects non-audio (415) after the first chunk and oversized uploads
+    (413) as soon as the limit is passed. Hashing and disk writes run in
+    the threadpool, so the event loop only awaits.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadRejected(413, f"Audio file exceeds {max_bytes} bytes")
+
+    start = time.perf_counter()
+    async with LoopLagMonitor() as monitor:
+        head = await upload.read(chunk_size)
+        audio_format = sniff_audio_format(head)
+        if audio_format is None:
+            raise UploadRejected(415, "Unsupported media type: expected an audio file")
+
+        filename = os.path.basename(upload.filename or "") or f"audio.{audio_format}"
+        path = os.path.join(directory, f"{uuid.uuid4()}_{filename}")
+        hasher = hashlib.sha256()
+        f = await run_in_threadpool(open, path, "wb")
+
+        def write(chunk: bytes):
+            hasher.update(chunk)
+            f.write(chunk)
+
+        size = 0
+        try:
+            chunk = head
+            while chunk:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadRejected(413, f"Audio file exceeds {max_bytes} bytes")
+                await run_in_threadpool(write, chunk)
+                chunk = await upload.read(chunk_size)
+        except BaseException:
+            await run_in_threadpool(f.close)
+            await run_in_threadpool(os.remove, path)
+            raise
+        await run_in_threadpool(f.close)
+
+    return SavedUpload(
+        path=path,
+        size=size,
+        sha256=hasher.hexdigest(),
+        audio_format=audio_format,
+        seconds=time.perf_counter() - start,
+        loop_blocked_seconds=monitor.blocked,
+    )
@@ -1,11 +1,17 @@
 # create_tables.py
 from app.db.base import Base
+from app.db.init_db import add_missing_columns
 from app.db.session import engine
 from app.models.transcripts import Transcript
 from app.models.user import User
 from app.models.prompt import Prompt
+from app.models.analysis_result import AnalysisResult
+from app.models.transcription_job import TranscriptionJob
+from app.models.audio_blob import AudioBlob
+from app.models.idempotency_record import IdempotencyRecord
 
 
 # This will create all tables in the database if they don't exist
 Base.metadata.create_all(bind=engine)
+add_missing_columns(engine)
 print("All tables created successfully.")
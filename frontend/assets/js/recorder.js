@@ -0,0 +1,178 @@
+// assets/js/recorder.js
+// Live speaking recorder: streams the microphone to the backend as
+// 16 kHz mono PCM16 over a WebSocket and reports partial transcripts and
+// live metrics while the user talks.
+//
+//   const recorder = new LiveRecorder({
+//     token, promptId,
+//     onPartial: (update) => { /* update.committed, update.tentative, update.metrics */ },
+//     onDone: (result) => { /* result.transcript_id, result.text, result.metrics */ },
+//     onError: (message) => { ... },
+//   });
+//   await recorder.start();
+//   ...
+//   recorder.stop();
+
+const TARGET_SAMPLE_RATE = 16000;
+const CHUNK_MS = 100;
+
+// Runs on the audio thread: downmixes, resamples to 16 kHz and posts
+// Int16 chunks of CHUNK_MS to the main thread.
+const WORKLET_SOURCE = `
+class PcmEncoder extends AudioWorkletProcessor {
+  constructor(options) {
+    super();
+    this.ratio = sampleRate / options.processorOptions.targetRate;
+    this.chunk = new Int16Array(options.processorOptions.chunkSamples);
+    this.filled = 0;
+    this.position = 0;
+    this.sum = 0;
+    this.count = 0;
+  }
+
+  process(inputs) {
+    const input = inputs[0];
+    if (!input || input.length === 0) return true;
+    const frames = input[0].length;
+    for (let i = 0; i < frames; i++) {
+      let sample = 0;
+      for (let c = 0; c < input.length; c++) sample += input[c][i];
+      // Average the input samples that fall into one output sample
+      this.sum += sample / input.length;
+      this.count++;
+      this.position++;
+      if (this.position >= this.ratio) {
+        this.position -= this.ratio;
+        const value = Math.max(-1, Math.min(1, this.sum / this.count));
+        this.chunk[this.filled++] = value < 0 ? value * 0x8000 : value * 0x7fff;
+        this.sum = 0;
+        this.count = 0;
+        if (this.filled === this.chunk.length) {
+          this.port.postMessage(this.chunk.buffer.slice(0));
+          this.filled = 0;
+        }
+      }
+    }
+    return true;
+  }
+}
+registerProcessor("pcm-encoder", PcmEncoder);
+`;
+
+class LiveRecorder {
+  constructor({ token, promptId, sttTier = null, sttProfile = null, baseUrl = null,
+                onPartial = () => {}, onDone = () => {}, onError = () => {} }) {
+    this.token = token;
+    this.promptId = promptId;
+    this.sttTier = sttTier;
+    this.sttProfile = sttProfile;
+    this.baseUrl = baseUrl || window.location.origin.replace(/^http/, "ws");
+    this.onPartial = onPartial;
+    this.onDone = onDone;
+    this.onError = onError;
+
+    this.socket = null;
+    this.stream = null;
+    this.context = null;
+    this.node = null;
+    this.recording = false;
+  }
+
+  socketUrl() {
+    const params = new URLSearchParams({ token: this.token, prompt_id: this.promptId });
+    if (this.sttTier) params.set("stt_tier", this.sttTier);
+    if (this.sttProfile) params.set("stt_profile", this.sttProfile);
+    return `${this.baseUrl}/api/v1/evaluate/live?${params}`;
+  }
+
+  async start() {
+    if (this.recording) return;
+
+    this.stream = await navigator.mediaDevices.getUserMedia({
+      audio: { channelCount: 1, echoCancellation: true, noiseSuppression: true },
+    });
+    await this.openSocket();
+
+    // Ask for 16 kHz directly; the worklet resamples if the browser refuses
+    try {
+      this.context = new AudioContext({ sampleRate: TARGET_SAMPLE_RATE });
+    } catch (e) {
+      this.context = new AudioContext();
+    }
+    const workletUrl = URL.createObjectURL(new Blob([WORKLET_SOURCE], { type: "application/javascript" }));
+    try {
+      await this.context.audioWorklet.addModule(workletUrl);
+    } finally {
+      URL.revokeObjectURL(workletUrl);
+    }
+
+    this.node = new AudioWorkletNode(this.context, "pcm-encoder", {
+      processorOptions: {
+        targetRate: TARGET_SAMPLE_RATE,
+        chunkSamples: (TARGET_SAMPLE_RATE * CHUNK_MS) / 1000,
+      },
+    });
+    this.node.port.onmessage = (event) => {
+      if (this.recording && this.socket.readyState === WebSocket.OPEN) {
+        this.socket.send(event.data);
+      }
+    };
+    this.context.createMediaStreamSource(this.stream).connect(this.node);
+    this.recording = true;
+  }
+
+  openSocket() {
+    return new Promise((resolve, reject) => {
+      const socket = new WebSocket(this.socketUrl());
+      socket.binaryType = "arraybuffer";
+      socket.onopen = () => resolve();
+      socket.onmessage = (event) => this.handleMessage(JSON.parse(event.data));
+      socket.onerror = () => reject(new Error("Could not connect to the live session"));
+      socket.onclose = (event) => {
+        if (this.recording) {
+          this.release();
+          this.onError(event.reason || "Live session closed");
+        }
+      };
+      this.socket = socket;
+    });
+  }
+
+  handleMessage(message) {
+    if (message.event === "partial") {
+      this.onPartial(message);
+    } else if (message.event === "done") {
+      this.onDone(message);
+    } else if (message.event === "error") {
+      this.onError(message.detail);
+    }
+  }
+
+  // Stop recording; the server transcribes the rest and answers with "done"
+  stop() {
+    if (!this.recording) return;
+    this.release();
+    if (this.socket && this.socket.readyState === WebSocket.OPEN) {
+      this.socket.send(JSON.stringify({ event: "stop" }));
+    }
+  }
+
+  release() {
+    this.recording = false;
+    if (this.node) {
+      this.node.port.onmessage = null;
+      this.node.disconnect();
+      this.node = null;
+    }
+    if (this.stream) {
+      this.stream.getTracks().forEach((track) => track.stop());
+      this.stream = null;
+    }
+    if (this.context) {
+      this.context.close();
+      this.context = null;
+    }
+  }
+}
+
+window.LiveRecorder = LiveRecorder;
@@ -0,0 +1,48 @@
+# tests/conftest.py
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+
+from app.db.base import Base
+from app.models import (  # noqa: F401  (registers every table on Base.metadata)
+    analysis_result, attempt, audio_blob, idempotency_record, prompt, score,
+    transcription_job, transcripts, user,
+)
+
+
+class StandaloneBase(DeclarativeBase):
+    pass
+
+
+for _table in Base.metadata.sorted_tables:
+    _table.to_metadata(StandaloneBase.metadata)
+# Speech submissions store transcripts without an attempt
+StandaloneBase.metadata.tables["transcripts"].c.attempt_id.nullable = True
+
+_standalone = {}
+
+
+def _standalone_model(model):
+    """
+    `model`'s table mapped on its own, without the app's relationships
+    (the app's registry does not configure in isolation). Services are
+    pointed at it with monkeypatch.
+    """
+    if model not in _standalone:
+        table = StandaloneBase.metadata.tables[model.__tablename__]
+        _standalone[model] = type(model.__name__, (StandaloneBase,), {"__table__": table})
+    return _standalone[model]
+
+
+@pytest.fixture
+def standalone_model():
+    return _standalone_model
+
+
+@pytest.fixture
+def standalone_sessions(tmp_path):
+    """sessionmaker for a fresh SQLite database with every table."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    StandaloneBase.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
@@ -0,0 +1,19 @@
+# tests/test_analysis_pipeline.py
+import pytest
+
+from app.services.analysis_pipeline import parse_fields
+from app.services.basic_analysis import BasicAnalysisService
+
+
+def test_parse_fields():
+    assert parse_fields(None) is None
+    assert parse_fields("word_count, grammar_errors") == ["word_count", "grammar_errors"]
+    with pytest.raises(ValueError, match="Unknown"):
+        parse_fields("word_count,shoe_size")
+
+
+def test_parse_fields_refuses_fields_outside_allowed():
+    allowed = BasicAnalysisService.FIELDS
+    assert parse_fields("word_count,sentence_count", allowed=allowed) == ["word_count", "sentence_count"]
+    with pytest.raises(ValueError, match="grammar_errors"):
+        parse_fields("word_count,grammar_errors", allowed=allowed)
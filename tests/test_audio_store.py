@@ -0,0 +1,123 @@
+# tests/test_audio_store.py
+import hashlib
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.audio_blob import AudioBlob
+from app.models.transcription_job import TranscriptionJob
+from app.models.transcripts import Transcript
+from app.services import audio_store as audio_store_module
+from app.services.audio_store import AudioStore
+from app.utils.upload import SavedUpload
+OLD = time.time() - 3600
+
+
+@pytest.fixture
+def models(standalone_model, monkeypatch):
+    for model in (AudioBlob, TranscriptionJob, Transcript):
+        monkeypatch.setattr(audio_store_module, model.__name__, standalone_model(model))
+    return audio_store_module
+
+
+@pytest.fixture
+def store(tmp_path, models):
+    return AudioStore(root=str(tmp_path / "store"))
+
+
+@pytest.fixture
+def upload(tmp_path):
+    count = [0]
+
+    def make(data: bytes) -> SavedUpload:
+        count[0] += 1
+        path = tmp_path / f"upload-{count[0]}.wav"
+        path.write_bytes(data)
+        return SavedUpload(str(path), len(data), hashlib.sha256(data).hexdigest(), "wav", 0.0, 0.0)
+
+    return make
+
+
+def touch(path, data=b"x", mtime=OLD):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def age(db, sha256, seconds=3600):
+    db.get(audio_store_module.AudioBlob, sha256).last_used_at = datetime.now(timezone.utc) - timedelta(seconds=seconds)
+    db.commit()
+
+
+def test_same_bytes_are_stored_once_and_counted(store, models, upload, standalone_sessions):
+    first, second = upload(b"RIFF one"), upload(b"RIFF one")
+    with standalone_sessions() as db:
+        blob = store.add(db, first)
+        assert blob.path == store.blob_path(first.sha256, "wav")
+        assert blob.path.startswith(os.path.join(store.root, first.sha256[:2], first.sha256[2:4]))
+        assert not os.path.exists(first.path)
+
+        assert store.add(db, second).ref_count == 2
+        assert not os.path.exists(second.path)
+        assert open(blob.path, "rb").read() == b"RIFF one"
+
+        store.release(db, first.sha256)
+        store.release(db, first.sha256)
+        store.release(db, first.sha256)  # never below zero
+        assert db.get(models.AudioBlob, first.sha256).ref_count == 0
+
+
+def test_gc_deletes_expired_unreferenced_blobs_with_their_sidecars(store, models, upload, standalone_sessions):
+    with standalone_sessions() as db:
+        dead = store.add(db, upload(b"dead"))
+        recent = store.add(db, upload(b"recent"))
+        live = store.add(db, upload(b"live"))
+        for blob in (dead, recent):
+            store.release(db, blob.sha256)
+        age(db, dead.sha256)
+        age(db, live.sha256)
+        sidecars = [touch(dead.path + ".16k.npy"), touch(dead.path + ".16k.npy.json")]
+        for path in (dead.path, recent.path, live.path):
+            os.utime(path, (OLD, OLD))
+
+        dry = store.collect_garbage(db, grace_seconds=600, dry_run=True)
+        assert dry["blobs_deleted"] == 1 and os.path.exists(dead.path)
+
+        report = store.collect_garbage(db, grace_seconds=600)
+        assert report["blobs_deleted"] == 1
+        assert report["orphan_files_deleted"] == 0
+        assert report["bytes_freed"] == len(b"dead")
+        assert not any(os.path.exists(p) for p in [dead.path] + sidecars)
+        assert db.get(models.AudioBlob, dead.sha256) is None
+        # Unreferenced but within the grace period, and referenced
+        assert os.path.exists(recent.path) and os.path.exists(live.path)
+
+
+def test_gc_deletes_old_orphan_files_only(store, models, upload, standalone_sessions):
+    with standalone_sessions() as db:
+        live = store.add(db, upload(b"live")).path
+        os.utime(live, (OLD, OLD))
+        live_sidecar = touch(live + ".16k.npy")
+        orphan = touch(os.path.join(store.root, "ab", "cd", "orphan.wav"), b"orphan")
+        orphan_sidecar = touch(orphan + ".16k.npy.json", b"{}")
+        fresh = touch(os.path.join(store.root, "ab", "cd", "uploading.wav"), mtime=time.time())
+        # An original replaced by ingest that a transcript and a queued job still use
+        original = touch(os.path.join(store.root, "ef", "01", "original.webm"))
+        original_sidecar = touch(original + ".16k.npy")
+        db.add(models.Transcript(user_id=1, attempt_id=1, prompt_id=1, text="hi", input_mode="speech", audio_path=original))
+        queued = touch(os.path.join(store.root, "ef", "02", "queued.webm"))
+        db.add(models.TranscriptionJob(id="j1", user_id=1, prompt_id=1, audio_path=queued, status="queued"))
+        done = touch(os.path.join(store.root, "ef", "03", "done.webm"))
+        db.add(models.TranscriptionJob(id="j2", user_id=1, prompt_id=1, audio_path=done, status="done"))
+        db.commit()
+
+        report = store.collect_garbage(db, grace_seconds=600)
+
+    assert report["blobs_deleted"] == 0
+    assert report["orphan_files_deleted"] == 3
+    assert not any(os.path.exists(p) for p in (orphan, orphan_sidecar, done))
+    assert all(os.path.exists(p) for p in (live, live_sidecar, fresh, original, original_sidecar, queued))
@@ -0,0 +1,56 @@
+# tests/test_audio_stream.py
+import numpy as np
+import pytest
+
+from app.utils.audio_stream import SAMPLE_RATE, split_on_silence
+
+
+def tone(seconds):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def windows(samples, seconds):
+    size = int(seconds * SAMPLE_RATE)
+    return (samples[i:i + size] for i in range(0, len(samples), size))
+
+
+def segments(samples, window_seconds=0.37, **kwargs):
+    kwargs = {"min_silence_ms": 300, "min_segment_seconds": 5, "max_segment_seconds": 30, **kwargs}
+    return [(start, len(s) / SAMPLE_RATE) for start, s in split_on_silence(windows(samples, window_seconds), **kwargs)]
+
+
+def test_cuts_in_the_middle_of_pauses_and_drops_leading_silence():
+    audio = np.concatenate([silence(1), tone(6), silence(1), tone(3), silence(0.5)])
+    (start1, length1), (start2, length2) = segments(audio)
+    assert start1 == pytest.approx(1.0, abs=0.03)
+    # Cut once the pause reaches 300 ms, half of it on each side
+    assert start1 + length1 == pytest.approx(7.15, abs=0.03)
+    # The rest of the pause is dropped; the last segment keeps its trailing silence
+    assert start2 == pytest.approx(8.0, abs=0.03)
+    assert start2 + length2 == pytest.approx(11.5, abs=0.03)
+
+
+def test_short_pauses_do_not_cut_before_min_segment_length():
+    # Both pauses are over before the segment is 5 s long
+    audio = np.concatenate([tone(1.5), silence(0.5), tone(1.5), silence(0.5), tone(3)])
+    assert segments(audio) == [(0.0, pytest.approx(7.0, abs=0.01))]
+
+
+def test_long_speech_is_cut_at_max_segment_length():
+    found = segments(tone(12), max_segment_seconds=5)
+    assert [start for start, _ in found] == pytest.approx([0.0, 4.98, 9.96])
+    assert sum(length for _, length in found) == pytest.approx(12.0)
+
+
+def test_silence_only_yields_nothing():
+    assert segments(silence(3)) == []
+
+
+def test_window_size_does_not_change_segments():
+    audio = np.concatenate([silence(0.4), tone(5.5), silence(0.8), tone(6), silence(0.6), tone(1)])
+    assert segments(audio, window_seconds=0.1) == segments(audio, window_seconds=2.0) == segments(audio, window_seconds=30)
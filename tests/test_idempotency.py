@@ -0,0 +1,173 @@
+# tests/test_idempotency.py
+import ast
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.models.idempotency_record import IdempotencyRecord
+from app.services import idempotency
+from app.services.idempotency import (
+    IdempotencyConflict,
+    IdempotencyInProgress,
+    IdempotencyStore,
+    StoredResponse,
+)
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class Record(_Base):
+    # The app's declarative registry does not configure in isolation, so
+    # the table is mapped on its own here
+    __table__ = IdempotencyRecord.__table__.to_metadata(_Base.metadata)
+
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    monkeypatch.setattr(idempotency, "IdempotencyRecord", Record)
+    engine = create_engine(f"sqlite:///{tmp_path / 'idempotency.db'}")
+    _Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def store():
+    return IdempotencyStore(ttl=60, wait_timeout=2.0, lock_timeout=30, poll_interval=0.05)
+
+
+def begin(store, db, key="k", fingerprint="f1"):
+    return asyncio.run(store.begin(db, "submit", key, fingerprint))
+
+
+def test_completed_request_is_replayed(sessions, store):
+    with sessions() as db:
+        assert begin(store, db) is None
+        store.complete(db, "submit", "k", 201, {"transcript_id": 7})
+    with sessions() as db:
+        assert begin(store, db) == StoredResponse(201, {"transcript_id": 7})
+    assert store.replayed == 1
+
+
+def test_same_key_for_a_different_request_conflicts(sessions, store):
+    with sessions() as db:
+        assert begin(store, db) is None
+        store.complete(db, "submit", "k", 201, {})
+    with sessions() as db:
+        with pytest.raises(IdempotencyConflict):
+            begin(store, db, fingerprint="f2")
+        # Keys are per scope
+        assert asyncio.run(store.begin(db, "score", "k", "f2")) is None
+
+
+def test_abandoned_key_runs_again(sessions, store):
+    with sessions() as db:
+        assert begin(store, db) is None
+        store.abandon(db, "submit", "k")
+        assert db.query(Record).count() == 0
+    with sessions() as db:
+        assert begin(store, db) is None
+
+
+def test_abandon_keeps_a_completed_response(sessions, store):
+    with sessions() as db:
+        begin(store, db)
+        store.complete(db, "submit", "k", 200, {"ok": True})
+        store.abandon(db, "submit", "k")
+        assert begin(store, db) == StoredResponse(200, {"ok": True})
+
+
+def test_retry_waits_for_the_first_request(sessions, store):
+    owner = sessions()
+    assert begin(store, owner) is None
+
+    def finish():
+        store.complete(owner, "submit", "k", 201, {"transcript_id": 3})
+
+    async def retry():
+        with sessions() as db:
+            threading.Timer(0.2, finish).start()
+            return await store.begin(db, "submit", "k", "f1")
+
+    assert asyncio.run(retry()) == StoredResponse(201, {"transcript_id": 3})
+    assert store.waited == 1
+    owner.close()
+
+
+def test_retry_gives_up_while_the_first_request_runs(sessions):
+    store = IdempotencyStore(ttl=60, wait_timeout=0.1, lock_timeout=30, poll_interval=0.02)
+    with sessions() as owner, sessions() as db:
+        assert begin(store, owner) is None
+        with pytest.raises(IdempotencyInProgress):
+            begin(store, db)
+
+
+def test_stale_and_expired_claims_are_taken_over(sessions, store):
+    with sessions() as db:
+        begin(store, db, key="stale")
+        begin(store, db, key="expired")
+        store.complete(db, "submit", "expired", 200, {})
+        past = datetime.now(timezone.utc) - timedelta(hours=1)
+        db.query(Record).filter(Record.key == "stale").update({"created_at": past})
+        db.query(Record).filter(Record.key == "expired").update({"expires_at": past})
+        db.commit()
+    with sessions() as db:
+        assert begin(store, db, key="stale") is None
+        assert begin(store, db, key="expired", fingerprint="other") is None
+
+
+# ---------------- run_idempotent ----------------
+def _run_idempotent(store):
+    """The router's run_idempotent, bound to `store` (the router module needs the full app)."""
+    source = (Path(__file__).parents[1] / "app/api/v1/routers/evaluate.py").read_text()
+    node = next(n for n in ast.parse(source).body if getattr(n, "name", None) == "run_idempotent")
+    namespace = {
+        "Session": object,
+        "JSONResponse": JSONResponse,
+        "HTTPException": HTTPException,
+        "IdempotencyConflict": IdempotencyConflict,
+        "IdempotencyInProgress": IdempotencyInProgress,
+        "idempotency_store": store,
+        "run_in_threadpool": run_in_threadpool,
+        "json": json,
+    }
+    exec(compile(ast.Module(body=[node], type_ignores=[]), "evaluate.py", "exec"), namespace)
+    return namespace["run_idempotent"]
+
+
+def test_run_idempotent_replays_and_releases(sessions, store):
+    run_idempotent = _run_idempotent(store)
+    calls = []
+
+    def handler():
+        calls.append(1)
+        return JSONResponse(status_code=201, content={"n": len(calls)})
+
+    def failing():
+        raise RuntimeError("transcription failed")
+
+    with sessions() as db:
+        with pytest.raises(RuntimeError):
+            asyncio.run(run_idempotent(db, "submit", "k", "f1", failing))
+        first = asyncio.run(run_idempotent(db, "submit", "k", "f1", handler))
+        replay = asyncio.run(run_idempotent(db, "submit", "k", "f1", handler))
+        with pytest.raises(HTTPException) as conflict:
+            asyncio.run(run_idempotent(db, "submit", "k", "f2", handler))
+
+    assert calls == [1]
+    assert first.status_code == replay.status_code == 201
+    assert json.loads(replay.body) == {"n": 1}
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert conflict.value.status_code == 422
@@ -0,0 +1,96 @@
+# tests/test_live_speaking.py
+import math
+
+import pytest
+
+from app.core.config import PAUSE_LONG_SECONDS
+from app.services.live_speaking import LiveSpeakingSession
+from app.utils.audio_buffer import SAMPLE_RATE
+
+
+class FakeSpeech:
+    """Hears one word per second of audio, each 0.6 s long, up to `speech_until`."""
+
+    def __init__(self, speech_until=None):
+        self.speech_until = speech_until
+        self.calls = []
+
+    def transcribe_window(self, samples, offset, tier, profile, initial_prompt=None):
+        end = offset + len(samples) / SAMPLE_RATE
+        self.calls.append((round(offset, 2), round(end, 2), initial_prompt))
+        words = []
+        t = float(math.ceil(offset))
+        while t + 0.6 <= min(end, self.speech_until or end):
+            words.append([f"w{int(t)}", t, t + 0.6, 0.9])
+            t += 1
+        segments = [{"start": words[0][1], "end": words[-1][2], "avg_logprob": -0.2,
+                     "no_speech_prob": 0.01, "compression_ratio": 1.2}] if words else []
+        return {"text": " ".join(w[0] for w in words), "signals": {"words": words, "segments": segments}}
+
+
+def session(speech=None, window_seconds=10.0):
+    return LiveSpeakingSession(1, 1, 1, window_seconds=window_seconds, step_seconds=2.0, speech=speech or FakeSpeech())
+
+
+def feed_seconds(s, seconds):
+    s.feed(b"\x00\x00" * int(seconds * SAMPLE_RATE))
+
+
+# ---------------- _commit_point ----------------
+WORDS = [["a", 0.0, 0.5, 0.9], ["b", 1.0, 1.5, 0.9], ["c", 2.0, 2.8, 0.9]]
+
+
+def test_final_pass_commits_everything():
+    assert session()._commit_point(WORDS, 0.0, 3.0, final=True) == 3.0
+
+
+def test_long_pause_commits_up_to_its_middle():
+    end = 2.8 + PAUSE_LONG_SECONDS + 0.2
+    assert session()._commit_point(WORDS, 0.0, end, final=False) == pytest.approx((2.8 + end) / 2)
+
+
+def test_short_tail_waits_for_more_audio():
+    assert session()._commit_point(WORDS, 0.0, 3.0, final=False) is None
+    assert session()._commit_point([], 0.0, 3.0, final=False) is None
+
+
+def test_full_window_keeps_the_last_word_open():
+    assert session(window_seconds=3.0)._commit_point(WORDS, 0.0, 3.0, final=False) == 2.0
+
+
+def test_full_window_with_at_most_one_word_commits_all():
+    s = session(window_seconds=3.0)
+    assert s._commit_point(WORDS[-1:], 0.0, 3.0, final=False) == 3.0
+    assert s._commit_point([], 0.0, 3.0, final=False) == 3.0
+
+
+# ---------------- Passes ----------------
+def test_passes_cover_only_the_uncommitted_tail():
+    speech = FakeSpeech()
+    s = session(speech)
+    feed_seconds(s, 6)
+    update = s.step()
+    assert update["committed"] == ""
+    assert update["tentative"] == "w0 w1 w2 w3 w4 w5"
+
+    feed_seconds(s, 4.4)  # the window is full at 10.4 s; w10 is still being said
+    update = s.step()
+    assert s.committed_until == 9.0
+    assert update["committed"] == "w0 w1 w2 w3 w4 w5 w6 w7 w8"
+    assert update["tentative"] == "w9"
+
+    feed_seconds(s, 1.6)
+    s.finish()
+    assert s.committed_until == 12.0
+    assert s.committed_text == "w0 w1 w2 w3 w4 w5 w6 w7 w8 w9 w10 w11"
+    # Each pass starts at the commit point and is prompted with the committed text
+    assert [c[:2] for c in speech.calls] == [(0.0, 6.0), (0.0, 10.4), (9.0, 12.0)]
+    assert speech.calls[-1][2].endswith("w7 w8")
+
+
+def test_pause_commits_before_the_window_is_full():
+    s = session(FakeSpeech(speech_until=3.0))
+    feed_seconds(s, 5)
+    update = s.step()
+    assert update["committed"] == "w0 w1 w2"
+    assert s.committed_until == pytest.approx((2.6 + 5.0) / 2)
@@ -0,0 +1,61 @@
+# tests/test_phrase_matcher.py
+import pytest
+
+from app.utils.constants import DEFAULT_PHRASES
+from app.utils.phrase_matcher import PhraseMatcher
+
+
+@pytest.fixture
+def fillers():
+    return PhraseMatcher({"filler": DEFAULT_PHRASES["filler"]})
+
+
+@pytest.mark.parametrize("text, count", [
+    ("Um, I think the main reason is that, uh, people like to travel.", 2),
+    ("Well, I mean, I like my job, but er, sometimes it's like really stressful. Ah, I don't know.", 2),
+    ("Do you know what I mean? I mean it when I say the city is like a second home.", 0),
+    ("So, uh, the graph shows that, um, sales went up. Umm, and then, er, they went down again.", 4),
+    ("Hmm, let me think. I would like to say that technology, you know, helps students learn.", 1),
+])
+def test_default_fillers_are_hesitation_sounds(fillers, text, count):
+    assert fillers.count(text)["filler"]["count"] == count
+
+
+def _found(matcher, text):
+    return [(m.category, m.phrase, text[m.start:m.end]) for m in matcher.find(text)]
+
+
+def test_longest_phrase_wins_at_the_same_start():
+    matcher = PhraseMatcher({"hedge": ("i feel", "i feel like"), "filler": ("like",)})
+    assert _found(matcher, "I feel like it, like, works.") == [
+        ("hedge", "i feel like", "I feel like"),
+        ("filler", "like", "like"),
+    ]
+
+
+def test_leftmost_match_wins_over_a_longer_overlapping_one():
+    matcher = PhraseMatcher({"hedge": ("a bit",), "other": ("bit of luck",)})
+    assert _found(matcher, "a bit of luck") == [("hedge", "a bit", "a bit")]
+    assert _found(matcher, "with a little bit of luck") == [("other", "bit of luck", "bit of luck")]
+
+
+def test_shorter_phrase_inside_a_failed_longer_one():
+    matcher = PhraseMatcher({"discourse": ("on the other hand",), "x": ("the other",)})
+    assert _found(matcher, "on the other day") == [("x", "the other", "the other")]
+    assert _found(matcher, "On the other hand, no.") == [("discourse", "on the other hand", "On the other hand")]
+
+
+def test_phrase_in_several_categories_and_repeats():
+    matcher = PhraseMatcher({"filler": ("you know", "um"), "discourse": ("you know",)})
+    text = "Um um, you know... YOU KNOW"
+    assert _found(matcher, text) == [
+        ("filler", "um", "Um"),
+        ("filler", "um", "um"),
+        ("filler", "you know", "you know"),
+        ("discourse", "you know", "you know"),
+        ("filler", "you know", "YOU KNOW"),
+        ("discourse", "you know", "YOU KNOW"),
+    ]
+    counts = matcher.count(text)
+    assert counts["filler"]["phrases"] == {"um": 2, "you know": 2}
+    assert counts["discourse"]["positions"] == [[7, 15], [19, 27]]
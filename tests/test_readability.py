@@ -0,0 +1,58 @@
+# tests/test_readability.py
+import pytest
+
+textstat = pytest.importorskip("textstat")
+
+from app.utils import readability
+from app.utils.readability import batch_readability
+from app.utils.text_index import DocumentIndex
+
+TEXTS = [
+    "Learning a new language takes patience. Every day I practise speaking with my "
+    "colleagues, and sometimes I make mistakes.",
+    "Dr. Smith arrived at 5 p.m. and didn't stay long. She said it's a well-known fact "
+    "that 3.5 percent of students' essays aren't finished.",
+    "I ran. He sat. \"Why?\" we asked, e.g. about the U.S. exam results!",
+    "Well... I don't know (maybe tomorrow?) -- we'll see what they've planned",
+]
+
+
+@pytest.fixture(autouse=True)
+def pyphen_syllables(monkeypatch):
+    """Both sides count syllables with Pyphen, so no CMUdict download is needed."""
+    from textstat.backend.counts import _count_syllables
+
+    monkeypatch.setattr(_count_syllables, "get_cmudict", lambda lang: {})
+    monkeypatch.setattr(readability, "_cmudict", {})
+    readability.count_syllables.cache_clear()
+    yield
+    readability.count_syllables.cache_clear()
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_counts_match_textstat(text):
+    index = DocumentIndex(text)
+    assert index.word_count == textstat.lexicon_count(text)
+    assert index.sentence_count == textstat.sentence_count(text)
+    assert index.letter_count == textstat.letter_count(text)
+
+
+def test_abbreviations_and_contractions():
+    index = DocumentIndex("Dr. Smith arrived at 5 p.m. today. He said hi, and I don't mind.")
+    assert index.word_count == 14
+    assert index.sentence_count == 2
+    assert index.sentences()[0] == "Dr. Smith arrived at 5 p.m. today."
+    assert "don't" in index.vocabulary
+
+
+def test_metrics_match_textstat():
+    ours = batch_readability(TEXTS)
+    for name in (
+        "flesch_reading_ease",
+        "flesch_kincaid_grade",
+        "coleman_liau_index",
+        "automated_readability_index",
+        "smog_index",
+    ):
+        reference = [getattr(textstat, name)(t) for t in TEXTS]
+        assert ours[name] == pytest.approx(reference, abs=0.1), name
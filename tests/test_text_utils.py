@@ -0,0 +1,101 @@
+# tests/test_text_utils.py
+import re
+
+import pytest
+
+from app.utils import text_utils
+from app.utils.text_utils import check_sentence, check_text, sentence_cache
+
+TEXT = (
+    "Yesterday I goed to the market. I buyed apples. I met my freind there. "
+    "I  goed home late. Then I slept (for ten hours."
+)
+
+
+class FakeMatch:
+    def __init__(self, rule_id, offset, length, issue_type="grammar"):
+        self.ruleId = rule_id
+        self.category = "TEST"
+        self.ruleIssueType = issue_type
+        self.offset = offset
+        self.errorLength = length
+        self.message = rule_id
+        self.replacements = []
+
+
+class FakeTool:
+    """Flags a few words, plus two rules that look across sentences like LanguageTool's do."""
+
+    def __init__(self):
+        self.requests = []
+
+    def check(self, text):
+        self.requests.append(text)
+        matches = [FakeMatch("MORFOLOGIK_RULE_EN_US", m.start(), len(m.group()), "misspelling")
+                   for m in re.finditer(r"freind", text)]
+        matches += [FakeMatch("IRREGULAR_PAST", m.start(), len(m.group()))
+                    for m in re.finditer(r"goed|buyed", text)]
+        # Three paragraphs in a row starting with "I"
+        starts = [m.start(1) for m in re.finditer(r"(?:^|\n\n)(I)\b", text)]
+        for first, _second, third in zip(starts, starts[1:], starts[2:]):
+            matches.append(FakeMatch("ENGLISH_WORD_REPEAT_BEGINNING_RULE", third, 1, "style"))
+        # Brackets are paired over the whole request
+        if text.count("(") != text.count(")"):
+            matches.append(FakeMatch("EN_UNPAIRED_BRACKETS", text.index("("), 1, "typographical"))
+        return matches
+
+
+@pytest.fixture
+def tool(monkeypatch):
+    fake = FakeTool()
+    monkeypatch.setattr(text_utils, "_tool", fake)
+    sentence_cache.clear()
+    yield fake
+    sentence_cache.clear()
+
+
+def issues(result):
+    return [(i.rule_id, result.text[i.offset:i.offset + i.length]) for i in result.issues]
+
+
+def test_uncached_sentences_share_one_request(tool):
+    check_text(TEXT)
+    assert len(tool.requests) == 1
+
+    check_text(TEXT)
+    assert len(tool.requests) == 1
+
+
+def test_offsets_point_into_the_original_text(tool):
+    assert issues(check_text(TEXT)) == [
+        ("IRREGULAR_PAST", "goed"),
+        ("IRREGULAR_PAST", "buyed"),
+        ("MORFOLOGIK_RULE_EN_US", "freind"),
+        ("IRREGULAR_PAST", "goed"),
+    ]
+
+
+def test_counts_do_not_depend_on_the_cache(tool):
+    cold = check_text(TEXT)
+
+    # Warm: every sentence cached
+    warm = check_text(TEXT)
+
+    # Partly warm: some sentences were cached earlier, in other company
+    sentence_cache.clear()
+    check_text("I buyed apples. Then I slept (for ten hours.")
+    check_sentence("I  goed home late.")
+    partly = check_text(TEXT)
+
+    # No cache at all
+    sentence_cache.clear()
+    max_size = sentence_cache.max_size
+    sentence_cache.max_size = 0
+    try:
+        uncached = check_text(TEXT)
+    finally:
+        sentence_cache.max_size = max_size
+
+    for result in (warm, partly, uncached):
+        assert issues(result) == issues(cold)
+        assert (result.grammar_errors, result.spelling_errors) == (cold.grammar_errors, cold.spelling_errors)
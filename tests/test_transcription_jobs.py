@@ -0,0 +1,135 @@
+# tests/test_transcription_jobs.py
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.audio_blob import AudioBlob
+from app.models.transcription_job import TranscriptionJob
+from app.models.transcripts import Transcript
+from app.services import audio_store as audio_store_module
+from app.services import transcription_jobs
+from app.services.transcription_jobs import TranscriptionQueue
+
+
+class FakeSpeech:
+    def __init__(self, text="I like travelling.", delay=0.0):
+        self.text = text
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def transcribe_detailed(self, audio, tier=None, profile=None):
+        with self._lock:
+            self.calls.append(audio.path)
+        threading.Event().wait(self.delay)
+        return {"text": self.text, "signals": {"duration": 1.0, "segments": [], "words": []}}
+
+
+@pytest.fixture
+def env(standalone_model, standalone_sessions, monkeypatch):
+    models = {m.__name__: standalone_model(m) for m in (AudioBlob, TranscriptionJob, Transcript)}
+    for name, model in models.items():
+        monkeypatch.setattr(transcription_jobs, name, model)
+        monkeypatch.setattr(audio_store_module, name, model)
+    speech = FakeSpeech()
+    materialized = []
+    monkeypatch.setattr(transcription_jobs, "SessionLocal", standalone_sessions)
+    monkeypatch.setattr(transcription_jobs, "get_speech_service", lambda: speech)
+    monkeypatch.setattr(transcription_jobs, "materialize_analyses", lambda tid, audio: materialized.append(tid))
+    monkeypatch.setattr(
+        transcription_jobs, "ingest_audio",
+        lambda path, keep_original=False: (SimpleNamespace(path=path), {}),
+    )
+    queue = TranscriptionQueue(workers=2, max_pending=10)
+    yield SimpleNamespace(sessions=standalone_sessions, speech=speech, queue=queue, materialized=materialized, **models)
+    queue.shutdown()
+
+
+def add_job(env, job_id, status="queued", started_at=None, sha256=None):
+    with env.sessions() as db:
+        db.add(env.TranscriptionJob(
+            id=job_id, user_id=1, prompt_id=1, audio_path=f"/audio/{job_id}.flac",
+            audio_sha256=sha256, status=status, started_at=started_at,
+        ))
+        db.commit()
+
+
+def job(env, job_id):
+    with env.sessions() as db:
+        return db.get(env.TranscriptionJob, job_id)
+
+
+def run(env, job_id):
+    with env.queue._lock:
+        env.queue._pending += 1  # as submit() and recover() count it
+    env.queue._run(job_id, 0.0)
+
+
+def test_job_runs_once_and_stores_its_transcript(env):
+    add_job(env, "a")
+    run(env, "a")
+    run(env, "a")  # handed out twice: the second claim finds it done
+
+    done = job(env, "a")
+    assert done.status == "done" and done.started_at and done.finished_at
+    assert env.speech.calls == ["/audio/a.flac"]
+    with env.sessions() as db:
+        transcript = db.get(env.Transcript, done.transcript_id)
+        assert transcript.text == "I like travelling."
+    assert env.materialized == [done.transcript_id]
+    assert env.queue.stats()["queue_depth"] == 0
+
+
+def test_concurrent_workers_claim_a_job_once(env):
+    env.speech.delay = 0.2
+    add_job(env, "a")
+    workers = [threading.Thread(target=run, args=(env, "a")) for _ in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(timeout=10)
+
+    assert env.speech.calls == ["/audio/a.flac"]
+    assert job(env, "a").status == "done"
+    assert env.queue.completed == 1
+
+
+def test_failed_job_releases_its_blob(env):
+    env.speech.text = ""
+    with env.sessions() as db:
+        db.add(env.AudioBlob(sha256="s" * 64, size=1, audio_format="wav", path="/store/s.wav", ref_count=1))
+        db.commit()
+    add_job(env, "a", sha256="s" * 64)
+    run(env, "a")
+
+    failed = job(env, "a")
+    assert failed.status == "failed" and failed.error == "Could not transcribe audio"
+    # The stored blob's path is used, and its reference is dropped
+    assert env.speech.calls == ["/store/s.wav"]
+    with env.sessions() as db:
+        assert db.get(env.AudioBlob, "s" * 64).ref_count == 0
+    assert env.queue.failed == 1
+
+
+def test_recover_requeues_queued_and_stale_jobs_only(env):
+    now = datetime.now(timezone.utc)
+    add_job(env, "queued")
+    add_job(env, "stale", status="running", started_at=now - timedelta(hours=2))
+    add_job(env, "unstarted", status="running")
+    add_job(env, "busy", status="running", started_at=now - timedelta(seconds=5))
+    add_job(env, "finished", status="done", started_at=now - timedelta(hours=2))
+
+    assert env.queue.recover(stale_after=600) == 3
+    env.queue._executor.shutdown(wait=True)
+
+    assert {j: job(env, j).status for j in ("queued", "stale", "unstarted", "busy", "finished")} == {
+        "queued": "done",
+        "stale": "done",
+        "unstarted": "done",
+        "busy": "running",
+        "finished": "done",
+    }
+    assert sorted(env.speech.calls) == ["/audio/queued.flac", "/audio/stale.flac", "/audio/unstarted.flac"]
+    assert env.queue.stats()["queue_depth"] == 0
@@ -0,0 +1,42 @@
+# tests/test_whisper_batcher.py
+import contextlib
+import threading
+
+import numpy as np
+
+from app.services import whisper_batcher
+from app.services.whisper_batcher import WhisperBatcher
+from app.utils.audio_buffer import SAMPLE_RATE, AudioBuffer
+
+
+class FakeManager:
+    def resolve_tier(self, tier):
+        return tier or "base"
+
+
+def test_concurrent_clips_share_one_decode(monkeypatch):
+    batcher = WhisperBatcher(FakeManager(), max_batch_size=4, max_wait=5.0)
+    batches = []
+
+    def decode(tier, options, batch):
+        batches.append([r.word_timestamps for r in batch])
+        return [{"text": f" {len(r.audio)}", "segments": [], "language": "en"} for r in batch]
+
+    monkeypatch.setattr(batcher, "_decode", decode)
+    monkeypatch.setattr(whisper_batcher, "inference", contextlib.nullcontext)
+
+    results = {}
+
+    def call(i):
+        clip = AudioBuffer(np.zeros(SAMPLE_RATE * (i + 1), dtype=np.float32))
+        results[i] = batcher.transcribe(clip, options={"language": "en"}, word_timestamps=True)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+
+    assert batches == [[True] * 4]
+    assert {i: r["text"] for i, r in results.items()} == {i: f" {SAMPLE_RATE * (i + 1)}" for i in range(4)}
+    assert batcher.stats()["batch_sizes"] == {4: 1}